@@ -70,6 +70,8 @@ CREATE TABLE tiger_etf.etf_documents (
     local_path TEXT,
     file_hash VARCHAR(64),
     file_size_bytes INTEGER,
+    etag TEXT,
+    last_modified VARCHAR(64),
     published_date DATE,
     downloaded_at TIMESTAMPTZ,
     UNIQUE(ksd_fund_code, doc_type, source_url)
@@ -103,3 +105,7 @@ CREATE TABLE tiger_etf.scrape_runs (
 CREATE INDEX idx_daily_prices_date ON tiger_etf.etf_daily_prices(trade_date);
 CREATE INDEX idx_holdings_date ON tiger_etf.etf_holdings(as_of_date);
 CREATE INDEX idx_documents_type ON tiger_etf.etf_documents(doc_type);
+
+-- Existing databases: HTTP validators for document change detection
+ALTER TABLE tiger_etf.etf_documents ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE tiger_etf.etf_documents ADD COLUMN IF NOT EXISTS last_modified VARCHAR(64);
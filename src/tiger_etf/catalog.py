@@ -0,0 +1,224 @@
+"""In-memory catalog of ETF products.
+
+Scrapers, the PDF loader and the query router all need to map between
+``ticker``, ``ksd_fund_code`` and ``name_ko``.  :func:`get_catalog` loads
+those three columns from ``etf_products`` once per process and keeps them
+in ``__slots__`` records with dict indexes, so lookups are O(1) and need no
+database round trip:
+
+- exact lookup by ticker, fund code or normalized name (NFKC, lowercased,
+  whitespace removed — "TIGER 미국 S&P 500" finds "TIGER 미국S&P500")
+- fuzzy name matching through a character-bigram index (Dice similarity)
+  for mentions that are not exact names
+
+The catalog is refreshed when the table's version stamp (row count and
+latest ``updated_at``) changes.  The stamp is checked at most every
+``catalog_refresh_interval`` seconds; pass ``max_age=0`` to check now.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import unicodedata
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from tiger_etf.config import settings
+from tiger_etf.db import get_reader_session
+from tiger_etf.models import EtfProduct
+from tiger_etf.utils.logging_config import get_logger
+
+log = get_logger("catalog")
+
+# Brand prefix shared by every product name; left out of the bigram index
+_BRAND = "tiger"
+# Dice similarity a fuzzy match needs, and its lead over the runner-up
+FUZZY_MIN_SCORE = 0.75
+FUZZY_MARGIN = 0.05
+
+
+class CatalogEntry:
+    """One product: its keys, name and active flag."""
+
+    __slots__ = ("ksd_fund_code", "ticker", "name_ko", "is_active")
+
+    def __init__(self, ksd_fund_code: str, ticker: str, name_ko: str, is_active: bool = True):
+        self.ksd_fund_code = ksd_fund_code
+        self.ticker = ticker
+        self.name_ko = name_ko
+        self.is_active = is_active
+
+    def __repr__(self) -> str:
+        return f"CatalogEntry({self.ksd_fund_code!r}, {self.ticker!r}, {self.name_ko!r})"
+
+
+def normalize_name(name: str) -> str:
+    """Name key: NFKC, lowercased, without whitespace."""
+    return "".join(unicodedata.normalize("NFKC", name).lower().split())
+
+
+def _bigrams(key: str) -> set[str]:
+    if key.startswith(_BRAND):
+        key = key[len(_BRAND):]
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class ProductCatalog:
+    """Products indexed by ticker, fund code, name key and name bigrams."""
+
+    def __init__(self, entries: Iterable[CatalogEntry], version: tuple = ()):
+        self.entries: list[CatalogEntry] = list(entries)
+        self.version = version
+        self._by_ticker: dict[str, int] = {}
+        self._by_code: dict[str, int] = {}
+        self._by_name: dict[str, int] = {}
+        self._gram_counts: list[int] = []
+        self._grams: dict[str, list[int]] = {}
+        for i, entry in enumerate(self.entries):
+            self._by_ticker[entry.ticker] = i
+            self._by_code[entry.ksd_fund_code] = i
+            key = normalize_name(entry.name_ko)
+            self._by_name[key] = i
+            grams = _bigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(i)
+
+    @classmethod
+    def load(cls, session: Session) -> ProductCatalog:
+        rows = session.execute(
+            select(
+                EtfProduct.ksd_fund_code, EtfProduct.ticker,
+                EtfProduct.name_ko, EtfProduct.is_active,
+            ).order_by(EtfProduct.id)
+        ).all()
+        entries = [CatalogEntry(code, ticker, name, bool(active)) for code, ticker, name, active in rows]
+        return cls(entries, version_stamp(session))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # -- exact lookup ----------------------------------------------------
+
+    def by_ticker(self, ticker: str) -> Optional[CatalogEntry]:
+        i = self._by_ticker.get(ticker.strip().upper())
+        return None if i is None else self.entries[i]
+
+    def by_code(self, ksd_fund_code: str) -> Optional[CatalogEntry]:
+        i = self._by_code.get(ksd_fund_code.strip())
+        return None if i is None else self.entries[i]
+
+    def by_name(self, name: str) -> Optional[CatalogEntry]:
+        i = self._by_name.get(normalize_name(name))
+        return None if i is None else self.entries[i]
+
+    def ticker_map(self) -> dict[str, str]:
+        """ksd_fund_code -> ticker."""
+        return {e.ksd_fund_code: e.ticker for e in self.entries}
+
+    def active(self) -> list[CatalogEntry]:
+        return [e for e in self.entries if e.is_active]
+
+    # -- fuzzy matching --------------------------------------------------
+
+    def search(self, text: str, limit: int = 5) -> list[tuple[CatalogEntry, float]]:
+        """Products whose names share bigrams with ``text``, best first."""
+        grams = _bigrams(normalize_name(text))
+        if not grams:
+            return []
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        scored = [
+            (2 * n / (len(grams) + self._gram_counts[i]), i) for i, n in shared.items()
+        ]
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [(self.entries[i], round(score, 4)) for score, i in scored[:limit]]
+
+    def match(self, text: str, min_score: float = FUZZY_MIN_SCORE) -> Optional[CatalogEntry]:
+        """Exact name, else the clear best fuzzy match (None if ambiguous)."""
+        exact = self.by_name(text)
+        if exact is not None:
+            return exact
+        hits = self.search(text, limit=2)
+        if not hits or hits[0][1] < min_score:
+            return None
+        if len(hits) > 1 and hits[0][1] - hits[1][1] < FUZZY_MARGIN:
+            return None
+        return hits[0][0]
+
+    def resolve(self, mention: str) -> Optional[CatalogEntry]:
+        """Product named by ``mention``, which may carry trailing words.
+
+        The longest word prefix that is an exact name wins ("tiger
+        미국s&p500 상장일" -> "TIGER 미국S&P500"); otherwise the best fuzzy
+        match over the prefixes.
+        """
+        words = mention.split()
+        prefixes = [" ".join(words[:n]) for n in range(len(words), 0, -1)]
+        for prefix in prefixes:
+            entry = self.by_name(prefix)
+            if entry is not None:
+                return entry
+        for prefix in prefixes:
+            if normalize_name(prefix) == _BRAND:
+                break
+            entry = self.match(prefix)
+            if entry is not None:
+                return entry
+        return None
+
+
+def version_stamp(session: Session) -> tuple[Any, ...]:
+    """(row count, latest updated_at) of ``etf_products``."""
+    count, updated = session.execute(
+        select(func.count(EtfProduct.id), func.max(EtfProduct.updated_at))
+    ).one()
+    return count, updated
+
+
+_catalog: Optional[ProductCatalog] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_catalog(
+    max_age: Optional[float] = None, session: Optional[Session] = None,
+) -> ProductCatalog:
+    """The process-wide catalog, reloaded when ``etf_products`` changed.
+
+    The version stamp is checked when the last check is older than
+    ``max_age`` seconds (default ``settings.catalog_refresh_interval``),
+    through ``session`` if given (e.g. a writer session, to see rows
+    written in this process before they reach the replica), else a reader
+    session.
+    """
+    global _catalog, _checked_at
+    if max_age is None:
+        max_age = settings.catalog_refresh_interval
+    with _lock:
+        now = time.monotonic()
+        if _catalog is not None and now - _checked_at < max_age:
+            return _catalog
+        with nullcontext(session) if session is not None else get_reader_session() as session:
+            if _catalog is None or version_stamp(session) != _catalog.version:
+                start = time.monotonic()
+                _catalog = ProductCatalog.load(session)
+                log.info(f"Loaded {len(_catalog)} products into catalog in {time.monotonic() - start:.3f}s")
+        _checked_at = now
+        return _catalog
+
+
+def clear_catalog() -> None:
+    """Drop the cached catalog (the next :func:`get_catalog` reloads)."""
+    global _catalog, _checked_at
+    with _lock:
+        _catalog = None
+        _checked_at = 0.0
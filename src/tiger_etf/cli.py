@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import click
 from rich.console import Console
 from rich.table import Table
@@ -59,12 +61,14 @@ def scrape_list() -> None:
 
 @scrape.command("detail")
 @click.option("--limit", type=int, default=None, help="Limit number of products to scrape.")
-def scrape_detail(limit: int | None) -> None:
+@click.option("--concurrency", type=int, default=None, help="Max in-flight requests (default: scraper.concurrency).")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk HTTP cache.")
+def scrape_detail(limit: int | None, concurrency: int | None, no_cache: bool) -> None:
     """Scrape ETF product detail pages."""
     from tiger_etf.scrapers.product_detail import ProductDetailScraper
 
     console.print(f"[bold]Scraping ETF detail pages (limit={limit})...[/bold]")
-    s = ProductDetailScraper()
+    s = ProductDetailScraper(concurrency=concurrency, use_cache=not no_cache)
     try:
         s.run(limit=limit)
     finally:
@@ -104,12 +108,13 @@ def scrape_holdings(limit: int | None) -> None:
 
 @scrape.command("dist")
 @click.option("--limit", type=int, default=None, help="Limit number of products.")
-def scrape_dist(limit: int | None) -> None:
+@click.option("--concurrency", type=int, default=None, help="Max in-flight requests (default: scraper.concurrency).")
+def scrape_dist(limit: int | None, concurrency: int | None) -> None:
     """Scrape distribution data."""
     from tiger_etf.scrapers.distribution import DistributionScraper
 
     console.print("[bold]Scraping distribution data...[/bold]")
-    s = DistributionScraper()
+    s = DistributionScraper(concurrency=concurrency)
     try:
         s.run(limit=limit)
     finally:
@@ -120,12 +125,16 @@ def scrape_dist(limit: int | None) -> None:
 @scrape.command("docs")
 @click.option("--limit", type=int, default=None, help="Limit number of products.")
 @click.option("--no-download", is_flag=True, help="Only record metadata, skip PDF downloads.")
-def scrape_docs(limit: int | None, no_download: bool) -> None:
+@click.option("--concurrency", type=int, default=None, help="Max in-flight requests (default: scraper.concurrency).")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk HTTP cache.")
+def scrape_docs(
+    limit: int | None, no_download: bool, concurrency: int | None, no_cache: bool
+) -> None:
     """Download PDF documents."""
     from tiger_etf.scrapers.documents import DocumentsScraper
 
     console.print("[bold]Scraping documents...[/bold]")
-    s = DocumentsScraper()
+    s = DocumentsScraper(concurrency=concurrency, use_cache=not no_cache)
     try:
         s.run(limit=limit, download=not no_download)
     finally:
@@ -135,7 +144,9 @@ def scrape_docs(limit: int | None, no_download: bool) -> None:
 
 @scrape.command("all")
 @click.option("--limit", type=int, default=None, help="Limit per-step product count.")
-def scrape_all(limit: int | None) -> None:
+@click.option("--concurrency", type=int, default=None, help="Max in-flight requests (default: scraper.concurrency).")
+@click.option("--no-cache", is_flag=True, help="Bypass the on-disk HTTP cache.")
+def scrape_all(limit: int | None, concurrency: int | None, no_cache: bool) -> None:
     """Run all scrapers sequentially."""
     from tiger_etf.scrapers.distribution import DistributionScraper
     from tiger_etf.scrapers.documents import DocumentsScraper
@@ -155,7 +166,7 @@ def scrape_all(limit: int | None) -> None:
 
     for name, cls in steps:
         console.print(f"\n[bold cyan]>>> {name}[/bold cyan]")
-        s = cls()
+        s = cls(concurrency=concurrency, use_cache=not no_cache)
         try:
             kwargs = {}
             if limit and name != "Product list":
@@ -274,53 +285,127 @@ def graphrag() -> None:
 @graphrag.command("build")
 @click.option("--pdf-limit", type=int, default=None, help="Limit number of PDFs.")
 @click.option("--rdb-limit", type=int, default=None, help="Limit number of RDB products.")
-def graphrag_build(pdf_limit: int | None, rdb_limit: int | None) -> None:
+@click.option("--incremental", is_flag=True, help="Only extract new/changed documents (index manifest).")
+def graphrag_build(pdf_limit: int | None, rdb_limit: int | None, incremental: bool) -> None:
     """Build graph index from all sources (PDF + RDB)."""
     from tiger_etf.graphrag.indexer import build_all
 
     console.print("[bold]Building GraphRAG index from PDFs + RDB...[/bold]")
-    build_all(pdf_limit=pdf_limit, rdb_limit=rdb_limit)
+    build_all(pdf_limit=pdf_limit, rdb_limit=rdb_limit, incremental=incremental)
     console.print("[green]Done.[/green]")
 
 
 @graphrag.command("build-pdf")
 @click.option("--limit", type=int, default=None, help="Limit number of PDFs.")
-def graphrag_build_pdf(limit: int | None) -> None:
+@click.option("--incremental", is_flag=True, help="Only extract new/changed documents (index manifest).")
+def graphrag_build_pdf(limit: int | None, incremental: bool) -> None:
     """Build graph index from PDF documents only."""
     from tiger_etf.graphrag.indexer import build_from_pdfs
 
     console.print(f"[bold]Building GraphRAG index from PDFs (limit={limit})...[/bold]")
-    build_from_pdfs(limit=limit)
+    build_from_pdfs(limit=limit, incremental=incremental)
     console.print("[green]Done.[/green]")
 
 
 @graphrag.command("build-rdb")
 @click.option("--limit", type=int, default=None, help="Limit number of RDB products.")
-def graphrag_build_rdb(limit: int | None) -> None:
+@click.option("--incremental", is_flag=True, help="Only extract new/changed documents (index manifest).")
+def graphrag_build_rdb(limit: int | None, incremental: bool) -> None:
     """Build graph index from RDB data only."""
     from tiger_etf.graphrag.indexer import build_from_rdb
 
     console.print(f"[bold]Building GraphRAG index from RDB (limit={limit})...[/bold]")
-    build_from_rdb(limit=limit)
+    build_from_rdb(limit=limit, incremental=incremental)
     console.print("[green]Done.[/green]")
 
 
 @graphrag.command("query")
 @click.argument("question")
-def graphrag_query(question: str) -> None:
+@click.option("--no-cache", is_flag=True, help="Bypass the query response cache.")
+@click.option("--verbose", "-v", is_flag=True, help="Show per-stage timing, node and token counts.")
+@click.option("--graph-only", is_flag=True, help="Skip the intent router; always use graph traversal.")
+def graphrag_query(question: str, no_cache: bool, verbose: bool, graph_only: bool) -> None:
     """Query the graph with a natural language question."""
-    from tiger_etf.graphrag.query import query
+    from tiger_etf.graphrag.query import run_query
 
     console.print(f"[bold]Query:[/bold] {question}\n")
-    response = query(question)
-    console.print(response)
+    result = run_query(
+        question, use_cache=False if no_cache else None, route=False if graph_only else None,
+    )
+    console.print(result.response)
+
+    if not verbose:
+        return
+    if result.intent:
+        console.print(f"\n[dim]Intent: {result.intent} -> {result.route}[/dim]")
+    if result.route == "sql":
+        console.print(f"[dim]Answered by SQL on the reader endpoint in {result.total_seconds:.3f}s[/dim]")
+        return
+    if result.cache_hit:
+        console.print(f"\n[dim]Served from query cache in {result.total_seconds:.3f}s[/dim]")
+        return
+    p = result.profile
+    table = Table(title="Query Stages")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Seconds", justify="right", style="green")
+    table.add_column("Detail")
+    table.add_row("Engine setup", f"{result.setup_seconds:.3f}", "")
+    table.add_row("Embedding", f"{p.embedding_seconds:.3f}", f"{p.embedding_calls} calls")
+    table.add_row("Vector search", f"{p.vector_search_seconds:.3f}", f"{p.retrieved_nodes} nodes retrieved")
+    table.add_row("Graph traversal", f"{p.graph_seconds:.3f}", f"{p.graph_queries} queries")
+    table.add_row("Rerank", f"{p.rerank_seconds:.3f}", f"{p.reranked_nodes} nodes kept")
+    table.add_row(
+        "Generation", f"{p.generation_seconds:.3f}",
+        f"{p.llm_calls} LLM calls, {p.prompt_tokens:,} in / {p.completion_tokens:,} out tokens",
+    )
+    table.add_row("Other", f"{p.other_seconds:.3f}", "")
+    table.add_row("Total", f"{result.total_seconds:.3f}", "", style="bold")
+    console.print(table)
+
+
+@graphrag.command("resolve")
+@click.option("--dry-run", is_flag=True, help="Plan and log merges without writing to the graph.")
+@click.option("--page-size", type=int, default=None, help="Entity nodes read per page.")
+@click.option("--batch-size", type=int, default=None, help="Merges applied per write.")
+@click.option("--similarity", type=float, default=None, help="Dice similarity for near-duplicate merges (0 = off).")
+def graphrag_resolve(dry_run: bool, page_size: int | None, batch_size: int | None, similarity: float | None) -> None:
+    """Merge duplicate entities (RDB anchoring, normalized keys, n-gram similarity)."""
+    from tiger_etf.graphrag.resolver import resolve_entities
+
+    console.print(f"[bold]Resolving entities{' (dry run)' if dry_run else ''}...[/bold]")
+    report = resolve_entities(
+        dry_run=dry_run, page_size=page_size, batch_size=batch_size,
+        similarity_threshold=similarity,
+    )
+
+    def shrink(before: int, after: int) -> str:
+        return f"{before - after:,} ({(before - after) / before:.1%})" if before else "0"
+
+    table = Table(title="Entity Resolution")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Entities", f"{report.entities:,}")
+    table.add_row("Duplicate clusters", f"{report.clusters:,}")
+    for stage in ("rdb", "rule", "similarity"):
+        table.add_row(f"Merges ({stage})", f"{report.by_stage.get(stage, 0):,}")
+    table.add_row("Nodes", f"{report.nodes_before:,} -> {report.nodes_after:,}")
+    table.add_row("Nodes removed", shrink(report.nodes_before, report.nodes_after))
+    table.add_row("Edges", f"{report.edges_before:,} -> {report.edges_after:,}")
+    table.add_row("Edges removed", shrink(report.edges_before, report.edges_after))
+    table.add_row("Seconds", f"{report.seconds:.1f}")
+    console.print(table)
+    console.print(f"[dim]Merge log: {report.log_path}[/dim]")
+    if dry_run:
+        console.print("[yellow]Dry run: no changes written.[/yellow]")
 
 
 @graphrag.command("reset")
 @click.option("--graph-only", is_flag=True, help="Only reset graph store (Neptune).")
 @click.option("--vector-only", is_flag=True, help="Only reset vector store (OpenSearch).")
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt.")
-def graphrag_reset(graph_only: bool, vector_only: bool, yes: bool) -> None:
+@click.option("--no-resume", is_flag=True, help="Ignore the checkpoint of an interrupted graph reset.")
+@click.option("--recreate", is_flag=True, help="Recreate the vector indexes (empty, same mappings) after deleting.")
+def graphrag_reset(graph_only: bool, vector_only: bool, yes: bool, no_resume: bool, recreate: bool) -> None:
     """Delete all data from graph and vector stores."""
     from tiger_etf.graphrag.indexer import reset_all, reset_graph, reset_vector
 
@@ -337,22 +422,23 @@ def graphrag_reset(graph_only: bool, vector_only: bool, yes: bool) -> None:
 
     if graph_only:
         console.print("[bold]Resetting graph store...[/bold]")
-        count = reset_graph()
+        count = reset_graph(resume=not no_resume)
         console.print(f"[green]Graph reset complete. {count} nodes deleted.[/green]")
     elif vector_only:
         console.print("[bold]Resetting vector store...[/bold]")
-        count = reset_vector()
+        count = reset_vector(recreate=recreate)
         console.print(f"[green]Vector reset complete. {count} documents deleted.[/green]")
     else:
         console.print("[bold]Resetting graph and vector stores...[/bold]")
-        result = reset_all()
+        result = reset_all(resume=not no_resume, recreate=recreate)
         console.print(f"[green]Reset complete. Graph: {result['graph_nodes_deleted']} nodes, Vector: {result['vector_docs_deleted']} documents deleted.[/green]")
 
 
 @graphrag.command("status")
 def graphrag_status() -> None:
-    """Show Neptune graph statistics (node/edge counts)."""
+    """Show Neptune graph statistics (node/edge counts) and vector index sizes."""
     from tiger_etf.graphrag.query import get_graph_stats
+    from tiger_etf.graphrag.vector_store import vector_index_counts
 
     console.print("[bold]GraphRAG Store Status[/bold]\n")
     try:
@@ -374,6 +460,18 @@ def graphrag_status() -> None:
     except Exception as e:
         console.print(f"[red]Error connecting to Neptune: {e}[/red]")
 
+    try:
+        counts = vector_index_counts()
+
+        vector_table = Table(title="Vector Indexes")
+        vector_table.add_column("Index", style="cyan")
+        vector_table.add_column("Documents", justify="right", style="green")
+        for index, cnt in counts.items():
+            vector_table.add_row(index, "-" if cnt is None else str(cnt))
+        console.print(vector_table)
+    except Exception as e:
+        console.print(f"[red]Error connecting to OpenSearch: {e}[/red]")
+
 
 # --- experiment commands ---
 
@@ -441,7 +539,16 @@ def experiment_run(config_name: str, skip_indexing: bool, no_llm_judge: bool) ->
     console.print(f"  Edges: {result['metrics']['total_edges']:,}")
     if "duration_minutes" in result:
         console.print(f"  Duration: {result['duration_minutes']:.1f} min")
+    if "indexing_telemetry" in result:
+        tm = result["indexing_telemetry"]
+        console.print(
+            f"  Indexing: {tm['extraction']['chunks_per_sec']:.1f} chunks/s, "
+            f"{tm['extraction']['throttles']} throttles, "
+            f"{tm['graph']['nodes_per_sec']:.1f} nodes/s, "
+            f"{tm['vector']['embeddings_per_sec']:.1f} embeddings/s"
+        )
     console.print(f"  Avg query latency: {result['avg_query_latency_seconds']:.2f}s")
+    console.print(f"  Eval wall clock: {result['eval_wall_clock_seconds']:.1f}s")
 
     # Show evaluation scores if available
     if "evaluation" in result:
@@ -456,9 +563,115 @@ def experiment_run(config_name: str, skip_indexing: bool, no_llm_judge: bool) ->
             console.print(f"  Completeness: {lj['avg_completeness']:.2f}/5")
 
 
+@experiment.command("score-log")
+@click.argument("log_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--questions", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None,
+              help="Eval questions YAML (default: experiments/eval_questions.yaml).")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Write the report as JSON.")
+@click.option("--chunk-size", default=10_000, show_default=True, help="Log lines aggregated per chunk.")
+def experiment_score_log(log_path: Path, questions: Path | None, output: Path | None, chunk_size: int) -> None:
+    """Score a JSONL query log (question, response, latency) against the eval set."""
+    import json as _json
+
+    from tiger_etf.graphrag.evaluator import (
+        format_eval_report,
+        load_eval_questions,
+        report_to_dict,
+        score_log,
+    )
+
+    report = score_log(log_path, load_eval_questions(questions), chunk_size=chunk_size)
+    console.print(format_eval_report(report))
+    if output:
+        output.write_text(_json.dumps(report_to_dict(report), indent=2, ensure_ascii=False))
+        console.print(f"[green]Report saved to {output}[/green]")
+
+
+@experiment.command("tune")
+@click.option("--sample", default=5, show_default=True, help="Number of PDFs indexed per probe.")
+@click.option("--strategy", type=click.Choice(["adaptive", "grid"]), default="adaptive", show_default=True)
+@click.option("--max-throttle-rate", default=0.05, show_default=True,
+              help="Highest acceptable share of throttled LLM calls.")
+@click.option("--max-trials", default=12, show_default=True, help="Probe budget for the adaptive search.")
+@click.option("--profile", default="tuned", show_default=True,
+              help="Config profile to write (name under experiments/profiles/ or a path).")
+@click.option("--offline", is_flag=True, help="Probe a local stub LLM/graph store instead of Bedrock/Neptune.")
+@click.option("--graph-store", default=None, help="Scratch graph store the probes write to.")
+@click.option("--vector-store", default=None, help="Scratch vector store the probes write to.")
+@click.option("--yes", "-y", is_flag=True, help="Allow probes to write to the configured graph/vector stores.")
+def experiment_tune(
+    sample: int, strategy: str, max_throttle_rate: float, max_trials: int, profile: str, offline: bool,
+    graph_store: str | None, vector_store: str | None, yes: bool,
+) -> None:
+    """Tune extraction/build worker counts with short indexing probes.
+
+    Live probes re-extract the sample documents and write the results, so
+    they need scratch --graph-store/--vector-store targets, or --yes to
+    write to the configured stores.
+    """
+    from tiger_etf.graphrag.loader import load_pdfs
+    from tiger_etf.graphrag.tuner import StubIndex, tune, write_profile
+
+    if not offline and not yes and not (graph_store and vector_store):
+        console.print(
+            "[red]Live probes write fresh extractions: pass scratch --graph-store and "
+            "--vector-store, --yes to use the configured stores, or --offline.[/red]"
+        )
+        return
+
+    docs = load_pdfs(limit=sample)
+    if not docs:
+        console.print("[red]No PDF documents found.[/red]")
+        return
+
+    console.print(f"[bold]Tuning on {sample} PDFs ({len(docs)} pages), strategy={strategy}[/bold]")
+    try:
+        best, trials = tune(
+            docs, strategy=strategy, max_throttle_rate=max_throttle_rate, max_trials=max_trials,
+            index_factory=StubIndex if offline else None,
+            graph_store=graph_store, vector_store=vector_store, allow_live=yes,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    table = Table(title="Tuning Probes")
+    table.add_column("Workers", justify="right")
+    table.add_column("Threads/Worker", justify="right")
+    table.add_column("Build Workers", justify="right")
+    table.add_column("Docs/min", justify="right", style="green")
+    table.add_column("Throttle", justify="right")
+    table.add_column("Status")
+    for t in trials:
+        p = t.params
+        table.add_row(
+            str(p["extraction_num_workers"]),
+            str(p["extraction_num_threads_per_worker"]),
+            str(p["build_num_workers"]),
+            f"{t.docs_per_min:.1f}",
+            f"{t.throttle_rate:.1%}" if t.throttle_data else "n/a",
+            "[red]failed[/red]" if t.error else ("best" if t is best else ""),
+        )
+    console.print(table)
+
+    if best is None:
+        console.print(f"[red]No probe stayed within a {max_throttle_rate:.0%} throttle rate.[/red]")
+        return
+    path = write_profile(
+        profile, best, trials,
+        strategy=strategy, max_throttle_rate=max_throttle_rate, offline=offline,
+        graph_store=graph_store,
+    )
+    console.print(f"[green]Best settings written to {path}[/green]")
+    if not offline:
+        console.print(f"  Use with: CONFIG_PROFILE={profile} tiger-etf graphrag build")
+
+
 @experiment.command("compare")
 @click.argument("names", nargs=-1)
-def experiment_compare(names: tuple[str, ...]) -> None:
+@click.option("--rescore", is_flag=True, help="Re-score saved eval results (cached judge scores are reused).")
+def experiment_compare(names: tuple[str, ...], rescore: bool) -> None:
     """Compare experiment results. Pass names or leave empty for all."""
     import json as _json
     from pathlib import Path as _Path
@@ -475,6 +688,17 @@ def experiment_compare(names: tuple[str, ...]) -> None:
         console.print("[red]No matching results found.[/red]")
         return
 
+    if rescore:
+        from tiger_etf.graphrag.experiment import rescore_result
+
+        for r in results:
+            rescore_result(r)
+            lj = r.get("evaluation", {}).get("llm_judge", {})
+            console.print(
+                f"  Re-scored {r.get('name', '?')}: "
+                f"judge cache {lj.get('cache_hits', 0)} hits, {lj.get('cache_misses', 0)} misses"
+            )
+
     table = Table(title="Experiment Comparison")
     table.add_column("Experiment", style="cyan")
     table.add_column("Extraction LLM", style="yellow")
@@ -483,6 +707,10 @@ def experiment_compare(names: tuple[str, ...]) -> None:
     table.add_column("Edges", justify="right", style="green")
     table.add_column("Duration", justify="right")
     table.add_column("Latency", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Err", justify="right")
+    table.add_column("QPS", justify="right")
     table.add_column("Score", justify="right", style="bold green")
     table.add_column("KW Hit", justify="right")
     table.add_column("Correct", justify="right")
@@ -492,6 +720,7 @@ def experiment_compare(names: tuple[str, ...]) -> None:
         m = r.get("metrics", {})
         ev = r.get("evaluation", {})
         lj = ev.get("llm_judge", {})
+        lat = ev.get("latency", {})
         table.add_row(
             r.get("name", "?"),
             cfg.get("extraction_llm", "?").split(".")[-1][:35],
@@ -500,6 +729,10 @@ def experiment_compare(names: tuple[str, ...]) -> None:
             f"{m.get('total_edges', 0):,}",
             f"{r.get('duration_minutes', 0):.1f}m",
             f"{r.get('avg_query_latency_seconds', 0):.2f}s",
+            f"{lat['p95']:.2f}s" if lat else "-",
+            f"{lat['p99']:.2f}s" if lat else "-",
+            f"{ev['error_rate']:.0%}" if "error_rate" in ev else "-",
+            f"{ev['qps']:.2f}" if ev.get("qps") else "-",
             f"{ev.get('overall_score', 0):.3f}" if ev else "-",
             f"{ev.get('keyword_hit_rate', 0):.0%}" if ev else "-",
             f"{lj.get('avg_correctness', 0):.1f}" if lj else "-",
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, Tuple, Type
 
@@ -25,10 +26,36 @@ def _find_config_yaml() -> Path:
     return Path("config.yaml")
 
 
+def profile_path(name: str, base: Path | None = None) -> Path:
+    """Resolve a config profile name or path.
+
+    A bare name refers to ``experiments/profiles/<name>.yaml`` next to
+    config.yaml; anything with a suffix or separator is used as a path
+    (relative paths are resolved against the config.yaml directory).
+    """
+    base = base or _find_config_yaml().resolve().parent
+    path = Path(name)
+    if path.suffix or len(path.parts) > 1:
+        return path if path.is_absolute() else base / path
+    return base / "experiments" / "profiles" / f"{name}.yaml"
+
+
+def _merge(base: dict[str, Any], overlay: dict[str, Any]) -> dict[str, Any]:
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
 class YamlSettingsSource(PydanticBaseSettingsSource):
     """Custom pydantic-settings source that reads from config.yaml.
 
-    Loaded with lower priority than env vars and .env file.
+    Loaded with lower priority than env vars and .env file.  A config
+    profile (``CONFIG_PROFILE`` env var or top-level ``profile:`` key, e.g.
+    one written by ``experiment tune``) is merged over config.yaml.
     """
 
     def __init__(self, settings_cls: Type[BaseSettings]):
@@ -41,10 +68,14 @@ class YamlSettingsSource(PydanticBaseSettingsSource):
             return {}
         with open(path) as f:
             raw = yaml.safe_load(f) or {}
+        profile = os.environ.get("CONFIG_PROFILE") or raw.get("profile")
+        if profile:
+            with open(profile_path(profile, path.resolve().parent)) as f:
+                raw = _merge(raw, yaml.safe_load(f) or {})
 
         flat: dict[str, Any] = {}
         # Top-level scalars
-        for key in ("graph_store", "graph_store_reader", "vector_store", "database_url", "database_url_reader", "log_level", "data_dir"):
+        for key in ("graph_store", "graph_store_reader", "vector_store", "database_url", "database_url_reader", "log_level", "data_dir", "catalog_refresh_interval"):
             if key in raw:
                 flat[key] = raw[key]
 
@@ -61,10 +92,47 @@ class YamlSettingsSource(PydanticBaseSettingsSource):
                 "build_num_workers": "graphrag_build_num_workers",
                 "batch_writes_enabled": "graphrag_batch_writes_enabled",
                 "enable_cache": "graphrag_enable_cache",
+                "load_num_workers": "graphrag_load_num_workers",
+                "build_batch_size": "graphrag_build_batch_size",
+                "engine_health_check_interval": "graphrag_engine_health_check_interval",
+                "eval_concurrency": "graphrag_eval_concurrency",
+                "eval_timeout_seconds": "graphrag_eval_timeout_seconds",
             }
             for yaml_key, flat_key in mapping.items():
                 if yaml_key in graphrag:
                     flat[flat_key] = graphrag[yaml_key]
+            extraction_cache = graphrag.get("extraction_cache", {})
+            if "enabled" in extraction_cache:
+                flat["graphrag_extraction_cache_enabled"] = extraction_cache["enabled"]
+            if "max_mb" in extraction_cache:
+                flat["graphrag_extraction_cache_max_mb"] = extraction_cache["max_mb"]
+            judge = graphrag.get("judge", {})
+            for yaml_key in (
+                "concurrency", "rate", "batch_size", "max_retries",
+                "cache_enabled", "cache_max_entries",
+            ):
+                if yaml_key in judge:
+                    flat[f"graphrag_judge_{yaml_key}"] = judge[yaml_key]
+            reset = graphrag.get("reset", {})
+            for yaml_key in ("workers", "batch_size", "max_batch_size", "target_seconds"):
+                if yaml_key in reset:
+                    flat[f"graphrag_reset_{yaml_key}"] = reset[yaml_key]
+            vector = graphrag.get("vector", {})
+            for yaml_key in ("pool_maxsize", "timeout", "delete_concurrency"):
+                if yaml_key in vector:
+                    flat[f"graphrag_vector_{yaml_key}"] = vector[yaml_key]
+            resolve = graphrag.get("resolve", {})
+            for yaml_key in ("page_size", "batch_size", "similarity_threshold"):
+                if yaml_key in resolve:
+                    flat[f"graphrag_resolve_{yaml_key}"] = resolve[yaml_key]
+            router = graphrag.get("router", {})
+            for yaml_key in ("enabled", "max_rows"):
+                if yaml_key in router:
+                    flat[f"graphrag_router_{yaml_key}"] = router[yaml_key]
+            query_cache = graphrag.get("query_cache", {})
+            for yaml_key in ("enabled", "ttl", "max_entries", "similarity_threshold"):
+                if yaml_key in query_cache:
+                    flat[f"graphrag_query_cache_{yaml_key}"] = query_cache[yaml_key]
 
         # scraper section → flat keys
         scraper = raw.get("scraper", {})
@@ -75,6 +143,17 @@ class YamlSettingsSource(PydanticBaseSettingsSource):
                 flat["request_delay"] = scraper["request_delay"]
             if "max_retries" in scraper:
                 flat["max_retries"] = scraper["max_retries"]
+            if "concurrency" in scraper:
+                flat["scraper_concurrency"] = scraper["concurrency"]
+            if "upsert_chunk_size" in scraper:
+                flat["upsert_chunk_size"] = scraper["upsert_chunk_size"]
+            http_cache = scraper.get("http_cache", {})
+            if "enabled" in http_cache:
+                flat["http_cache_enabled"] = http_cache["enabled"]
+            if "max_mb" in http_cache:
+                flat["http_cache_max_mb"] = http_cache["max_mb"]
+            if "ttls" in http_cache:
+                flat["http_cache_ttls"] = http_cache["ttls"]
 
         return flat
 
@@ -114,8 +193,20 @@ class Settings(BaseSettings):
     base_url: str = "https://investments.miraeasset.com/tigeretf"
     request_delay: float = 1.0
     max_retries: int = 3
+    # Max in-flight requests for scrapers running in async mode
+    scraper_concurrency: int = 1
+    # Rows per multi-VALUES INSERT ... ON CONFLICT statement
+    upsert_chunk_size: int = 1000
+    # On-disk HTTP cache (endpoint path -> TTL seconds; unlisted endpoints bypass it)
+    http_cache_enabled: bool = True
+    http_cache_max_mb: int = 512
+    http_cache_ttls: dict[str, float] = {
+        "/ko/product/search/detail/index.do": 6 * 3600,
+    }
     log_level: str = "INFO"
     data_dir: Path = Path("./data")
+    # Seconds between version-stamp checks of the in-memory product catalog
+    catalog_refresh_interval: float = 60.0
 
     # GraphRAG stores (write endpoint for indexing, read endpoint for queries)
     # 실제 값은 .env 파일에서 설정
@@ -135,6 +226,50 @@ class Settings(BaseSettings):
     graphrag_build_num_workers: int = 1
     graphrag_batch_writes_enabled: bool = False
     graphrag_enable_cache: bool = True
+    # Processes used to parse PDFs in loader.load_pdfs (1 = in-process)
+    graphrag_load_num_workers: int = 1
+    # Documents per extract_and_build call in indexer.build_index
+    graphrag_build_batch_size: int = 100
+    # Project-level extraction LLM cache (data/graphrag/extraction_cache.sqlite3)
+    graphrag_extraction_cache_enabled: bool = True
+    graphrag_extraction_cache_max_mb: int = 1024
+    # graphrag query response cache (similarity_threshold 0 = exact match only)
+    graphrag_query_cache_enabled: bool = True
+    graphrag_query_cache_ttl: float = 24 * 3600
+    graphrag_query_cache_max_entries: int = 1000
+    graphrag_query_cache_similarity_threshold: float = 0.0
+    # Seconds between health checks of a pooled query engine
+    graphrag_engine_health_check_interval: float = 300.0
+    # Graph reset: label partitions deleted in parallel, initial / max nodes
+    # per delete batch, batch latency the batch size is steered towards
+    graphrag_reset_workers: int = 4
+    graphrag_reset_batch_size: int = 2000
+    graphrag_reset_max_batch_size: int = 50_000
+    graphrag_reset_target_seconds: float = 5.0
+    # OpenSearch Serverless: pooled keep-alive connections per endpoint,
+    # request timeout (seconds), indexes deleted/recreated concurrently
+    graphrag_vector_pool_maxsize: int = 10
+    graphrag_vector_timeout: float = 30.0
+    graphrag_vector_delete_concurrency: int = 4
+    # Entity resolution: entities per page pulled, merges per write batch,
+    # bigram Dice similarity for merging near-duplicates (0 = off)
+    graphrag_resolve_page_size: int = 5000
+    graphrag_resolve_batch_size: int = 200
+    graphrag_resolve_similarity_threshold: float = 0.9
+    # Intent router: structured questions answered by SQL on the reader endpoint
+    graphrag_router_enabled: bool = True
+    graphrag_router_max_rows: int = 20
+    # experiment eval queries: max in flight / per-question timeout (seconds)
+    graphrag_eval_concurrency: int = 4
+    graphrag_eval_timeout_seconds: float = 180.0
+    # LLM-as-Judge: calls in flight, requests/sec, pairs per prompt, throttling retries
+    graphrag_judge_concurrency: int = 4
+    graphrag_judge_rate: float = 2.0
+    graphrag_judge_batch_size: int = 1
+    graphrag_judge_max_retries: int = 5
+    # Judge score cache (data/graphrag/judge_cache.sqlite3)
+    graphrag_judge_cache_enabled: bool = True
+    graphrag_judge_cache_max_entries: int = 100_000
 
     @classmethod
     def settings_customise_sources(
@@ -166,6 +301,18 @@ class Settings(BaseSettings):
         d.mkdir(parents=True, exist_ok=True)
         return d
 
+    @property
+    def graphrag_dir(self) -> Path:
+        d = self.data_dir / "graphrag"
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
+    @property
+    def http_cache_dir(self) -> Path:
+        d = self.data_dir / "http_cache"
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
     @property
     def logs_dir(self) -> Path:
         d = self.data_dir / "logs"
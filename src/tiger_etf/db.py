@@ -1,10 +1,15 @@
+import time
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Iterable, Sequence
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from tiger_etf.config import settings
+from tiger_etf.utils.logging_config import get_logger
+
+log = get_logger("db")
 
 engine = create_engine(
     settings.database_url,
@@ -58,3 +63,50 @@ def init_schema() -> None:
         conn.execute(text("CREATE SCHEMA IF NOT EXISTS tiger_etf"))
         conn.commit()
     Base.metadata.create_all(engine)
+
+
+def bulk_upsert(
+    session: Session,
+    model: type,
+    rows: Iterable[dict[str, Any]],
+    *,
+    key_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    chunk_size: int | None = None,
+) -> int:
+    """Upsert rows with one multi-row INSERT ... ON CONFLICT per chunk.
+
+    ``key_cols`` must match a unique constraint of ``model``.  Rows sharing
+    the same key are collapsed (last one wins) since PostgreSQL rejects a
+    statement that updates the same row twice.  ``update_cols`` defaults
+    to every non-key column of the first row.
+
+    Returns the number of rows sent.
+    """
+    deduped: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        deduped[tuple(row[c] for c in key_cols)] = row
+    values = list(deduped.values())
+    if not values:
+        return 0
+
+    if update_cols is None:
+        update_cols = [c for c in values[0] if c not in key_cols]
+    chunk_size = chunk_size or settings.upsert_chunk_size
+
+    start = time.monotonic()
+    for i in range(0, len(values), chunk_size):
+        stmt = insert(model).values(values[i:i + chunk_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_cols),
+            set_={c: stmt.excluded[c] for c in update_cols},
+        )
+        session.execute(stmt)
+    elapsed = time.monotonic() - start
+
+    log.info(
+        f"Upserted {len(values)} rows into {model.__tablename__} "
+        f"in {elapsed:.2f}s ({len(values) / max(elapsed, 1e-9):,.0f} rows/s, "
+        f"chunk_size={chunk_size})"
+    )
+    return len(values)
@@ -0,0 +1,80 @@
+"""Shared AWS endpoint helpers and the pooled OpenSearch client.
+
+:func:`region_from_endpoint` reads the region out of Neptune and
+OpenSearch Serverless hostnames.  :func:`get_opensearch_client` returns one
+SigV4-signed client per collection endpoint for the whole process; its
+``requests`` connection pool keeps connections alive between calls, so
+reset, stats and other vector operations do not pay a TLS handshake each.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+from tiger_etf.config import settings
+
+# Hostname part that follows the region: <...>.<region>.<service>.amazonaws.com
+_SERVICES = ("neptune", "aoss", "es")
+
+_clients: dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def region_from_endpoint(endpoint: str) -> str:
+    """Extract the AWS region from an endpoint hostname or URL.
+
+    Example: 'db-xxx.cluster-yyy.ap-northeast-2.neptune.amazonaws.com' → 'ap-northeast-2',
+    'https://xxx.ap-northeast-2.aoss.amazonaws.com' → 'ap-northeast-2'.
+    Falls back to ``settings.graphrag_aws_region``.
+    """
+    parts = opensearch_host(endpoint).split(".")
+    for i, part in enumerate(parts):
+        if part in _SERVICES and i > 0:
+            return parts[i - 1]
+    return settings.graphrag_aws_region
+
+
+def opensearch_host(endpoint: str) -> str:
+    """Bare hostname of a vector store URI (``aoss://``, ``https://`` or plain host)."""
+    host = endpoint.strip()
+    for prefix in ("aoss://", "https://", "http://"):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host.split("/")[0].split(":")[0]
+
+
+def get_opensearch_client(endpoint: Optional[str] = None) -> Any:
+    """Pooled OpenSearch Serverless client for ``endpoint`` (default ``settings.vector_store``)."""
+    host = opensearch_host(endpoint or settings.vector_store)
+    with _lock:
+        client = _clients.get(host)
+        if client is None:
+            client = _clients[host] = _make_client(host)
+        return client
+
+
+def _make_client(host: str) -> Any:
+    import boto3
+    from opensearchpy import OpenSearch, RequestsAWSV4SignerAuth, RequestsHttpConnection
+
+    region = region_from_endpoint(host)
+    credentials = boto3.Session(region_name=region).get_credentials()
+    return OpenSearch(
+        hosts=[{"host": host, "port": 443}],
+        http_auth=RequestsAWSV4SignerAuth(credentials, region, "aoss"),
+        use_ssl=True,
+        verify_certs=True,
+        connection_class=RequestsHttpConnection,
+        pool_maxsize=settings.graphrag_vector_pool_maxsize,
+        timeout=settings.graphrag_vector_timeout,
+    )
+
+
+def close_clients() -> None:
+    """Close and drop every pooled client."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
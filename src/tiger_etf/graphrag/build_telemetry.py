@@ -0,0 +1,285 @@
+"""Throughput telemetry for ``build_index``.
+
+While a build is recorded, llama_index instrumentation events and the
+writer graph store are observed to count, per batch:
+
+- extraction: chunks sent to the extraction LLM, LLM calls, tokens in/out
+  (provider-reported usage), failed calls and throttles
+- graph build: write queries, nodes and edges written (rows of the
+  toolkit's ``UNWIND $params`` batch writes), rows per write
+- vector writes: embedding calls and embeddings produced
+
+Each batch is logged as one record with a ``metrics`` field (written to the
+JSONL pipeline log by ``JSONFileHandler``), and :meth:`BuildTelemetry.summary`
+totals the run for the experiment result JSON.  ``*_seconds`` values are
+summed call time, so ``llm_concurrency`` / ``graph_write_concurrency``
+(summed time over wall time) show how busy the extraction threads and
+build workers were.  Only work done in the building process is seen.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from tiger_etf.graphrag.query_profile import llm_usage
+
+logger = logging.getLogger(__name__)
+
+_THROTTLING_MARKERS = ("Throttling", "TooManyRequests", "Too many requests", "Rate exceeded")
+
+_active: Optional[BuildTelemetry] = None
+_install_lock = threading.Lock()
+_handlers_installed = False
+
+
+def _is_throttle(err: BaseException) -> bool:
+    # botocore errors carry a dict; others may have None or an HTTP response object
+    resp = getattr(err, "response", None)
+    code = resp.get("Error", {}).get("Code", "") if isinstance(resp, dict) else ""
+    text = f"{type(err).__name__} {code} {err}"
+    return any(marker in text for marker in _THROTTLING_MARKERS)
+
+
+def _rows(parameters: Any) -> int:
+    """Rows written by one query: the length of an ``UNWIND $params`` list, else 1."""
+    if isinstance(parameters, dict):
+        params = parameters.get("params")
+        if isinstance(params, list):
+            return len(params)
+    return 1
+
+
+def _is_edge_write(cypher: str) -> bool:
+    return "]->" in cypher or "<-[" in cypher
+
+
+class BuildTelemetry:
+    """Counters for one ``build_index`` run, reported per batch and in total."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, float] = {}
+        self._starts: dict[tuple[str, Optional[str]], float] = {}
+        self._chunks: set[bytes] = set()
+        self._errors: set[int] = set()
+        self._batch_start = 0.0
+        self._batch_counts: dict[str, float] = {}
+        self.batches: list[dict[str, Any]] = []
+
+    # -- recording -------------------------------------------------------
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + n
+
+    def start(self, kind: str, span_id: Optional[str]) -> None:
+        with self._lock:
+            self._starts[(kind, span_id)] = time.monotonic()
+
+    def end(self, kind: str, span_id: Optional[str]) -> None:
+        with self._lock:
+            start = self._starts.pop((kind, span_id), None)
+        if start is not None:
+            self.count(f"{kind}_seconds", time.monotonic() - start)
+
+    def chunk(self, text: str) -> None:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._lock:
+            if digest in self._chunks:
+                return
+            self._chunks.add(digest)
+        self.count("chunks")
+
+    def llm_error(self, err: BaseException) -> None:
+        # The same exception drops every enclosing LLM span; count it once
+        with self._lock:
+            if id(err) in self._errors:
+                return
+            self._errors.add(id(err))
+        self.count("llm_errors")
+        if _is_throttle(err):
+            self.count("llm_throttles")
+
+    # -- batches ---------------------------------------------------------
+
+    def begin_batch(self) -> None:
+        with self._lock:
+            self._batch_counts = dict(self._counts)
+            self._chunks.clear()
+            self._errors.clear()
+        self._batch_start = time.monotonic()
+
+    def end_batch(self, documents: list[Any]) -> dict[str, Any]:
+        seconds = time.monotonic() - self._batch_start
+        with self._lock:
+            delta = {k: v - self._batch_counts.get(k, 0) for k, v in self._counts.items()}
+        delta["documents"] = len(documents)
+        delta["characters"] = sum(len(getattr(d, "text", "")) for d in documents)
+        delta["seconds"] = seconds
+        self.count("documents", delta["documents"])
+        self.count("characters", delta["characters"])
+        self.count("seconds", seconds)
+
+        metrics = {"batch": len(self.batches) + 1, **_rates(delta)}
+        self.batches.append(metrics)
+        logger.info(
+            "Batch %d telemetry: %.1f chunks/s, %d LLM calls (%d throttled), "
+            "%.1f nodes/s, %.1f edges/s, %.1f embeddings/s",
+            metrics["batch"], metrics["extraction"]["chunks_per_sec"],
+            metrics["extraction"]["llm_calls"], metrics["extraction"]["throttles"],
+            metrics["graph"]["nodes_per_sec"], metrics["graph"]["edges_per_sec"],
+            metrics["vector"]["embeddings_per_sec"],
+            extra={"metrics": metrics},
+        )
+        return metrics
+
+    def summary(self) -> dict[str, Any]:
+        """Totals and overall rates across all batches."""
+        with self._lock:
+            totals = dict(self._counts)
+        return {"batches": len(self.batches), **_rates(totals)}
+
+
+def _rates(c: dict[str, float]) -> dict[str, Any]:
+    seconds = c.get("seconds", 0.0)
+
+    def per_sec(value: float) -> float:
+        return round(value / seconds, 2) if seconds > 0 else 0.0
+
+    writes = int(c.get("graph_writes", 0))
+    rows = c.get("nodes_written", 0) + c.get("edges_written", 0)
+    return {
+        "seconds": round(seconds, 2),
+        "documents": int(c.get("documents", 0)),
+        "characters": int(c.get("characters", 0)),
+        "extraction": {
+            "chunks": int(c.get("chunks", 0)),
+            "chunks_per_sec": per_sec(c.get("chunks", 0)),
+            "llm_calls": int(c.get("llm_calls", 0)),
+            "prompt_tokens": int(c.get("prompt_tokens", 0)),
+            "completion_tokens": int(c.get("completion_tokens", 0)),
+            "errors": int(c.get("llm_errors", 0)),
+            "throttles": int(c.get("llm_throttles", 0)),
+            "llm_seconds": round(c.get("llm_seconds", 0.0), 2),
+            "llm_concurrency": per_sec(c.get("llm_seconds", 0.0)),
+        },
+        "graph": {
+            "writes": writes,
+            "nodes_written": int(c.get("nodes_written", 0)),
+            "edges_written": int(c.get("edges_written", 0)),
+            "nodes_per_sec": per_sec(c.get("nodes_written", 0)),
+            "edges_per_sec": per_sec(c.get("edges_written", 0)),
+            "avg_rows_per_write": round(rows / writes, 1) if writes else 0.0,
+            "write_seconds": round(c.get("graph_write_seconds", 0.0), 2),
+            "graph_write_concurrency": per_sec(c.get("graph_write_seconds", 0.0)),
+        },
+        "vector": {
+            "embedding_calls": int(c.get("embedding_calls", 0)),
+            "embeddings": int(c.get("embeddings", 0)),
+            "embeddings_per_sec": per_sec(c.get("embeddings", 0)),
+            "embedding_seconds": round(c.get("embedding_seconds", 0.0), 2),
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Activation and hooks
+# ---------------------------------------------------------------------------
+
+def activate(telemetry: Optional[BuildTelemetry]) -> None:
+    """Direct build events to ``telemetry`` (None stops recording)."""
+    global _active
+    if telemetry is not None:
+        _install_handlers()
+    _active = telemetry
+
+
+def instrument_graph_writes(graph_store: Any) -> Any:
+    """Count rows and time of ``graph_store.execute_query`` during recorded builds."""
+    execute_query = graph_store.execute_query
+
+    @functools.wraps(execute_query)
+    def timed(cypher: str, parameters: Any = None, *args: Any, **kwargs: Any) -> Any:
+        telemetry = _active
+        if telemetry is None:
+            return execute_query(cypher, parameters, *args, **kwargs)
+        start = time.monotonic()
+        try:
+            return execute_query(cypher, parameters, *args, **kwargs)
+        finally:
+            telemetry.count("graph_write_seconds", time.monotonic() - start)
+            telemetry.count("graph_writes")
+            kind = "edges_written" if _is_edge_write(cypher) else "nodes_written"
+            telemetry.count(kind, _rows(parameters))
+
+    object.__setattr__(graph_store, "execute_query", timed)
+    return graph_store
+
+
+def _handle(event: Any) -> None:
+    telemetry = _active
+    if telemetry is None:
+        return
+    name = type(event).__name__
+    span_id = getattr(event, "span_id", None)
+
+    if name == "LLMPredictStartEvent":
+        text = (getattr(event, "template_args", None) or {}).get("text")
+        if isinstance(text, str):
+            telemetry.chunk(text)
+    elif name in ("LLMChatStartEvent", "LLMCompletionStartEvent"):
+        telemetry.start("llm", span_id)
+    elif name in ("LLMChatEndEvent", "LLMCompletionEndEvent"):
+        telemetry.end("llm", span_id)
+        prompt_tokens, completion_tokens = llm_usage(event.response)
+        telemetry.count("llm_calls")
+        telemetry.count("prompt_tokens", prompt_tokens)
+        telemetry.count("completion_tokens", completion_tokens)
+    elif name == "EmbeddingStartEvent":
+        telemetry.start("embedding", span_id)
+    elif name == "EmbeddingEndEvent":
+        telemetry.end("embedding", span_id)
+        telemetry.count("embedding_calls")
+        telemetry.count("embeddings", len(event.embeddings))
+
+
+def _install_handlers() -> None:
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    from llama_index.core.instrumentation import get_dispatcher
+    from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+    from llama_index.core.instrumentation.span_handlers import NullSpanHandler
+    from llama_index.core.base.llms.base import BaseLLM
+
+    class _BuildEventHandler(BaseEventHandler):
+        @classmethod
+        def class_name(cls) -> str:
+            return "GraphRAGBuildTelemetryHandler"
+
+        def handle(self, event: Any, **kwargs: Any) -> None:
+            _handle(event)
+
+    class _LLMErrorSpanHandler(NullSpanHandler):
+        """Counts LLM calls that raised (each retry attempt drops a span)."""
+
+        @classmethod
+        def class_name(cls) -> str:
+            return "GraphRAGBuildLLMErrorHandler"
+
+        def span_drop(self, *args: Any, instance: Any = None, err: Any = None, **kwargs: Any) -> None:
+            telemetry = _active
+            if telemetry is not None and err is not None and isinstance(instance, BaseLLM):
+                telemetry.llm_error(err)
+
+    with _install_lock:
+        if not _handlers_installed:
+            dispatcher = get_dispatcher()
+            dispatcher.add_event_handler(_BuildEventHandler())
+            dispatcher.add_span_handler(_LLMErrorSpanHandler())
+            _handlers_installed = True
@@ -6,14 +6,31 @@ and LLM-as-Judge scoring (correctness, faithfulness, completeness).
 
 from __future__ import annotations
 
+import functools
+import gzip
+import itertools
 import json
 import logging
+import math
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import yaml
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from tiger_etf.graphrag.judge_cache import JudgeCache
+from tiger_etf.utils.quantile import QuantileSketch
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +55,11 @@ class EvalQuestion:
     aggregation_type: str = ""
     inference_type: str = ""
 
+    @functools.cached_property
+    def matcher(self) -> ResponseMatcher:
+        """Compiled keyword/refusal matcher for this question."""
+        return ResponseMatcher.for_question(self)
+
 
 @dataclass
 class QuestionResult:
@@ -72,6 +94,13 @@ class CategoryScore:
     avg_faithfulness: float = 0.0
     avg_completeness: float = 0.0
     avg_latency: float = 0.0
+    latency_p50: float = 0.0
+    latency_p90: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+    error_rate: float = 0.0
+    qps: float = 0.0
 
 
 @dataclass
@@ -90,6 +119,17 @@ class EvalReport:
     overall_score: float = 0.0
     avg_latency: float = 0.0
     total_questions: int = 0
+    # Latency percentiles (successful queries), failures and throughput
+    latency_p50: float = 0.0
+    latency_p90: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+    error_rate: float = 0.0
+    qps: float = 0.0
+    # Judge score cache usage for this evaluation
+    judge_cache_hits: int = 0
+    judge_cache_misses: int = 0
     # Breakdown
     by_category: dict[str, CategoryScore] = field(default_factory=dict)
     details: list[QuestionResult] = field(default_factory=list)
@@ -150,23 +190,6 @@ def load_eval_questions(path: Path | None = None) -> list[EvalQuestion]:
 # Automated metrics
 # ---------------------------------------------------------------------------
 
-def evaluate_keyword_hit(response: str, expected_keywords: list[str]) -> bool:
-    """Check if at least one expected keyword appears in the response."""
-    if not expected_keywords:
-        return False
-    resp_lower = response.lower()
-    return any(kw.lower() in resp_lower for kw in expected_keywords)
-
-
-def evaluate_keyword_coverage(response: str, expected_keywords: list[str]) -> float:
-    """Return fraction of expected keywords found in the response."""
-    if not expected_keywords:
-        return 0.0
-    resp_lower = response.lower()
-    matched = sum(1 for kw in expected_keywords if kw.lower() in resp_lower)
-    return matched / len(expected_keywords)
-
-
 # Patterns for negative question detection
 _REFUSAL_PATTERNS = [
     r"없", r"찾을\s*수\s*없", r"존재하지\s*않", r"확인할\s*수\s*없",
@@ -183,22 +206,106 @@ _DISCLAIMER_PATTERNS = [
 ]
 
 
-def evaluate_negative(response: str, check_type: str) -> bool:
-    """Evaluate negative/hallucination detection questions."""
-    if check_type == "should_not_hallucinate":
-        return any(re.search(p, response) for p in _REFUSAL_PATTERNS)
+def _any_of(patterns: list[str]) -> re.Pattern[str]:
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+_REFUSAL_RE = _any_of(_REFUSAL_PATTERNS)
+
+# check type -> pattern that must appear; unknown types fall back to refusal
+_NEGATIVE_CHECKS: dict[str, re.Pattern[str]] = {
+    "should_not_hallucinate": _REFUSAL_RE,
+    "should_correct_premise": _any_of(_CORRECTION_PATTERNS_MIRAE),
+    "should_not_fabricate_data": _REFUSAL_RE,
+    "should_provide_accurate_disclaimer": _any_of(_DISCLAIMER_PATTERNS),
+}
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Automated verdicts for one response."""
+
+    keyword_hit: bool
+    keyword_coverage: float
+    negative_pass: bool | None = None
+
 
-    if check_type == "should_correct_premise":
-        return any(re.search(p, response) for p in _CORRECTION_PATTERNS_MIRAE)
+class ResponseMatcher:
+    """Keyword and refusal checks for one question, compiled once.
 
-    if check_type == "should_not_fabricate_data":
-        return any(re.search(p, response) for p in _REFUSAL_PATTERNS)
+    All expected keywords are folded into a single alternation inside a
+    lookahead, longest first, so one ``finditer`` pass over the lowercased
+    response reports the longest keyword starting at every position.  Keywords that
+    are substrings of another keyword are implied by it, which makes the
+    result identical to testing each keyword with ``in``.
+    """
+
+    __slots__ = ("keywords", "_regex", "_implied", "_negative")
+
+    def __init__(self, expected_keywords: list[str], check: str | None = None) -> None:
+        self.keywords = [kw.lower() for kw in expected_keywords]
+        distinct = sorted({kw for kw in self.keywords if kw}, key=len, reverse=True)
+        self._regex = (
+            re.compile(
+                "(?=(" + "|".join(re.escape(kw) for kw in distinct) + "))"
+            )
+            if distinct else None
+        )
+        # matched keyword -> every keyword it contains (itself included)
+        self._implied = {
+            kw: frozenset(other for other in distinct if other in kw) for kw in distinct
+        }
+        self._negative = (
+            None if check is None else _NEGATIVE_CHECKS.get(check, _REFUSAL_RE)
+        )
+
+    @classmethod
+    def for_question(cls, eq: EvalQuestion) -> ResponseMatcher:
+        return cls(
+            eq.expected_keywords,
+            check=eq.check if eq.category == "negative" else None,
+        )
+
+    def found(self, response: str) -> set[str]:
+        """Distinct (lowercased) keywords present in ``response``."""
+        found: set[str] = {""} if "" in self.keywords else set()
+        if self._regex is not None:
+            for m in self._regex.finditer(response.lower()):
+                matched = m.group(1)
+                if matched not in found:
+                    found |= self._implied[matched]
+        return found
+
+    def match(self, response: str) -> MatchResult:
+        hit, coverage = False, 0.0
+        if self.keywords:
+            found = self.found(response)
+            matched = sum(1 for kw in self.keywords if kw in found)
+            hit, coverage = matched > 0, matched / len(self.keywords)
+        negative = (
+            None if self._negative is None else self._negative.search(response) is not None
+        )
+        return MatchResult(keyword_hit=hit, keyword_coverage=coverage, negative_pass=negative)
+
+
+@functools.lru_cache(maxsize=1024)
+def _keyword_matcher(expected_keywords: tuple[str, ...]) -> ResponseMatcher:
+    return ResponseMatcher(list(expected_keywords))
+
+
+def evaluate_keyword_hit(response: str, expected_keywords: list[str]) -> bool:
+    """Check if at least one expected keyword appears in the response."""
+    return _keyword_matcher(tuple(expected_keywords)).match(response).keyword_hit
+
+
+def evaluate_keyword_coverage(response: str, expected_keywords: list[str]) -> float:
+    """Return fraction of expected keywords found in the response."""
+    return _keyword_matcher(tuple(expected_keywords)).match(response).keyword_coverage
 
-    if check_type == "should_provide_accurate_disclaimer":
-        return any(re.search(p, response) for p in _DISCLAIMER_PATTERNS)
 
-    # Unknown check type — treat as pass if any refusal pattern matched
-    return any(re.search(p, response) for p in _REFUSAL_PATTERNS)
+def evaluate_negative(response: str, check_type: str) -> bool:
+    """Evaluate negative/hallucination detection questions."""
+    return _NEGATIVE_CHECKS.get(check_type, _REFUSAL_RE).search(response) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -243,6 +350,252 @@ _JUDGE_PROMPT_TEMPLATE = """\
 """
 
 
+_JUDGE_BATCH_PROMPT_TEMPLATE = """\
+당신은 GraphRAG 시스템의 응답 품질을 평가하는 전문 평가자입니다.
+아래 {count}개의 평가 대상을 각각 독립적으로 평가하세요.
+
+{items}
+
+## 평가 기준 (각 항목 1~5점)
+- Correctness (정확성): 5 완전히 정확 ~ 1 부정확하거나 관련 없음
+- Faithfulness (충실성): 5 hallucination 없음 ~ 1 대부분 hallucination
+- Completeness (완전성): 5 모든 요구사항을 다룸 ~ 1 거의 답변하지 못함
+
+## 출력 형식
+반드시 아래 JSON 배열 형식으로만 응답하세요. 평가 대상마다 하나씩, id 순서대로 포함하세요.
+[{{"id": 1, "correctness": <1-5>, "faithfulness": <1-5>, "completeness": <1-5>}}, ...]
+"""
+
+_JUDGE_BATCH_ITEM_TEMPLATE = """\
+## 평가 대상 {id}
+- **질문**: {question}
+- **기대 키워드**: {expected_keywords}
+- **기대 답변**: {expected_answer}
+- **시스템 응답**: {response}
+"""
+
+# Any change to the judge prompts invalidates cached scores
+_JUDGE_TEMPLATES = "\n".join((
+    _JUDGE_PROMPT_TEMPLATE, _JUDGE_BATCH_PROMPT_TEMPLATE, _JUDGE_BATCH_ITEM_TEMPLATE,
+))
+
+_ZERO_SCORES = {"correctness": 0.0, "faithfulness": 0.0, "completeness": 0.0}
+
+# Bedrock error codes worth retrying with backoff
+_THROTTLING_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+@dataclass
+class JudgeItem:
+    """One question/response pair to score."""
+
+    question: str
+    response: str
+    expected_keywords: list[str] = field(default_factory=list)
+    expected_answer: str = ""
+
+    def prompt_fields(self) -> dict[str, str]:
+        return {
+            "question": self.question,
+            "expected_keywords": (
+                ", ".join(self.expected_keywords) if self.expected_keywords else "(없음)"
+            ),
+            "expected_answer": self.expected_answer or "(없음)",
+            "response": self.response[:3000],
+        }
+
+
+def _is_throttling(exc: BaseException) -> bool:
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code", "")
+    return code in _THROTTLING_CODES
+
+
+def _parse_scores(obj: dict[str, Any]) -> dict[str, float]:
+    return {
+        "correctness": float(obj.get("correctness", 0)),
+        "faithfulness": float(obj.get("faithfulness", 0)),
+        "completeness": float(obj.get("completeness", 0)),
+    }
+
+
+class _RateLimiter:
+    """Thread-safe limiter spacing calls at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class JudgeExecutor:
+    """Scores responses with the judge model.
+
+    One bedrock-runtime client is shared by all calls.  Up to
+    ``concurrency`` judge calls run at once, started no faster than
+    ``rate`` per second, and throttling errors are retried with
+    exponential backoff.  With ``batch_size`` > 1, that many pairs are
+    packed into one prompt that asks for a JSON array of scores; pairs
+    missing from the array are re-scored one at a time.
+
+    Scores are looked up in (and saved to) the :class:`JudgeCache` unless
+    ``use_cache`` is false; failed judgements (all zeros) are not cached.
+    """
+
+    def __init__(
+        self,
+        model_id: str | None = None,
+        *,
+        concurrency: int | None = None,
+        rate: float | None = None,
+        batch_size: int | None = None,
+        max_retries: int | None = None,
+        client: Any = None,
+        use_cache: bool | None = None,
+    ) -> None:
+        from tiger_etf.config import settings
+
+        self.model_id = model_id or settings.graphrag_response_llm
+        self.concurrency = max(1, concurrency or settings.graphrag_judge_concurrency)
+        self.batch_size = max(1, batch_size or settings.graphrag_judge_batch_size)
+        self.max_retries = max_retries or settings.graphrag_judge_max_retries
+        self._limiter = _RateLimiter(settings.graphrag_judge_rate if rate is None else rate)
+        self._client = client
+        self._client_lock = threading.Lock()
+        if use_cache is None:
+            use_cache = settings.graphrag_judge_cache_enabled
+        self.cache: JudgeCache | None = JudgeCache() if use_cache else None
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import boto3
+                    from tiger_etf.config import settings
+
+                    self._client = boto3.client(
+                        "bedrock-runtime", region_name=settings.graphrag_aws_region
+                    )
+        return self._client
+
+    def score(self, items: list[JudgeItem]) -> list[dict[str, float]]:
+        """Return scores for ``items`` in order (zeros where judging failed)."""
+        if self.cache is None:
+            return self._score_uncached(items)
+
+        results: list[dict[str, float] | None] = []
+        keys: list[str] = []
+        for item in items:
+            key = JudgeCache.key_for(item.prompt_fields(), self.model_id, _JUDGE_TEMPLATES)
+            keys.append(key)
+            results.append(self.cache.get(key))
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        for i, scores in zip(pending, self._score_uncached([items[i] for i in pending])):
+            results[i] = scores
+            if any(scores.values()):
+                self.cache.put(keys[i], self.model_id, scores)
+        return results
+
+    def _score_uncached(self, items: list[JudgeItem]) -> list[dict[str, float]]:
+        batches = [
+            items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)
+        ]
+        if len(batches) <= 1 or self.concurrency == 1:
+            scored = [self._score_batch(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="judge") as pool:
+                scored = list(pool.map(self._score_batch, batches))
+        return [s for batch in scored for s in batch]
+
+    def _score_batch(self, batch: list[JudgeItem]) -> list[dict[str, float]]:
+        if len(batch) == 1:
+            return [self._score_one(batch[0])]
+
+        items_text = "\n".join(
+            _JUDGE_BATCH_ITEM_TEMPLATE.format(id=i, **item.prompt_fields())
+            for i, item in enumerate(batch, 1)
+        )
+        prompt = _JUDGE_BATCH_PROMPT_TEMPLATE.format(count=len(batch), items=items_text)
+        by_id: dict[int, dict[str, float]] = {}
+        try:
+            text = self._invoke(prompt, max_tokens=96 * len(batch))
+            match = re.search(r"\[.*\]", text, re.DOTALL)
+            if match:
+                for obj in json.loads(match.group()):
+                    by_id[int(obj["id"])] = _parse_scores(obj)
+        except Exception as e:
+            logger.warning("LLM judge batch failed, scoring individually: %s", e)
+
+        return [
+            by_id.get(i) or self._score_one(item) for i, item in enumerate(batch, 1)
+        ]
+
+    def _score_one(self, item: JudgeItem) -> dict[str, float]:
+        prompt = _JUDGE_PROMPT_TEMPLATE.format(**item.prompt_fields())
+        try:
+            text = self._invoke(prompt, max_tokens=256)
+            # Extract JSON from response
+            match = re.search(r"\{[^}]+\}", text)
+            if match:
+                return _parse_scores(json.loads(match.group()))
+        except Exception as e:
+            logger.warning("LLM judge failed: %s", e)
+        return dict(_ZERO_SCORES)
+
+    def _invoke(self, prompt: str, max_tokens: int) -> str:
+        body = json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.0,
+        })
+
+        @retry(
+            retry=retry_if_exception(_is_throttling),
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait_exponential_jitter(initial=1, max=30),
+            reraise=True,
+        )
+        def call() -> str:
+            self._limiter.wait()
+            resp = self.client.invoke_model(modelId=self.model_id, body=body)
+            result_body = json.loads(resp["body"].read())
+            return result_body["content"][0]["text"].strip()
+
+        return call()
+
+
+_executors: dict[str, JudgeExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_judge_executor(model_id: str | None = None) -> JudgeExecutor:
+    """Process-wide executor per judge model (so the client is reused)."""
+    from tiger_etf.config import settings
+
+    model_id = model_id or settings.graphrag_response_llm
+    with _executors_lock:
+        if model_id not in _executors:
+            _executors[model_id] = JudgeExecutor(model_id)
+        return _executors[model_id]
+
+
 def evaluate_with_llm(
     question: str,
     response: str,
@@ -254,56 +607,59 @@ def evaluate_with_llm(
 
     Returns dict with correctness, faithfulness, completeness (each 1-5).
     """
-    import boto3
-    from tiger_etf.config import settings
+    item = JudgeItem(question, response, expected_keywords, expected_answer)
+    return get_judge_executor(model_id).score([item])[0]
 
-    model_id = model_id or settings.graphrag_response_llm
 
-    prompt = _JUDGE_PROMPT_TEMPLATE.format(
-        question=question,
-        expected_keywords=", ".join(expected_keywords) if expected_keywords else "(없음)",
-        expected_answer=expected_answer or "(없음)",
-        response=response[:3000],
-    )
+# ---------------------------------------------------------------------------
+# Run full evaluation
+# ---------------------------------------------------------------------------
 
-    client = boto3.client("bedrock-runtime", region_name=settings.graphrag_aws_region)
-
-    body = json.dumps({
-        "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": 256,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.0,
-    })
-
-    try:
-        resp = client.invoke_model(modelId=model_id, body=body)
-        result_body = json.loads(resp["body"].read())
-        text = result_body["content"][0]["text"].strip()
-
-        # Extract JSON from response
-        match = re.search(r"\{[^}]+\}", text)
-        if match:
-            scores = json.loads(match.group())
-            return {
-                "correctness": float(scores.get("correctness", 0)),
-                "faithfulness": float(scores.get("faithfulness", 0)),
-                "completeness": float(scores.get("completeness", 0)),
-            }
-    except Exception as e:
-        logger.warning("LLM judge failed: %s", e)
+def _score_result(
+    question: str,
+    response: str,
+    latency_seconds: float,
+    status: str,
+    eq: EvalQuestion | None,
+) -> QuestionResult:
+    """Automated metrics for one answered question."""
+    if eq is None:
+        # Question not in eval set — skip evaluation
+        return QuestionResult(
+            question=question,
+            category="unknown",
+            difficulty="unknown",
+            response=response,
+            latency_seconds=latency_seconds,
+            status=status,
+        )
 
-    return {"correctness": 0.0, "faithfulness": 0.0, "completeness": 0.0}
+    qr = QuestionResult(
+        question=question,
+        category=eq.category,
+        difficulty=eq.difficulty,
+        response=response,
+        latency_seconds=latency_seconds,
+        status=status,
+    )
+    if status != "success":
+        return qr
 
+    verdict = eq.matcher.match(response)
+    if eq.category == "negative":
+        qr.negative_pass = verdict.negative_pass
+    else:
+        qr.keyword_hit = verdict.keyword_hit
+        qr.keyword_coverage = verdict.keyword_coverage
+    return qr
 
-# ---------------------------------------------------------------------------
-# Run full evaluation
-# ---------------------------------------------------------------------------
 
 def run_evaluation(
     eval_results: list[dict[str, Any]],
     eval_questions: list[EvalQuestion],
     use_llm_judge: bool = True,
     judge_model_id: str | None = None,
+    wall_clock_seconds: float | None = None,
 ) -> EvalReport:
     """Run evaluation on query results against expected answers.
 
@@ -312,6 +668,7 @@ def run_evaluation(
         eval_questions: Parsed EvalQuestion list from YAML
         use_llm_judge: Whether to run LLM-as-Judge scoring
         judge_model_id: Optional Bedrock model ID for judge LLM
+        wall_clock_seconds: Wall-clock duration of the eval run (for QPS)
 
     Returns:
         EvalReport with all scores
@@ -320,140 +677,268 @@ def run_evaluation(
     q_lookup: dict[str, EvalQuestion] = {q.question: q for q in eval_questions}
 
     details: list[QuestionResult] = []
+    to_judge: list[tuple[QuestionResult, JudgeItem]] = []
+    judge_cache = (0, 0)
 
     for r in eval_results:
-        query_text = r["query"]
-        response = r.get("response", "")
-        eq = q_lookup.get(query_text)
-
-        if eq is None:
-            # Question not in eval set — skip evaluation
-            details.append(QuestionResult(
-                question=query_text,
-                category="unknown",
-                difficulty="unknown",
-                response=response,
-                latency_seconds=r.get("latency_seconds", 0),
-                status=r.get("status", "unknown"),
-            ))
-            continue
-
-        qr = QuestionResult(
-            question=query_text,
-            category=eq.category,
-            difficulty=eq.difficulty,
-            response=response,
-            latency_seconds=r.get("latency_seconds", 0),
-            status=r.get("status", "unknown"),
+        eq = q_lookup.get(r["query"])
+        qr = _score_result(
+            r["query"], r.get("response", ""), r.get("latency_seconds", 0),
+            r.get("status", "unknown"), eq,
         )
-
-        if r.get("status") != "success":
-            details.append(qr)
-            continue
-
-        # Automated metrics
-        if eq.category == "negative":
-            qr.negative_pass = evaluate_negative(response, eq.check)
-        else:
-            qr.keyword_hit = evaluate_keyword_hit(response, eq.expected_keywords)
-            qr.keyword_coverage = evaluate_keyword_coverage(response, eq.expected_keywords)
-
-        # LLM-as-Judge
-        if use_llm_judge:
-            logger.info("LLM judge scoring: %s", query_text[:50])
-            scores = evaluate_with_llm(
-                question=query_text,
-                response=response,
+        if use_llm_judge and eq is not None and qr.status == "success":
+            to_judge.append((qr, JudgeItem(
+                question=qr.question,
+                response=qr.response,
                 expected_keywords=eq.expected_keywords,
                 expected_answer=eq.expected_answer,
-                model_id=judge_model_id,
+            )))
+        details.append(qr)
+
+    # LLM-as-Judge
+    if to_judge:
+        executor = get_judge_executor(judge_model_id)
+        logger.info(
+            "LLM judge scoring %d responses (concurrency=%d, batch_size=%d)",
+            len(to_judge), executor.concurrency, executor.batch_size,
+        )
+        cache = executor.cache
+        hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+        scores = executor.score([item for _, item in to_judge])
+        for (qr, _), s in zip(to_judge, scores):
+            qr.correctness = s["correctness"]
+            qr.faithfulness = s["faithfulness"]
+            qr.completeness = s["completeness"]
+        if cache is not None:
+            judge_cache = (cache.hits - hits_before, cache.misses - misses_before)
+            logger.info(
+                "Judge cache: %d hits, %d misses (%.0f%% hit rate)",
+                *judge_cache, 100 * judge_cache[0] / len(to_judge),
             )
-            qr.correctness = scores["correctness"]
-            qr.faithfulness = scores["faithfulness"]
-            qr.completeness = scores["completeness"]
 
-        details.append(qr)
+    report = _aggregate_report(details, wall_clock_seconds)
+    report.judge_cache_hits, report.judge_cache_misses = judge_cache
+    return report
 
-    return _aggregate_report(details)
 
+# ---------------------------------------------------------------------------
+# Offline scoring of query logs
+# ---------------------------------------------------------------------------
 
-def _aggregate_report(details: list[QuestionResult]) -> EvalReport:
-    """Aggregate individual question results into an EvalReport."""
-    report = EvalReport(details=details, total_questions=len(details))
+def _open_log(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
 
-    # Group by category
-    by_cat: dict[str, list[QuestionResult]] = {}
-    for d in details:
-        by_cat.setdefault(d.category, []).append(d)
-
-    # Non-negative questions (for keyword metrics)
-    non_neg = [d for d in details if d.category != "negative" and d.status == "success"]
-    neg = [d for d in details if d.category == "negative" and d.status == "success"]
-    successful = [d for d in details if d.status == "success"]
-
-    # Overall keyword metrics
-    if non_neg:
-        report.keyword_hit_rate = sum(1 for d in non_neg if d.keyword_hit) / len(non_neg)
-        report.keyword_coverage = sum(d.keyword_coverage for d in non_neg) / len(non_neg)
-
-    # Negative detection rate
-    if neg:
-        report.negative_detection_rate = sum(
-            1 for d in neg if d.negative_pass
-        ) / len(neg)
-
-    # LLM-as-Judge averages
-    judged = [d for d in successful if d.correctness > 0]
-    if judged:
-        report.avg_correctness = sum(d.correctness for d in judged) / len(judged)
-        report.avg_faithfulness = sum(d.faithfulness for d in judged) / len(judged)
-        report.avg_completeness = sum(d.completeness for d in judged) / len(judged)
-
-    # Overall score (weighted)
-    report.overall_score = (
-        report.keyword_hit_rate * 0.15
-        + report.keyword_coverage * 0.10
-        + report.negative_detection_rate * 0.15
-        + (report.avg_correctness / 5) * 0.25
-        + (report.avg_faithfulness / 5) * 0.20
-        + (report.avg_completeness / 5) * 0.15
-    )
 
-    # Latency
-    if successful:
-        report.avg_latency = sum(d.latency_seconds for d in successful) / len(successful)
+def _parse_timestamp(value: Any) -> float | None:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return datetime.fromisoformat(value).timestamp()
 
-    # Per-category scores
-    for cat_name, cat_items in by_cat.items():
-        cs = CategoryScore(category=cat_name, count=len(cat_items))
-        cat_success = [d for d in cat_items if d.status == "success"]
 
-        if cat_name == "negative":
-            if cat_success:
-                cs.negative_detection_rate = sum(
-                    1 for d in cat_success if d.negative_pass
-                ) / len(cat_success)
-        else:
-            if cat_success:
-                cs.keyword_hit_rate = sum(
-                    1 for d in cat_success if d.keyword_hit
-                ) / len(cat_success)
-                cs.keyword_coverage = sum(
-                    d.keyword_coverage for d in cat_success
-                ) / len(cat_success)
+def score_log(
+    path: Path,
+    eval_questions: list[EvalQuestion] | None = None,
+    chunk_size: int = 10_000,
+) -> EvalReport:
+    """Score a JSONL query log (optionally gzipped) against the eval set.
+
+    Each line is a JSON object with ``question`` (or ``query``),
+    ``response``, ``latency_seconds`` (or ``latency``) and optional
+    ``status`` (default ``success``) and ``ts``/``timestamp`` (epoch
+    seconds or ISO 8601, used for QPS).  Questions are matched to eval
+    questions after :func:`normalize_question`; unmatched ones count as
+    category ``unknown`` (latency only).  Records are read and aggregated
+    ``chunk_size`` lines at a time, keeping memory constant, so the report
+    has no per-question ``details``.  Malformed lines are skipped.
+    """
+    from tiger_etf.graphrag.query_cache import normalize_question
+
+    eval_questions = load_eval_questions() if eval_questions is None else eval_questions
+    q_lookup = {normalize_question(q.question): q for q in eval_questions}
+    acc = ReportAccumulator()
+    lines = skipped = 0
+
+    with _open_log(path) as f:
+        while chunk := list(itertools.islice(f, chunk_size)):
+            for line in chunk:
+                try:
+                    r = json.loads(line)
+                    question = r.get("question") or r["query"]
+                    latency = float(r.get("latency_seconds", r.get("latency", 0)) or 0)
+                    ts = _parse_timestamp(r.get("ts", r.get("timestamp")))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    if line.strip():
+                        skipped += 1
+                    continue
+                acc.add(_score_result(
+                    question, r.get("response") or "", latency,
+                    r.get("status", "success"), q_lookup.get(normalize_question(question)),
+                ), timestamp=ts)
+            lines += len(chunk)
+            logger.info("Scored %d log lines", lines)
+
+    if skipped:
+        logger.warning("Skipped %d malformed log lines", skipped)
+    return acc.report()
 
-        cat_judged = [d for d in cat_success if d.correctness > 0]
-        if cat_judged:
-            cs.avg_correctness = sum(d.correctness for d in cat_judged) / len(cat_judged)
-            cs.avg_faithfulness = sum(d.faithfulness for d in cat_judged) / len(cat_judged)
-            cs.avg_completeness = sum(d.completeness for d in cat_judged) / len(cat_judged)
 
-        if cat_success:
-            cs.avg_latency = sum(d.latency_seconds for d in cat_success) / len(cat_success)
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
 
-        report.by_category[cat_name] = cs
+class _Totals:
+    """Running sums behind one row of an EvalReport (overall or a category)."""
 
-    return report
+    __slots__ = (
+        "count", "successes", "latency_sum", "latency",
+        "kw_count", "kw_hits", "kw_coverage_sum",
+        "neg_count", "neg_passes",
+        "judged", "correctness_sum", "faithfulness_sum", "completeness_sum",
+    )
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.latency = QuantileSketch()
+
+    def add(self, d: QuestionResult) -> None:
+        self.count += 1
+        if d.status != "success":
+            return
+        self.successes += 1
+        self.latency_sum += d.latency_seconds
+        self.latency.add(d.latency_seconds)
+        if d.category == "unknown":
+            # Not in the eval set: nothing to score beyond latency
+            return
+        if d.category == "negative":
+            self.neg_count += 1
+            self.neg_passes += bool(d.negative_pass)
+        else:
+            self.kw_count += 1
+            self.kw_hits += d.keyword_hit
+            self.kw_coverage_sum += d.keyword_coverage
+        if d.correctness > 0:
+            self.judged += 1
+            self.correctness_sum += d.correctness
+            self.faithfulness_sum += d.faithfulness
+            self.completeness_sum += d.completeness
+
+    @staticmethod
+    def _avg(total: float, n: int) -> float:
+        return total / n if n else 0.0
+
+    @property
+    def keyword_hit_rate(self) -> float:
+        return self._avg(self.kw_hits, self.kw_count)
+
+    @property
+    def keyword_coverage(self) -> float:
+        return self._avg(self.kw_coverage_sum, self.kw_count)
+
+    @property
+    def negative_detection_rate(self) -> float:
+        return self._avg(self.neg_passes, self.neg_count)
+
+    @property
+    def avg_latency(self) -> float:
+        return self._avg(self.latency_sum, self.successes)
+
+    def judge_averages(self) -> tuple[float, float, float]:
+        return (
+            self._avg(self.correctness_sum, self.judged),
+            self._avg(self.faithfulness_sum, self.judged),
+            self._avg(self.completeness_sum, self.judged),
+        )
+
+    def fill_latency(self, target: EvalReport | CategoryScore, span: float) -> None:
+        """Copy percentiles, error rate and QPS (over ``span`` seconds) onto ``target``."""
+        target.avg_latency = self.avg_latency
+        target.latency_p50 = self.latency.quantile(0.50)
+        target.latency_p90 = self.latency.quantile(0.90)
+        target.latency_p95 = self.latency.quantile(0.95)
+        target.latency_p99 = self.latency.quantile(0.99)
+        target.latency_max = self.latency.max if self.successes else 0.0
+        target.error_rate = self._avg(self.count - self.successes, self.count)
+        target.qps = self.count / span if span > 0 else 0.0
+
+
+class ReportAccumulator:
+    """Builds an :class:`EvalReport` from results added one at a time.
+
+    Only running sums and latency sketches are kept (per category and
+    overall), so memory does not grow with the number of results unless
+    ``keep_details`` is set.  QPS is measured over ``wall_clock_seconds``
+    when given, otherwise over the span of the ``timestamp`` values passed
+    to :meth:`add`; without either it is reported as 0.
+    """
+
+    def __init__(self, keep_details: bool = False) -> None:
+        self.keep_details = keep_details
+        self.details: list[QuestionResult] = []
+        self._overall = _Totals()
+        self._by_cat: dict[str, _Totals] = {}
+        self._first_ts = math.inf
+        self._last_ts = -math.inf
+
+    def add(self, d: QuestionResult, timestamp: float | None = None) -> None:
+        self._overall.add(d)
+        self._by_cat.setdefault(d.category, _Totals()).add(d)
+        if timestamp is not None:
+            self._first_ts = min(self._first_ts, timestamp)
+            self._last_ts = max(self._last_ts, timestamp + d.latency_seconds)
+        if self.keep_details:
+            self.details.append(d)
+
+    def report(self, wall_clock_seconds: float | None = None) -> EvalReport:
+        overall = self._overall
+        span = wall_clock_seconds or max(self._last_ts - self._first_ts, 0.0)
+        report = EvalReport(details=self.details, total_questions=overall.count)
+        report.keyword_hit_rate = overall.keyword_hit_rate
+        report.keyword_coverage = overall.keyword_coverage
+        report.negative_detection_rate = overall.negative_detection_rate
+        (
+            report.avg_correctness, report.avg_faithfulness, report.avg_completeness,
+        ) = overall.judge_averages()
+
+        # Overall score (weighted)
+        report.overall_score = (
+            report.keyword_hit_rate * 0.15
+            + report.keyword_coverage * 0.10
+            + report.negative_detection_rate * 0.15
+            + (report.avg_correctness / 5) * 0.25
+            + (report.avg_faithfulness / 5) * 0.20
+            + (report.avg_completeness / 5) * 0.15
+        )
+        overall.fill_latency(report, span)
+
+        # Per-category scores
+        for cat_name, t in self._by_cat.items():
+            cs = CategoryScore(category=cat_name, count=t.count)
+            if cat_name == "negative":
+                if t.successes:
+                    cs.negative_detection_rate = t.negative_detection_rate
+            else:
+                cs.keyword_hit_rate = t.keyword_hit_rate
+                cs.keyword_coverage = t.keyword_coverage
+            cs.avg_correctness, cs.avg_faithfulness, cs.avg_completeness = t.judge_averages()
+            # Categories share the run, so their QPS is over the same span
+            t.fill_latency(cs, span)
+            report.by_category[cat_name] = cs
+
+        return report
+
+
+def _aggregate_report(
+    details: list[QuestionResult], wall_clock_seconds: float | None = None,
+) -> EvalReport:
+    """Aggregate individual question results into an EvalReport."""
+    acc = ReportAccumulator(keep_details=True)
+    for d in details:
+        acc.add(d)
+    return acc.report(wall_clock_seconds)
 
 
 # ---------------------------------------------------------------------------
@@ -479,6 +964,14 @@ def format_eval_report(report: EvalReport) -> str:
     summary.add_row("Avg Faithfulness", f"{report.avg_faithfulness:.2f}/5")
     summary.add_row("Avg Completeness", f"{report.avg_completeness:.2f}/5")
     summary.add_row("Avg Latency", f"{report.avg_latency:.2f}s")
+    summary.add_row(
+        "Latency p50 / p90 / p95 / p99",
+        f"{report.latency_p50:.2f} / {report.latency_p90:.2f} / "
+        f"{report.latency_p95:.2f} / {report.latency_p99:.2f}s",
+    )
+    summary.add_row("Max Latency", f"{report.latency_max:.2f}s")
+    summary.add_row("Error Rate", f"{report.error_rate:.1%}")
+    summary.add_row("QPS", f"{report.qps:.2f}" if report.qps else "-")
     summary.add_row("Total Questions", str(report.total_questions))
     console.print(summary)
 
@@ -493,6 +986,8 @@ def format_eval_report(report: EvalReport) -> str:
     cat_table.add_column("Faithful", justify="right")
     cat_table.add_column("Complete", justify="right")
     cat_table.add_column("Latency", justify="right")
+    cat_table.add_column("p95", justify="right")
+    cat_table.add_column("Err", justify="right")
 
     for cat_name in sorted(report.by_category):
         cs = report.by_category[cat_name]
@@ -506,12 +1001,24 @@ def format_eval_report(report: EvalReport) -> str:
             f"{cs.avg_faithfulness:.1f}" if cs.avg_faithfulness > 0 else "-",
             f"{cs.avg_completeness:.1f}" if cs.avg_completeness > 0 else "-",
             f"{cs.avg_latency:.1f}s",
+            f"{cs.latency_p95:.1f}s",
+            f"{cs.error_rate:.0%}",
         )
     console.print(cat_table)
 
     return console.export_text()
 
 
+def _latency_dict(scores: EvalReport | CategoryScore) -> dict[str, float]:
+    return {
+        "p50": round(scores.latency_p50, 2),
+        "p90": round(scores.latency_p90, 2),
+        "p95": round(scores.latency_p95, 2),
+        "p99": round(scores.latency_p99, 2),
+        "max": round(scores.latency_max, 2),
+    }
+
+
 def report_to_dict(report: EvalReport) -> dict[str, Any]:
     """Convert EvalReport to a JSON-serializable dict for experiment results."""
     return {
@@ -522,9 +1029,14 @@ def report_to_dict(report: EvalReport) -> dict[str, Any]:
             "avg_correctness": round(report.avg_correctness, 2),
             "avg_faithfulness": round(report.avg_faithfulness, 2),
             "avg_completeness": round(report.avg_completeness, 2),
+            "cache_hits": report.judge_cache_hits,
+            "cache_misses": report.judge_cache_misses,
         },
         "overall_score": round(report.overall_score, 4),
         "avg_latency": round(report.avg_latency, 2),
+        "latency": _latency_dict(report),
+        "error_rate": round(report.error_rate, 4),
+        "qps": round(report.qps, 3),
         "total_questions": report.total_questions,
         "by_category": {
             name: {
@@ -540,6 +1052,9 @@ def report_to_dict(report: EvalReport) -> dict[str, Any]:
                 "avg_faithfulness": round(cs.avg_faithfulness, 2),
                 "avg_completeness": round(cs.avg_completeness, 2),
                 "avg_latency": round(cs.avg_latency, 2),
+                "latency": _latency_dict(cs),
+                "error_rate": round(cs.error_rate, 4),
+                "qps": round(cs.qps, 3),
             }
             for name, cs in report.by_category.items()
         },
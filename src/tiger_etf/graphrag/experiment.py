@@ -8,15 +8,19 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import yaml
 from llama_index.core.schema import Document
 
 from tiger_etf.config import settings
+from tiger_etf.graphrag import extraction_cache
+from tiger_etf.graphrag.build_telemetry import BuildTelemetry, instrument_graph_writes
 
 logger = logging.getLogger(__name__)
 
@@ -88,14 +92,27 @@ def collect_metrics() -> dict[str, Any]:
 def run_eval_queries(
     config: dict[str, Any],
     eval_questions_path: Path | None = None,
+    concurrency: int | None = None,
+    timeout: float | None = None,
 ) -> list[dict[str, Any]]:
     """Run evaluation queries from eval_questions.yaml (or config fallback).
 
     If eval_questions_path is provided and exists, all questions from the YAML
     are used.  Otherwise falls back to ``config["eval_queries"]``.
+
+    Up to ``concurrency`` questions are in flight at once (default:
+    ``config["eval_concurrency"]``, then graphrag.eval_concurrency).  A
+    question still unanswered after ``timeout`` seconds is recorded as an
+    error.  Results keep the question order, and each latency covers only
+    that question's own query, not time spent waiting for a slot.  A
+    question that cannot get a slot within ``timeout`` (every slot held by
+    a hung query) is recorded as an error instead of waiting forever.
+
+    Questions go to the graph unless the config sets ``route: true``, so
+    runs stay comparable across configs and with runs that predate the
+    SQL router; each record notes the route and intent that answered it.
     """
     from tiger_etf.graphrag.evaluator import load_eval_questions
-    from tiger_etf.graphrag.query import query
 
     # Determine question list
     questions: list[str] = []
@@ -107,29 +124,84 @@ def run_eval_queries(
         questions = config.get("eval_queries", [])
         logger.info("Using %d eval queries from experiment config", len(questions))
 
-    results = []
-    for idx, q in enumerate(questions, 1):
-        logger.info("[%d/%d] Eval query: %s", idx, len(questions), q)
-        start = time.time()
+    concurrency = max(1, concurrency or config.get("eval_concurrency") or settings.graphrag_eval_concurrency)
+    timeout = timeout or config.get("eval_timeout_seconds") or settings.graphrag_eval_timeout_seconds
+    route = bool(config.get("route", False))
+    # Held by the query itself, so an abandoned (timed-out) query keeps its slot
+    slots = threading.Semaphore(concurrency)
+
+    def run(idx: int, q: str) -> dict[str, Any]:
+        result = _run_eval_query(q, timeout, slots, route)
+        logger.info(
+            "[%d/%d] %s -> %.1fs (%s)",
+            idx, len(questions), q, result["latency_seconds"], result["status"],
+        )
+        return result
+
+    wall_start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="eval") as pool:
+        results = list(pool.map(run, range(1, len(questions) + 1), questions))
+    logger.info(
+        "Ran %d eval queries in %.1fs wall clock (concurrency=%d)",
+        len(questions), time.time() - wall_start, concurrency,
+    )
+    return results
+
+
+def _run_eval_query(
+    q: str, timeout: float, slots: threading.Semaphore, route: bool = False,
+) -> dict[str, Any]:
+    """Answer one eval question in its own thread, giving up after ``timeout``."""
+    from tiger_etf.graphrag.query import run_query
+
+    if not slots.acquire(timeout=timeout):
+        return {
+            "query": q,
+            "response": f"Timed out after {timeout:.0f}s waiting for a query slot",
+            "latency_seconds": 0.0,
+            "status": "error",
+        }
+    outcome: dict[str, Any] = {}
+
+    def target() -> None:
         try:
-            response = query(q)
-            elapsed = time.time() - start
-            results.append({
-                "query": q,
-                "response": response[:2000],
-                "latency_seconds": round(elapsed, 2),
-                "status": "success",
-            })
+            # Latency is part of what an experiment measures: never serve cached answers
+            outcome["result"] = run_query(q, use_cache=False, route=route)
         except Exception as e:
-            elapsed = time.time() - start
-            results.append({
-                "query": q,
-                "response": str(e),
-                "latency_seconds": round(elapsed, 2),
-                "status": "error",
-            })
-        logger.info("  -> %.1fs", elapsed)
-    return results
+            outcome["error"] = e
+        finally:
+            slots.release()
+
+    start = time.time()
+    worker = threading.Thread(target=target, name="eval-query", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    elapsed = time.time() - start
+
+    if "result" in outcome:
+        result = outcome["result"]
+        record = {
+            "query": q,
+            "response": result.response[:2000],
+            "latency_seconds": round(elapsed, 2),
+            "setup_seconds": round(result.setup_seconds, 3),
+            "route": result.route,
+            "intent": result.intent,
+            "status": "success",
+        }
+        if result.profile is not None:
+            record["stages"] = result.profile.to_dict()
+        return record
+    if "error" in outcome:
+        response = str(outcome["error"])
+    else:
+        response = f"Timed out after {timeout:.0f}s"
+    return {
+        "query": q,
+        "response": response,
+        "latency_seconds": round(elapsed, 2),
+        "status": "error",
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -183,17 +255,19 @@ def run_experiment(
     if not skip_indexing:
         # Step 2: Run indexing
         logger.info("Step 1: Running indexing...")
-        from tiger_etf.graphrag.loader import load_pdfs
-        docs = load_pdfs(limit=config.get("pdf_limit"))
-        if not docs:
-            raise RuntimeError("No PDF documents found.")
+        from tiger_etf.graphrag.loader import iter_pdfs
 
+        # Loading is streamed into extraction, so the timing covers both
         start_time = time.time()
-        _run_indexing(docs)
+        telemetry = BuildTelemetry()
+        document_count = _run_indexing(iter_pdfs(limit=config.get("pdf_limit")), telemetry)
+        if not document_count:
+            raise RuntimeError("No PDF documents found.")
         elapsed = time.time() - start_time
         result["indexing_duration_seconds"] = round(elapsed, 1)
         result["duration_minutes"] = round(elapsed / 60, 1)
-        result["document_count"] = len(docs)
+        result["document_count"] = document_count
+        result["indexing_telemetry"] = telemetry.summary()
     else:
         logger.info("Skipping indexing (--skip-indexing)")
 
@@ -203,7 +277,9 @@ def run_experiment(
 
     # Step 4: Eval queries
     logger.info("Step 3: Running eval queries...")
+    eval_start = time.time()
     result["eval_results"] = run_eval_queries(config, eval_questions_path=eval_path)
+    result["eval_wall_clock_seconds"] = round(time.time() - eval_start, 1)
 
     successful = [r for r in result["eval_results"] if r["status"] == "success"]
     avg_latency = (
@@ -211,6 +287,9 @@ def run_experiment(
         if successful else 0
     )
     result["avg_query_latency_seconds"] = round(avg_latency, 2)
+    result["total_query_setup_seconds"] = round(
+        sum(r.get("setup_seconds", 0) for r in successful), 2
+    )
 
     # Step 5: Evaluation scoring
     logger.info("Step 4: Running evaluation scoring (llm_judge=%s)...", use_llm_judge)
@@ -220,6 +299,7 @@ def run_experiment(
             eval_results=result["eval_results"],
             eval_questions=eq_list,
             use_llm_judge=use_llm_judge,
+            wall_clock_seconds=result["eval_wall_clock_seconds"],
         )
         result["evaluation"] = report_to_dict(eval_report)
         logger.info("Overall score: %.3f", eval_report.overall_score)
@@ -242,6 +322,35 @@ def run_experiment(
     return result
 
 
+def rescore_result(
+    result: dict[str, Any],
+    use_llm_judge: bool = True,
+    eval_questions_path: Path | None = None,
+) -> dict[str, Any]:
+    """Recompute ``result["evaluation"]`` from its saved ``eval_results``.
+
+    Judge scores for unchanged (question, response) pairs come from the
+    judge score cache, so re-scoring old result JSONs is cheap.  The result
+    dict is updated in place and returned.
+    """
+    from tiger_etf.graphrag.evaluator import (
+        load_eval_questions,
+        report_to_dict,
+        run_evaluation,
+    )
+
+    if not result.get("eval_results"):
+        return result
+    report = run_evaluation(
+        eval_results=result["eval_results"],
+        eval_questions=load_eval_questions(eval_questions_path),
+        use_llm_judge=use_llm_judge,
+        wall_clock_seconds=result.get("eval_wall_clock_seconds"),
+    )
+    result["evaluation"] = report_to_dict(report)
+    return result
+
+
 def _apply_config(config: dict[str, Any]) -> None:
     from graphrag_toolkit.lexical_graph import GraphRAGConfig
 
@@ -254,24 +363,25 @@ def _apply_config(config: dict[str, Any]) -> None:
     GraphRAGConfig.extraction_num_threads_per_worker = config.get(
         "extraction_num_threads_per_worker", 8,
     )
+    extraction_cache.install(GraphRAGConfig, config["extraction_llm"])
 
 
-def _run_indexing(docs: list[Document]) -> None:
+def _run_indexing(docs: Iterable[Document], telemetry: BuildTelemetry | None = None) -> int:
     from graphrag_toolkit.lexical_graph import LexicalGraphIndex
     from graphrag_toolkit.lexical_graph.storage import (
         GraphStoreFactory,
         VectorStoreFactory,
     )
-    from tiger_etf.graphrag.indexer import _make_extraction_config
+    from tiger_etf.graphrag.indexer import _make_extraction_config, build_index
 
-    graph_store = GraphStoreFactory.for_graph_store(settings.graph_store)
+    graph_store = instrument_graph_writes(GraphStoreFactory.for_graph_store(settings.graph_store))
     vector_store = VectorStoreFactory.for_vector_store(settings.vector_store)
 
     extraction_config = _make_extraction_config()
-    logger.info("Building index from %d documents...", len(docs))
     graph_index = LexicalGraphIndex(
         graph_store, vector_store,
         indexing_config=extraction_config,
     )
-    graph_index.extract_and_build(docs, show_progress=True)
+    count = build_index(docs, graph_index=graph_index, telemetry=telemetry)
     logger.info("Indexing complete.")
+    return count
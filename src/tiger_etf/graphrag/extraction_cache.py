@@ -0,0 +1,279 @@
+"""Persistent cache of extraction LLM responses.
+
+The toolkit's own ``enable_cache`` keys on the fully rendered prompt, which
+includes run-dependent hints such as the preferred topics seen so far, so
+re-indexing the same PDFs rarely hits it.  This cache keys each extraction
+call on (chunk text hash, prompt template hash, model id) instead: the same
+chunk extracted with the same prompt and model is answered from
+``data/graphrag/extraction_cache.sqlite3``, whatever embedding model or
+store the run targets.
+
+It is installed by wrapping ``GraphRAGConfig.extraction_llm`` in
+:class:`CachedExtractionLLM`.  Entries are evicted least recently used
+first once the responses exceed ``graphrag.extraction_cache.max_mb``.
+Hit/miss counters live in the database so that extraction worker
+processes all contribute to the numbers ``build_index`` reports.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from llama_index.core.llms import (
+    LLM,
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.prompts import BasePromptTemplate
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prompt arguments that vary between runs without changing what should be
+# extracted from a chunk; they are left out of the cache key.
+_VOLATILE_ARGS = ("preferred_topics",)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key         TEXT PRIMARY KEY,
+        model_id    TEXT NOT NULL,
+        response    TEXT NOT NULL,
+        size        INTEGER NOT NULL,
+        created_at  REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stats (
+        run_id TEXT PRIMARY KEY,
+        hits   INTEGER NOT NULL DEFAULT 0,
+        misses INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+)
+
+
+def default_path() -> Path:
+    return settings.graphrag_dir / "extraction_cache.sqlite3"
+
+
+class ExtractionCache:
+    """SQLite store of LLM responses with LRU size eviction.
+
+    Safe to share between threads; several processes may open the same file.
+    """
+
+    def __init__(self, path: Path | None = None, *, max_bytes: int | None = None) -> None:
+        self.path = Path(path or default_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = (
+            settings.graphrag_extraction_cache_max_mb * 1024 * 1024
+            if max_bytes is None else max_bytes
+        )
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for ddl in _SCHEMA:
+            self._db.execute(ddl)
+        self._db.commit()
+
+    @staticmethod
+    def key_for(text_hash: str, prompt_hash: str, model_id: str) -> str:
+        return hashlib.sha256(f"{model_id}\n{prompt_hash}\n{text_hash}".encode()).hexdigest()
+
+    def get(self, key: str, run_id: str = "") -> Optional[str]:
+        """Return the cached response for ``key`` and count a hit or miss."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+            column = "hits" if row is not None else "misses"
+            self._db.execute(
+                "INSERT INTO stats (run_id) VALUES (?) ON CONFLICT (run_id) DO NOTHING",
+                (run_id,),
+            )
+            self._db.execute(
+                f"UPDATE stats SET {column} = {column} + 1 WHERE run_id = ?", (run_id,)
+            )
+            self._db.commit()
+        return row[0] if row is not None else None
+
+    def put(self, key: str, model_id: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_id, response, len(response.encode()), now, now),
+            )
+            self._db.commit()
+        self.evict()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return total
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under ``max_bytes``."""
+        with self._lock:
+            excess = self._total_bytes() - self.max_bytes
+            if excess <= 0:
+                return 0
+            victims, freed = [], 0
+            for key, size in self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at"
+            ):
+                victims.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+            self._db.commit()
+        return len(victims)
+
+    def stats(self, run_id: str = "") -> tuple[int, int]:
+        """Return ``(hits, misses)`` counted under ``run_id``."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT hits, misses FROM stats WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# One open cache per (file, process): connections must not cross a fork.
+_open_caches: dict[tuple[str, int], ExtractionCache] = {}
+
+
+def _open_cache(path: str, max_bytes: int) -> ExtractionCache:
+    slot = (path, os.getpid())
+    if slot not in _open_caches:
+        _open_caches[slot] = ExtractionCache(Path(path), max_bytes=max_bytes)
+    return _open_caches[slot]
+
+
+def prompt_hashes(prompt: BasePromptTemplate, prompt_args: dict[str, Any]) -> tuple[str, str]:
+    """Return ``(text hash, prompt hash)`` for one extraction call.
+
+    The chunk is the ``text`` argument; the prompt hash covers the
+    template plus every other stable argument (e.g. entity classes).
+    """
+    args = {k: v for k, v in prompt_args.items() if k not in _VOLATILE_ARGS}
+    text = str(args.pop("text", ""))
+    prompt_payload = json.dumps(
+        {"template": prompt.get_template(), "args": args},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return (
+        hashlib.sha256(text.encode()).hexdigest(),
+        hashlib.sha256(prompt_payload.encode()).hexdigest(),
+    )
+
+
+class CachedExtractionLLM(CustomLLM):
+    """Extraction LLM wrapper that answers ``predict`` from the extraction cache."""
+
+    llm: LLM
+    model_id: str
+    cache_path: str
+    max_bytes: int
+    run_id: str
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self.llm.metadata
+
+    @property
+    def cache(self) -> ExtractionCache:
+        return _open_cache(self.cache_path, self.max_bytes)
+
+    def _lookup(self, prompt: BasePromptTemplate, prompt_args: dict[str, Any]):
+        key = ExtractionCache.key_for(*prompt_hashes(prompt, prompt_args), self.model_id)
+        return key, self.cache.get(key, self.run_id)
+
+    def predict(self, prompt: BasePromptTemplate, **prompt_args: Any) -> str:
+        key, cached = self._lookup(prompt, prompt_args)
+        if cached is not None:
+            return cached
+        response = self.llm.predict(prompt, **prompt_args)
+        self.cache.put(key, self.model_id, response)
+        return response
+
+    async def apredict(self, prompt: BasePromptTemplate, **prompt_args: Any) -> str:
+        key, cached = self._lookup(prompt, prompt_args)
+        if cached is not None:
+            return cached
+        response = await self.llm.apredict(prompt, **prompt_args)
+        self.cache.put(key, self.model_id, response)
+        return response
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        return self.llm.complete(prompt, formatted=formatted, **kwargs)
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        return self.llm.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    def stats(self) -> tuple[int, int]:
+        return self.cache.stats(self.run_id)
+
+
+_active: Optional[CachedExtractionLLM] = None
+
+
+def install(config: Any, model_id: str) -> Optional[CachedExtractionLLM]:
+    """Wrap ``config.extraction_llm`` (a GraphRAGConfig) in the extraction cache.
+
+    Call after ``config.extraction_llm`` has been set to ``model_id``.
+    Each call starts a fresh hit/miss counter.
+    """
+    global _active
+    if not settings.graphrag_extraction_cache_enabled:
+        _active = None
+        return None
+
+    inner = config.extraction_llm
+    if isinstance(inner, CachedExtractionLLM):
+        inner = inner.llm
+    _active = CachedExtractionLLM(
+        llm=inner,
+        model_id=model_id,
+        cache_path=str(default_path()),
+        max_bytes=settings.graphrag_extraction_cache_max_mb * 1024 * 1024,
+        run_id=uuid.uuid4().hex,
+    )
+    config.extraction_llm = _active
+    return _active
+
+
+def active() -> Optional[CachedExtractionLLM]:
+    """The wrapper installed by the last :func:`install`, if any."""
+    return _active
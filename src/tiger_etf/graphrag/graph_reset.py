@@ -0,0 +1,275 @@
+"""Batched, resumable deletion of every node in the graph store.
+
+:class:`GraphResetter` partitions the graph by node label and deletes each
+partition with ``MATCH (n:Label) WITH n LIMIT $limit DETACH DELETE n``
+batches, ``workers`` labels at a time (Neptune Database and Analytics
+alike).  Each partition sizes its batches from observed latency: the
+size doubles while a batch takes under half of ``target_seconds`` and
+halves when one runs over it or fails, so large graphs never issue one
+unbounded delete.  Failed batches are retried with jittered backoff;
+concurrent-modification conflicts between partitions (linked Chunk,
+Statement, Fact and Entity nodes deleted at once) are retried up to 50
+times in a row (several minutes of backoff, so a writer outside the reset
+that keeps conflicting eventually fails it), other errors at most five.
+
+Progress is checkpointed to ``data/graphrag/reset_checkpoint.json`` after
+every batch.  An interrupted reset resumes from it: deleted counts carry
+over (so totals, nodes/sec and ETA stay meaningful) and each label starts
+at the batch size it had learned.  Every batch logs nodes/sec and ETA.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+Runner = Callable[..., list]
+
+# Partition key for nodes without a label (and the final sweep)
+ANY_LABEL = ""
+_MIN_BATCH = 100
+_MAX_RETRIES = 5
+_MAX_CONFLICT_RETRIES = 50
+_RETRY_BACKOFF = 0.5
+_MAX_BACKOFF = 10.0
+# Lock conflicts between partitions deleting linked nodes; always retried
+_CONFLICT_MARKERS = ("ConcurrentModification", "concurrent modification")
+
+_LABEL_COUNTS = "MATCH (n) RETURN labels(n) AS labels, count(n) AS cnt"
+
+
+def _is_conflict(err: BaseException) -> bool:
+    resp = getattr(err, "response", None)
+    code = resp.get("Error", {}).get("Code", "") if isinstance(resp, dict) else ""
+    text = f"{type(err).__name__} {code} {err}"
+    return any(marker in text for marker in _CONFLICT_MARKERS)
+
+
+def _delete_query(label: str) -> str:
+    pattern = f"(n:`{label.replace('`', '``')}`)" if label else "(n)"
+    return f"MATCH {pattern} WITH n LIMIT $limit DETACH DELETE n RETURN count(*) AS cnt"
+
+
+class BatchSizer:
+    """Batch size steered towards ``target_seconds`` per batch."""
+
+    def __init__(
+        self, initial: int, target_seconds: float,
+        minimum: int = _MIN_BATCH, maximum: Optional[int] = None,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum or max(initial, minimum)
+        self.target_seconds = target_seconds
+        self.size = min(max(initial, minimum), self.maximum)
+
+    def observe(self, seconds: float) -> None:
+        if seconds > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif seconds < self.target_seconds / 2:
+            self.size = min(self.maximum, self.size * 2)
+
+    def failed(self) -> None:
+        self.size = max(self.minimum, self.size // 2)
+
+
+@dataclass
+class ResetCheckpoint:
+    """Progress of one reset, persisted after every batch."""
+
+    graph_store: str
+    started_at: str
+    deleted: dict[str, int] = field(default_factory=dict)
+    batch_sizes: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, graph_store: str) -> Optional[ResetCheckpoint]:
+        if not path.exists():
+            return None
+        try:
+            checkpoint = cls(**json.loads(path.read_text()))
+        except (ValueError, TypeError):
+            logger.warning("Ignoring unreadable reset checkpoint %s", path)
+            return None
+        return checkpoint if checkpoint.graph_store == graph_store else None
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2))
+        tmp.replace(path)
+
+
+@dataclass
+class ResetReport:
+    total: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+    batches: int = 0
+    retries: int = 0
+    # Nodes deleted by the interrupted run this one resumed
+    resumed_from: int = 0
+    labels: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return (self.deleted - self.resumed_from) / self.seconds if self.seconds > 0 else 0.0
+
+
+class GraphResetter:
+    """Delete all nodes through ``run(cypher, parameters)``."""
+
+    def __init__(
+        self,
+        run: Runner,
+        graph_store: str = "",
+        *,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        target_seconds: Optional[float] = None,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = True,
+    ) -> None:
+        self.run = run
+        self.graph_store = graph_store
+        self.workers = workers or settings.graphrag_reset_workers
+        self.batch_size = batch_size or settings.graphrag_reset_batch_size
+        self.max_batch_size = max_batch_size or settings.graphrag_reset_max_batch_size
+        self.target_seconds = target_seconds or settings.graphrag_reset_target_seconds
+        self.checkpoint_path = checkpoint_path or settings.graphrag_dir / "reset_checkpoint.json"
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._checkpoint: Optional[ResetCheckpoint] = None
+        self._report = ResetReport()
+        self._already = 0
+        self._start = 0.0
+
+    def label_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for row in self.run(_LABEL_COUNTS):
+            labels = row.get("labels") or []
+            label = labels[0] if labels else ANY_LABEL
+            counts[label] = counts.get(label, 0) + int(row["cnt"])
+        return counts
+
+    def reset(self) -> ResetReport:
+        checkpoint = ResetCheckpoint.load(self.checkpoint_path, self.graph_store) if self.resume else None
+        if checkpoint is None:
+            checkpoint = ResetCheckpoint(
+                graph_store=self.graph_store,
+                started_at=datetime.now(timezone.utc).isoformat(),
+            )
+        else:
+            logger.info(
+                "Resuming graph reset started at %s (%d nodes already deleted)",
+                checkpoint.started_at, sum(checkpoint.deleted.values()),
+            )
+
+        remaining = self.label_counts()
+        already = sum(checkpoint.deleted.values())
+        report = ResetReport(total=already + sum(remaining.values()), resumed_from=already)
+        logger.info(
+            "Resetting graph: %d nodes in %d labels (workers=%d)",
+            sum(remaining.values()), len(remaining), self.workers,
+        )
+
+        self._checkpoint = checkpoint
+        self._report = report
+        self._already = already
+        self._start = time.monotonic()
+        labels = sorted((label for label in remaining if label != ANY_LABEL), key=lambda l: -remaining[l])
+        if labels:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(labels))) as pool:
+                for future in [pool.submit(self._delete_label, label) for label in labels]:
+                    future.result()
+        # Unlabeled nodes and anything written while the partitions ran
+        self._delete_label(ANY_LABEL)
+
+        report.deleted = sum(checkpoint.deleted.values())
+        report.labels = dict(checkpoint.deleted)
+        report.seconds = time.monotonic() - self._start
+        self.checkpoint_path.unlink(missing_ok=True)
+        logger.info(
+            "Graph reset complete: %d nodes deleted in %.1fs (%.0f nodes/s, %d batches, %d retries)",
+            report.deleted, report.seconds, report.nodes_per_sec,
+            report.batches, report.retries,
+        )
+        return report
+
+    def _delete_label(self, label: str) -> None:
+        with self._lock:
+            initial = self._checkpoint.batch_sizes.get(label, self.batch_size)
+        sizer = BatchSizer(initial, self.target_seconds, maximum=self.max_batch_size)
+        cypher = _delete_query(label)
+        failures = conflicts = 0
+        while True:
+            limit = sizer.size
+            start = time.monotonic()
+            try:
+                rows = self.run(cypher, {"limit": limit})
+            except Exception as e:
+                # Conflicts with other partitions are expected and get a
+                # much larger retry limit than other errors
+                if _is_conflict(e):
+                    conflicts += 1
+                    if conflicts > _MAX_CONFLICT_RETRIES:
+                        raise
+                    attempt = conflicts
+                else:
+                    failures += 1
+                    if failures > _MAX_RETRIES:
+                        raise
+                    attempt = failures
+                sizer.failed()
+                with self._lock:
+                    self._report.retries += 1
+                logger.warning(
+                    "Delete batch for label %r failed (%s); retrying with batch size %d",
+                    label or "*", type(e).__name__, sizer.size,
+                )
+                backoff = min(_MAX_BACKOFF, _RETRY_BACKOFF * 2 ** (attempt - 1))
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+                continue
+            failures = conflicts = 0
+            seconds = time.monotonic() - start
+            deleted = int(rows[0]["cnt"]) if rows else 0
+            sizer.observe(seconds)
+            self._record(label, deleted, sizer.size, seconds)
+            if deleted < limit:
+                return
+
+    def _record(self, label: str, deleted: int, next_size: int, seconds: float) -> None:
+        with self._lock:
+            cp = self._checkpoint
+            cp.deleted[label] = cp.deleted.get(label, 0) + deleted
+            cp.batch_sizes[label] = next_size
+            cp.save(self.checkpoint_path)
+            self._report.batches += 1
+            done = sum(cp.deleted.values())
+        elapsed = time.monotonic() - self._start
+        rate = (done - self._already) / elapsed if elapsed > 0 else 0.0
+        left = max(self._report.total - done, 0)
+        eta = f"{left / rate:.0f}s" if rate > 0 else "?"
+        logger.info(
+            "Deleted %d %s nodes in %.2fs (total %d/%d, %.0f nodes/s, ETA %s, next batch %d)",
+            deleted, label or "remaining", seconds, done, self._report.total, rate, eta, next_size,
+        )
+
+
+def reset_graph_store(resume: bool = True, **kwargs: Any) -> ResetReport:
+    """Delete every node of ``settings.graph_store`` with a :class:`GraphResetter`."""
+    from tiger_etf.graphrag.query import _cypher_runner
+
+    run = _cypher_runner(settings.graph_store)
+    return GraphResetter(run, settings.graph_store, resume=resume, **kwargs).reset()
@@ -2,12 +2,27 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
-from typing import Optional
+import queue
+import threading
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from llama_index.core.schema import Document
 
 from tiger_etf.config import settings
+from tiger_etf.graphrag import build_telemetry, extraction_cache
+from tiger_etf.graphrag.build_telemetry import BuildTelemetry
+from tiger_etf.graphrag.query_cache import bump_graph_version
+from tiger_etf.graphrag.manifest import (
+    IndexManifest,
+    file_sha256,
+    pdf_key,
+    rdb_key,
+    source_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +225,7 @@ def _configure() -> None:
     # Neptune DB: configurable via config.yaml graphrag.build_num_workers / batch_writes_enabled
     GraphRAGConfig.build_num_workers = settings.graphrag_build_num_workers
     GraphRAGConfig.batch_writes_enabled = settings.graphrag_batch_writes_enabled
+    extraction_cache.install(GraphRAGConfig, settings.graphrag_extraction_llm)
 
 
 def _make_stores():
@@ -223,7 +239,9 @@ def _make_stores():
         VectorStoreFactory,
     )
 
-    graph_store = GraphStoreFactory.for_graph_store(settings.graph_store)
+    graph_store = build_telemetry.instrument_graph_writes(
+        GraphStoreFactory.for_graph_store(settings.graph_store)
+    )
     vector_store = VectorStoreFactory.for_vector_store(settings.vector_store)
     return graph_store, vector_store
 
@@ -238,179 +256,376 @@ def _make_extraction_config():
     )
 
 
-def build_index(documents: list[Document]) -> None:
-    """Extract entities/relations and build the lexical graph index."""
+def extraction_fingerprint() -> str:
+    """Hash of every setting that changes what extraction produces for a document."""
+    payload = json.dumps(
+        {
+            "extraction_llm": settings.graphrag_extraction_llm,
+            "prompt": EXTRACT_TOPICS_PROMPT_ETF,
+            "entity_classifications": ETF_ENTITY_CLASSIFICATIONS,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _make_index():
+    """Configure GraphRAG and return a LexicalGraphIndex over the writer stores."""
     from graphrag_toolkit.lexical_graph import LexicalGraphIndex
 
     _configure()
     graph_store, vector_store = _make_stores()
     extraction_config = _make_extraction_config()
-
-    logger.info("Building LexicalGraphIndex from %d documents ...", len(documents))
-    logger.info("Using ETF domain ontology: %d entity classes, custom prompt",
-                len(ETF_ENTITY_CLASSIFICATIONS))
-    graph_index = LexicalGraphIndex(
+    return LexicalGraphIndex(
         graph_store, vector_store,
         indexing_config=extraction_config,
     )
-    graph_index.extract_and_build(documents, show_progress=True)
-    logger.info("Index build complete.")
 
 
-def build_from_pdfs(limit: Optional[int] = None) -> None:
-    """Load PDFs and build index."""
-    from tiger_etf.graphrag.loader import load_pdfs
+def build_index(
+    documents: Iterable[Document],
+    graph_index=None,
+    *,
+    batch_size: Optional[int] = None,
+    on_batch_start: Optional[Callable[[list[Document]], None]] = None,
+    on_batch_done: Optional[Callable[[list[Document]], None]] = None,
+    telemetry: Optional[BuildTelemetry] = None,
+    bump_version: bool = True,
+) -> int:
+    """Extract entities/relations and build the lexical graph index.
+
+    ``documents`` may be any iterable, typically a loader generator.  It
+    is consumed in batches of ``batch_size`` documents (default:
+    graphrag.build_batch_size) by a background thread, so the next batch
+    is loaded while the current one is extracted and written and at most
+    a couple of batches are held in memory.  Pages of one source file are
+    never split across batches.  ``on_batch_start`` / ``on_batch_done``
+    are called around each batch.  Throughput metrics are logged per
+    batch and accumulated in ``telemetry`` when given.  Unless
+    ``bump_version`` is False the graph version is bumped afterwards,
+    invalidating cached query answers.  Returns the number of documents
+    built.
+    """
+    graph_index = graph_index or _make_index()
+    batch_size = batch_size or settings.graphrag_build_batch_size
+    telemetry = telemetry or BuildTelemetry()
 
-    docs = load_pdfs(limit=limit)
-    if not docs:
-        logger.warning("No PDF documents found.")
-        return
-    build_index(docs)
+    logger.info("Building LexicalGraphIndex in batches of %d documents ...", batch_size)
+    logger.info("Using ETF domain ontology: %d entity classes, custom prompt",
+                len(ETF_ENTITY_CLASSIFICATIONS))
 
+    cached_llm = extraction_cache.active()
+    hits_before, misses_before = cached_llm.stats() if cached_llm else (0, 0)
+
+    total = 0
+    batches = _prefetch(_batched(documents, batch_size, key=source_key))
+    build_telemetry.activate(telemetry)
+    try:
+        for n, batch in enumerate(batches, 1):
+            if on_batch_start:
+                on_batch_start(batch)
+            telemetry.begin_batch()
+            graph_index.extract_and_build(batch, show_progress=True)
+            telemetry.end_batch(batch)
+            if on_batch_done:
+                on_batch_done(batch)
+            total += len(batch)
+            logger.info("Batch %d: %d documents (total %d)", n, len(batch), total)
+    finally:
+        build_telemetry.activate(None)
+
+    logger.info("Index build complete: %d documents.", total)
+    if total and bump_version:
+        bump_graph_version()
+    if cached_llm:
+        hits, misses = cached_llm.stats()
+        hits, misses = hits - hits_before, misses - misses_before
+        calls = hits + misses
+        logger.info(
+            "Extraction cache: %d hits, %d misses (%.0f%% hit rate)",
+            hits, misses, 100 * hits / calls if calls else 0,
+        )
+    return total
 
-def build_from_rdb(limit: Optional[int] = None) -> None:
-    """Load RDB data and build index."""
-    from tiger_etf.graphrag.loader import load_rdb
 
-    docs = load_rdb(limit=limit)
-    if not docs:
-        logger.warning("No RDB documents found.")
-        return
-    build_index(docs)
+def _batched(
+    documents: Iterable[Document], size: int, key: Callable[[Document], str],
+) -> Iterator[list[Document]]:
+    """Group documents into lists of about ``size``, keeping equal keys together."""
+    batch: list[Document] = []
+    for doc in documents:
+        if len(batch) >= size and key(doc) != key(batch[-1]):
+            yield batch
+            batch = []
+        batch.append(doc)
+    if batch:
+        yield batch
 
 
-def reset_graph() -> int:
-    """Delete all nodes and edges from Neptune graph store.
+_DONE = object()
 
-    Returns the number of deleted nodes.
+
+def _prefetch(items: Iterator[Any], depth: int = 1) -> Iterator[Any]:
+    """Run ``items`` in a background thread, buffering up to ``depth`` ahead.
+
+    Exceptions raised by the producer are re-raised in the consumer.
     """
-    import boto3
+    buf: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry: tuple[Any, Optional[BaseException]]) -> bool:
+        while not stop.is_set():
+            try:
+                buf.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:  # noqa: BLE001 - handed to the consumer
+            put((_DONE, e))
+
+    worker = threading.Thread(target=produce, name="graphrag-loader", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item, error = buf.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        worker.join()
 
-    from tiger_etf.graphrag.query import _extract_region_from_endpoint, _parse_graph_store_uri
 
-    store_type, identifier = _parse_graph_store_uri(settings.graph_store)
-    region = _extract_region_from_endpoint(identifier)
-    session = boto3.Session(region_name=region)
+# ---------------------------------------------------------------------------
+# Incremental builds (data/graphrag/index_manifest.json)
+# ---------------------------------------------------------------------------
 
-    if store_type == "database":
-        client = session.client(
-            "neptunedata",
-            endpoint_url=f"https://{identifier}:8182",
-        )
-        # Count before delete
-        count_result = client.execute_open_cypher_query(
-            openCypherQuery="MATCH (n) RETURN count(n) AS cnt",
+# manifest key -> (content hash, source metadata filter)
+_Pending = dict[str, tuple[str, dict[str, Any]]]
+
+
+def _plan_pdfs(
+    manifest: IndexManifest, fingerprint: str, limit: Optional[int], incremental: bool,
+    pending: _Pending,
+) -> tuple[Iterator[Document], list[str]]:
+    """Select PDFs to extract; returns (document stream, removed keys).
+
+    Files are hashed up front; pages are only parsed as the stream is consumed.
+    """
+    from tiger_etf.graphrag.loader import iter_pdfs, list_pdf_files
+
+    pdf_files = list_pdf_files(limit)
+    changed = []
+    for path in pdf_files:
+        key, content_hash = pdf_key(path), file_sha256(path)
+        if incremental and manifest.is_current(key, content_hash, fingerprint):
+            continue
+        changed.append(path)
+        pending[key] = (content_hash, {"file_name": path.name})
+
+    # A limited listing says nothing about files beyond the limit
+    removed = []
+    if incremental and not limit:
+        removed = manifest.stale_keys("pdf:", {pdf_key(p) for p in pdf_files})
+
+    if incremental:
+        logger.info(
+            "Incremental PDFs: %d new/changed, %d unchanged, %d removed",
+            len(changed), len(pdf_files) - len(changed), len(removed),
         )
-        total = count_result["results"][0]["cnt"] if count_result["results"] else 0
+    docs = iter_pdfs(pdf_files=changed) if changed else iter(())
+    return docs, removed
 
-        # Delete in batches to avoid timeout on large graphs
-        deleted = 0
-        batch_size = 10000
-        while True:
-            result = client.execute_open_cypher_query(
-                openCypherQuery=f"MATCH (n) WITH n LIMIT {batch_size} DETACH DELETE n RETURN count(*) AS cnt",
+
+def _plan_rdb(
+    manifest: IndexManifest, fingerprint: str, limit: Optional[int], incremental: bool,
+    pending: _Pending,
+) -> tuple[Iterator[Document], list[str]]:
+    """Select RDB documents to extract; returns (document stream, removed keys).
+
+    Documents are hashed as they stream in, so ``pending`` fills lazily.
+    """
+    from tiger_etf.graphrag.loader import iter_rdb, list_product_codes
+
+    removed = []
+    if incremental and not limit:
+        removed = manifest.stale_keys("rdb:", {rdb_key(c) for c in list_product_codes()})
+
+    def docs() -> Iterator[Document]:
+        changed = unchanged = 0
+        for doc in iter_rdb(limit=limit):
+            ksd = doc.metadata["ksd_fund_code"]
+            key = rdb_key(ksd)
+            content_hash = hashlib.sha256(doc.text.encode()).hexdigest()
+            if incremental and manifest.is_current(key, content_hash, fingerprint):
+                unchanged += 1
+                continue
+            changed += 1
+            pending[key] = (content_hash, {"source": "rdb", "ksd_fund_code": ksd})
+            yield doc
+        if incremental:
+            logger.info(
+                "Incremental RDB: %d new/changed, %d unchanged, %d removed",
+                changed, unchanged, len(removed),
             )
-            cnt = result["results"][0]["cnt"] if result["results"] else 0
-            deleted += cnt
-            logger.info("Deleted %d nodes (total: %d)", cnt, deleted)
-            if cnt < batch_size:
-                break
-
-        logger.info("Graph reset complete. Deleted %d nodes total.", deleted)
-        return total
-    else:
-        # Neptune Analytics
-        client = session.client("neptune-graph")
-        count_resp = client.execute_query(
-            graphIdentifier=identifier,
-            queryString="MATCH (n) RETURN count(n) AS cnt",
-            parameters={},
-            language="OPEN_CYPHER",
-            planCache="DISABLED",
-        )
-        import json
-        results = json.loads(count_resp["payload"].read())["results"]
-        total = results[0]["cnt"] if results else 0
-
-        client.execute_query(
-            graphIdentifier=identifier,
-            queryString="MATCH (n) DETACH DELETE n",
-            parameters={},
-            language="OPEN_CYPHER",
-            planCache="DISABLED",
-        )
-        logger.info("Graph reset complete. Deleted %d nodes.", total)
-        return total
+
+    return docs(), removed
 
 
-def reset_vector() -> int:
-    """Delete the vector index from OpenSearch Serverless.
+def _build_sources(
+    *,
+    pdfs: bool,
+    rdb: bool,
+    pdf_limit: Optional[int] = None,
+    rdb_limit: Optional[int] = None,
+    incremental: bool = False,
+) -> None:
+    """Build from the selected sources and keep the index manifest up to date.
 
-    Returns the number of documents that were in the index.
+    With ``incremental`` only documents whose content or extraction
+    fingerprint changed are extracted; sources of removed documents are
+    deleted from the graph first, and the previous sources of a changed
+    document right before its batch is extracted.  The manifest is saved
+    after every batch, so an interrupted build resumes where it stopped.
     """
-    import boto3
-    from opensearchpy import (
-        OpenSearch,
-        RequestsAWSV4SignerAuth,
-        RequestsHttpConnection,
-    )
+    manifest = IndexManifest.load()
+    fingerprint = extraction_fingerprint()
+
+    pending: _Pending = {}
+    streams: list[Iterator[Document]] = []
+    removed: list[str] = []
+    for enabled, plan, limit in ((pdfs, _plan_pdfs, pdf_limit), (rdb, _plan_rdb, rdb_limit)):
+        if enabled:
+            d, r = plan(manifest, fingerprint, limit, incremental, pending)
+            streams.append(d)
+            removed.extend(r)
+
+    docs = chain.from_iterable(streams)
+    first = next(docs, None)
+    if first is None and not removed:
+        if incremental:
+            logger.info("Index is up to date; nothing to extract.")
+        else:
+            logger.warning("No documents found.")
+        return
 
-    endpoint = settings.vector_store.rstrip("/")
-    # Extract region from endpoint (e.g., https://xxx.ap-northeast-2.aoss.amazonaws.com)
-    parts = endpoint.replace("https://", "").split(".")
-    region = settings.graphrag_aws_region
-    for i, p in enumerate(parts):
-        if p == "aoss":
-            region = parts[i - 1]
-            break
-
-    session = boto3.Session(region_name=region)
-    credentials = session.get_credentials()
-    auth = RequestsAWSV4SignerAuth(credentials, region, "aoss")
-
-    host = endpoint.replace("https://", "")
-    client = OpenSearch(
-        hosts=[{"host": host, "port": 443}],
-        http_auth=auth,
-        use_ssl=True,
-        verify_certs=True,
-        connection_class=RequestsHttpConnection,
+    graph_index = _make_index()
+
+    if removed:
+        for key in removed:
+            _delete_previous(graph_index, manifest, key)
+            manifest.tombstone(key)
+        manifest.save()
+        bump_graph_version()
+
+    def start(batch: list[Document]) -> None:
+        if incremental:
+            for key in _batch_keys(batch):
+                if manifest.is_indexed(key):
+                    _delete_previous(graph_index, manifest, key)
+
+    indexed = 0
+
+    def done(batch: list[Document]) -> None:
+        nonlocal indexed
+        for key in _batch_keys(batch):
+            content_hash, source_filter = pending[key]
+            manifest.record(key, content_hash, fingerprint, source_filter)
+            indexed += 1
+        manifest.save()
+
+    if first is not None:
+        build_index(
+            chain([first], docs), graph_index=graph_index,
+            on_batch_start=start, on_batch_done=done,
+        )
+
+    logger.info(
+        "Index manifest updated: %d indexed, %d tombstoned (%s)",
+        indexed, len(removed), manifest.path,
     )
 
-    deleted_total = 0
-    for index_name in ["chunk", "statement"]:
-        try:
-            count_resp = client.count(index=index_name)
-            count = count_resp.get("count", 0)
-            client.indices.delete(index=index_name)
-            deleted_total += count
-            logger.info("Deleted vector index '%s' (%d documents).", index_name, count)
-        except Exception as e:
-            if "index_not_found" in str(e).lower() or "404" in str(e):
-                logger.info("Vector index '%s' does not exist, skipping.", index_name)
-            else:
-                raise
-
-    logger.info("Vector reset complete. Deleted %d documents total.", deleted_total)
-    return deleted_total
-
-
-def reset_all() -> dict:
+
+def _batch_keys(batch: list[Document]) -> list[str]:
+    return list(dict.fromkeys(source_key(d) for d in batch))
+
+
+def _delete_previous(graph_index, manifest: IndexManifest, key: str) -> None:
+    source_filter = manifest.entries[key].source_filter
+    deleted = graph_index.delete_sources(filter=source_filter)
+    logger.info("Deleted previous sources for %s: %s", key, deleted)
+
+
+def build_from_pdfs(limit: Optional[int] = None, incremental: bool = False) -> None:
+    """Load PDFs and build index."""
+    _build_sources(pdfs=True, rdb=False, pdf_limit=limit, incremental=incremental)
+
+
+def build_from_rdb(limit: Optional[int] = None, incremental: bool = False) -> None:
+    """Load RDB data and build index."""
+    _build_sources(pdfs=False, rdb=True, rdb_limit=limit, incremental=incremental)
+
+
+def reset_graph(resume: bool = True) -> int:
+    """Delete all nodes and edges from Neptune graph store.
+
+    Deletes run in adaptive, label-partitioned batches and resume from the
+    checkpoint of an interrupted reset unless ``resume`` is False (see
+    :mod:`tiger_etf.graphrag.graph_reset`).
+
+    Returns the number of deleted nodes.
+    """
+    from tiger_etf.graphrag.graph_reset import reset_graph_store
+
+    # The manifest no longer matches the graph once deletes start
+    IndexManifest.load().clear()
+    report = reset_graph_store(resume=resume)
+    bump_graph_version()
+    return report.deleted
+
+
+def reset_vector(recreate: bool = False) -> int:
+    """Delete the vector indexes from OpenSearch Serverless.
+
+    The ``chunk`` and ``statement`` indexes are deleted concurrently over
+    the pooled client; with ``recreate`` they are created again, empty,
+    with their previous mappings (see :mod:`tiger_etf.graphrag.vector_store`).
+
+    Returns the number of documents that were in the indexes.
+    """
+    from tiger_etf.graphrag.vector_store import reset_vector_indexes
+
+    report = reset_vector_indexes(recreate=recreate)
+    bump_graph_version()
+    return report.total
+
+
+def reset_all(resume: bool = True, recreate: bool = False) -> dict:
     """Reset both graph and vector stores. Returns counts."""
-    graph_count = reset_graph()
-    vector_count = reset_vector()
+    graph_count = reset_graph(resume=resume)
+    vector_count = reset_vector(recreate=recreate)
     return {"graph_nodes_deleted": graph_count, "vector_docs_deleted": vector_count}
 
 
-def build_all(pdf_limit: Optional[int] = None, rdb_limit: Optional[int] = None) -> None:
+def build_all(
+    pdf_limit: Optional[int] = None,
+    rdb_limit: Optional[int] = None,
+    incremental: bool = False,
+) -> None:
     """Load all sources (PDFs + RDB) and build index."""
-    from tiger_etf.graphrag.loader import load_pdfs, load_rdb
-
-    docs: list[Document] = []
-    docs.extend(load_pdfs(limit=pdf_limit))
-    docs.extend(load_rdb(limit=rdb_limit))
-
-    if not docs:
-        logger.warning("No documents found.")
-        return
-    build_index(docs)
+    _build_sources(
+        pdfs=True, rdb=True,
+        pdf_limit=pdf_limit, rdb_limit=rdb_limit,
+        incremental=incremental,
+    )
@@ -0,0 +1,229 @@
+"""Local intent classifier for routing GraphRAG questions.
+
+Questions are classified with precompiled keyword rules (no LLM call, a
+few microseconds per question) into:
+
+- ``ATTRIBUTE``: a value of named products ("TIGER 미국S&P500의 총보수는?")
+- ``FILTER``: products matching conditions, optionally ranked
+  ("채권 ETF 중 총보수가 가장 낮은 상품은?")
+- ``AGGREGATE``: counts / averages over products ("섹터별 ETF 수는?")
+- ``RELATION``: relations to other entities (수탁회사, 운용사, 거래소 ...)
+- ``MULTI_HOP``: a relation followed by an attribute of the result
+- ``OPEN``: descriptive or analytical questions (위험, 전략, 비교 ...)
+
+The first three are *structured*: ``etf_products`` and its related tables
+answer them exactly (see :mod:`tiger_etf.graphrag.rdb_query`).  The rules
+err towards the unstructured intents — a question the SQL channel cannot
+answer still falls back to graph traversal.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class Intent(str, Enum):
+    ATTRIBUTE = "ATTRIBUTE"
+    FILTER = "FILTER"
+    AGGREGATE = "AGGREGATE"
+    RELATION = "RELATION"
+    MULTI_HOP = "MULTI_HOP"
+    OPEN = "OPEN"
+
+    @property
+    def structured(self) -> bool:
+        return self in (Intent.ATTRIBUTE, Intent.FILTER, Intent.AGGREGATE)
+
+
+@dataclass(frozen=True)
+class IntentResult:
+    """Intent plus the slots the SQL channel needs."""
+
+    intent: Intent
+    # Product name mentions ("TIGER 미국S&P500"), tickers ("360750")
+    products: tuple[str, ...] = ()
+    tickers: tuple[str, ...] = ()
+    # Attribute keys from ATTRIBUTES, in question order
+    attributes: tuple[str, ...] = ()
+    # Condition keywords matched against name / category / benchmark
+    keywords: tuple[str, ...] = ()
+    # FILTER ranking on the first rankable attribute: "asc", "desc" or
+    # "both" (cheapest and most expensive)
+    order: Optional[str] = None
+    limit: Optional[int] = None
+    group_by_category: bool = False
+    average: bool = False
+    year: Optional[int] = None
+    month: Optional[int] = None
+
+
+# attribute key -> words that ask for it (matched on lowercased text)
+ATTRIBUTES: dict[str, tuple[str, ...]] = {
+    "total_expense_ratio": ("총보수", "보수", "수수료", "비용"),
+    "aum": ("순자산", "aum", "운용규모"),
+    "nav": ("nav", "기준가"),
+    "market_price": ("현재가", "시장가격", "주가"),
+    "listing_date": ("상장일", "언제 상장", "상장된 날"),
+    "currency_hedge": ("환헤지",),
+    "benchmark_index": ("기초지수", "벤치마크", "추적지수", "추종지수", "비교지수"),
+    "ticker": ("종목코드", "티커", "단축코드"),
+    "category": ("분류", "유형", "카테고리"),
+    "creation_unit": ("설정단위",),
+    "shares_outstanding": ("상장주식수", "발행주식수"),
+    "holdings": ("보유종목", "구성종목", "편입종목", "보유한 종목", "보유 종목", "비중"),
+    "distributions": ("분배금", "배당금"),
+    "performance": ("수익률",),
+}
+
+# Numeric product columns that FILTER can rank and AGGREGATE can average
+RANKABLE = ("total_expense_ratio", "aum", "nav", "market_price", "listing_date")
+
+# Condition keyword -> words that ask for it; each word is also looked up
+# (case-insensitively) in name_ko / category_l1 / category_l2 / benchmark_index
+KEYWORDS: dict[str, tuple[str, ...]] = {
+    "채권": ("채권", "국채", "회사채"),
+    "주식": ("주식",),
+    "배당": ("배당",),
+    "커버드콜": ("커버드콜",),
+    "반도체": ("반도체",),
+    "미국": ("미국",),
+    "중국": ("중국", "차이나"),
+    "일본": ("일본",),
+    "인도": ("인도",),
+    "유럽": ("유럽",),
+    "베트남": ("베트남",),
+    "나스닥": ("나스닥",),
+    "S&P500": ("s&p500", "s&p 500"),
+    "코스피": ("코스피", "kospi"),
+    "리츠": ("리츠",),
+    "2차전지": ("2차전지",),
+    "금현물": ("금현물",),
+    "원유": ("원유",),
+    "레버리지": ("레버리지",),
+    "인버스": ("인버스",),
+    "단기": ("단기",),
+    "해외": ("해외",),
+    "국내": ("국내",),
+}
+
+
+def _any_of(words: tuple[str, ...] | list[str]) -> re.Pattern[str]:
+    return re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+
+_OPEN_RE = _any_of((
+    "위험", "리스크", "전략", "설명", "왜 ", "어떻게", "특징", "장단점", "장점", "단점",
+    "차이", "추천", "영향", "적합", "전망", "보장", "비교해", "분석", "효과", "수혜",
+))
+_RELATION_RE = _any_of((
+    "수탁", "운용사", "운용하는", "운용하고", "판매회사", "판매사", "거래소", "규제",
+    "관계", "관련된", "투자 대상", "투자대상", "투자하나", "기초자산", "섹터에 속",
+    "속하는", "속한", "관리하는", "발행",
+))
+_AGGREGATE_RE = _any_of(("몇 개", "몇개", "개수", "몇 종", "평균", "비율", "몇 가지"))
+_FILTER_RE = _any_of((
+    "가장", "상위", "하위", "순으로", " 중 ", "목록", "나열", "어떤 것", "어떤 상품",
+    "들은", "들의", "들을", "상품은", "있나요",
+))
+_GROUP_RE = re.compile(r"(섹터|분류|유형|카테고리)\s*별")
+_ASC_RE = _any_of(("낮은", "저렴", "적은", "작은", "싼 ", "오래된", "하위"))
+_DESC_RE = _any_of(("높은", "비싼", "큰", "많은", "최근", "상위", "최신"))
+_LIMIT_RE = re.compile(r"(?:상위|하위|top)\s*(\d+)|(\d+)\s*개(?!월)")
+_YEAR_RE = re.compile(r"(\d{4})\s*년")
+_MONTH_RE = re.compile(r"(\d{1,2})\s*월")
+_TICKER_RE = re.compile(r"(?<![\w&])(\d{6}|\d{4}[a-z]\d)(?![\w])")
+_TIGER_RE = re.compile(r"\btiger\b")
+_PARTICLE_RE = re.compile(r"(의|은|는|이|가|와|과|을|를|에|도|로)$")
+_TRIM = "?!.,\"'()[]"
+# A product name is rarely longer than this many words after "TIGER"
+_MAX_NAME_WORDS = 4
+
+
+def _normalize(question: str) -> str:
+    return unicodedata.normalize("NFKC", question).lower().strip()
+
+
+def _product_mentions(text: str) -> tuple[str, ...]:
+    """``TIGER <name>`` mentions; words stop at "ETF" or a trailing particle.
+
+    A mention may carry words that are not part of the name ("TIGER 미국S&P500
+    상장일"); the resolver tries shorter prefixes.  A bare "TIGER ETF" is the
+    brand, not a product.
+    """
+    mentions = []
+    for m in _TIGER_RE.finditer(text):
+        words = []
+        for word in text[m.end():].split()[:_MAX_NAME_WORDS]:
+            word = word.strip(_TRIM)
+            if not word or word.startswith("etf"):
+                break
+            stripped = _PARTICLE_RE.sub("", word)
+            words.append(stripped or word)
+            if stripped != word:
+                break
+        if words:
+            mentions.append("tiger " + " ".join(words))
+    return tuple(dict.fromkeys(mentions))
+
+
+def _matches(text: str, table: dict[str, tuple[str, ...]]) -> tuple[str, ...]:
+    found = []
+    for key, words in table.items():
+        positions = [text.find(w) for w in words if w in text]
+        if positions:
+            found.append((min(positions), key))
+    return tuple(key for _, key in sorted(found))
+
+
+def classify_intent(question: str) -> IntentResult:
+    """Classify ``question`` with the local keyword rules."""
+    text = _normalize(question)
+    products = _product_mentions(text)
+    tickers = tuple(t.upper() for t in _TICKER_RE.findall(text))
+    attributes = _matches(text, ATTRIBUTES)
+    # Words inside a product name ("TIGER 미국배당다우존스") are not conditions
+    remainder = _TIGER_RE.sub(" ", text)
+    for mention in products:
+        remainder = remainder.replace(mention[len("tiger "):], " ")
+    keywords = _matches(remainder, KEYWORDS)
+    year = _YEAR_RE.search(text)
+    month = _MONTH_RE.search(text)
+    if year and "상장" in text and "listing_date" not in attributes:
+        attributes += ("listing_date",)
+
+    asc, desc = _ASC_RE.search(text), _DESC_RE.search(text)
+    order = "both" if asc and desc else "asc" if asc else "desc" if desc else None
+    limit = _LIMIT_RE.search(text)
+
+    slots = dict(
+        products=products,
+        tickers=tickers,
+        attributes=attributes,
+        keywords=keywords,
+        order=order,
+        limit=int(limit.group(1) or limit.group(2)) if limit else 1 if order and "가장" in text else None,
+        group_by_category=bool(_GROUP_RE.search(text)),
+        average="평균" in text,
+        year=int(year.group(1)) if year else None,
+        month=int(month.group(1)) if month else None,
+    )
+    named = bool(products or tickers)
+
+    if _OPEN_RE.search(text):
+        intent = Intent.OPEN
+    elif _RELATION_RE.search(text):
+        intent = Intent.MULTI_HOP if attributes else Intent.RELATION
+    elif named and attributes:
+        # "<product>의 총보수 비율은?" asks for one product's value, not a ratio
+        intent = Intent.ATTRIBUTE
+    elif _AGGREGATE_RE.search(text) or slots["group_by_category"]:
+        intent = Intent.AGGREGATE
+    elif not named and (attributes or keywords) and (_FILTER_RE.search(text) or order):
+        intent = Intent.FILTER
+    else:
+        intent = Intent.OPEN
+    return IntentResult(intent=intent, **slots)
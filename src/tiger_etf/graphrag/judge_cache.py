@@ -0,0 +1,104 @@
+"""Persistent cache for LLM-as-Judge scores.
+
+Scores are stored in ``data/graphrag/judge_cache.sqlite3`` keyed by a hash
+of (question, response, expected keywords, expected answer, judge model)
+plus the judge prompt templates, so re-running the evaluation on identical
+responses — ``experiment run --skip-indexing`` or
+``experiment compare --rescore`` — never re-asks the judge.  Editing a
+prompt template or switching the judge model changes every key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    model_id    TEXT NOT NULL,
+    scores      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class JudgeCache:
+    """SQLite-backed judge-input hash -> scores cache with LRU eviction."""
+
+    def __init__(self, path: Path | None = None, *, max_entries: int | None = None) -> None:
+        self.path = path or settings.graphrag_dir / "judge_cache.sqlite3"
+        self.max_entries = (
+            settings.graphrag_judge_cache_max_entries if max_entries is None else max_entries
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    @staticmethod
+    def key_for(fields: dict[str, str], model_id: str, template: str) -> str:
+        payload = json.dumps(
+            {"fields": fields, "model_id": model_id, "template": template},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, float]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT scores FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model_id: str, scores: dict[str, float]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, model_id, json.dumps(scores), now, now),
+            )
+            self._db.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond ``max_entries``."""
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+        return cur.rowcount
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        self._db.close()
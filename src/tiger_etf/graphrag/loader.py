@@ -3,52 +3,133 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from llama_index.core.schema import Document
 from llama_index.readers.file import PyMuPDFReader
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
 
+from tiger_etf.catalog import get_catalog
 from tiger_etf.config import settings
-from tiger_etf.db import get_session
+from tiger_etf.db import get_reader_session
 from tiger_etf.models import EtfDistribution, EtfHolding, EtfProduct
 
 logger = logging.getLogger(__name__)
 
+# Related rows included in each RDB document
+_TOP_HOLDINGS = 20
+_RECENT_DISTRIBUTIONS = 5
 
-def load_pdfs(limit: Optional[int] = None) -> list[Document]:
+
+def list_pdf_files(limit: Optional[int] = None) -> list[Path]:
+    """Return the PDFs in data/pdfs/ in a stable (sorted) order."""
+    pdf_files = sorted(settings.pdfs_dir.glob("*.pdf"))
+    if limit:
+        pdf_files = pdf_files[:limit]
+    return pdf_files
+
+
+def load_pdfs(
+    limit: Optional[int] = None,
+    pdf_files: Optional[list[Path]] = None,
+    num_workers: Optional[int] = None,
+) -> list[Document]:
     """Load PDF files from data/pdfs/ into LlamaIndex Documents.
 
     Each PDF is tagged with metadata extracted from its filename:
       {ksd_fund_code}_{doc_type}_{hash}.pdf
+
+    Pass ``pdf_files`` to load an explicit subset instead of the directory.
+    With ``num_workers`` > 1 (default: graphrag.load_num_workers) PDFs are
+    parsed in a process pool; documents keep the file order either way.
     """
-    pdf_dir = settings.pdfs_dir
-    pdf_files = sorted(pdf_dir.glob("*.pdf"))
-    if limit:
-        pdf_files = pdf_files[:limit]
+    return list(iter_pdfs(limit=limit, pdf_files=pdf_files, num_workers=num_workers))
 
-    logger.info("Loading %d PDF files from %s", len(pdf_files), pdf_dir)
 
-    reader = PyMuPDFReader()
-    documents: list[Document] = []
+def iter_pdfs(
+    limit: Optional[int] = None,
+    pdf_files: Optional[list[Path]] = None,
+    num_workers: Optional[int] = None,
+) -> Iterator[Document]:
+    """Streaming variant of :func:`load_pdfs`.
+
+    Yields page documents file by file, so only the PDFs currently being
+    parsed are held in memory.
+    """
+    if pdf_files is None:
+        pdf_files = list_pdf_files(limit)
+    num_workers = num_workers or settings.graphrag_load_num_workers
+
+    logger.info(
+        "Loading %d PDF files from %s (workers=%d)",
+        len(pdf_files), settings.pdfs_dir, num_workers,
+    )
 
     # Build a mapping of ksd_fund_code -> ticker for metadata enrichment
     ticker_map = _build_ticker_map()
 
-    for pdf_path in pdf_files:
-        meta = _parse_pdf_filename(pdf_path, ticker_map)
-        try:
-            docs = reader.load_data(file_path=pdf_path)
-            for doc in docs:
-                doc.metadata.update(meta)
-            documents.extend(docs)
-        except Exception:
-            logger.warning("Failed to load PDF: %s", pdf_path.name, exc_info=True)
+    count = 0
+    for pdf_path, docs, error in _iter_parsed_pdfs(pdf_files, ticker_map, num_workers):
+        if error:
+            logger.warning("Failed to load PDF: %s (%s)", pdf_path.name, error)
+            continue
+        count += len(docs)
+        yield from docs
+
+    logger.info("Loaded %d documents from %d PDFs", count, len(pdf_files))
+
+
+_reader: Optional[PyMuPDFReader] = None
+
+
+def _parse_pdf(pdf_path: Path, meta: dict) -> tuple[list[Document], Optional[str]]:
+    """Parse one PDF and tag its pages with ``meta``.
+
+    Runs in worker processes, so failures are returned rather than logged.
+    """
+    global _reader
+    if _reader is None:
+        _reader = PyMuPDFReader()
+    try:
+        docs = _reader.load_data(file_path=pdf_path)
+    except Exception as e:
+        return [], f"{type(e).__name__}: {e}"
+    for doc in docs:
+        doc.metadata.update(meta)
+    return docs, None
 
-    logger.info("Loaded %d documents from %d PDFs", len(documents), len(pdf_files))
-    return documents
+
+def _iter_parsed_pdfs(
+    pdf_files: list[Path], ticker_map: dict[str, str], num_workers: int
+) -> Iterator[tuple[Path, list[Document], Optional[str]]]:
+    """Yield ``(path, documents, error)`` per PDF, in input order.
+
+    The pool is fed through a sliding window of ``num_workers * 2`` files
+    so a slow consumer does not let parsed PDFs pile up in memory.
+    """
+    metas = [_parse_pdf_filename(p, ticker_map) for p in pdf_files]
+
+    if num_workers <= 1 or len(pdf_files) <= 1:
+        for pdf_path, meta in zip(pdf_files, metas):
+            yield (pdf_path, *_parse_pdf(pdf_path, meta))
+        return
+
+    window = num_workers * 2
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        inflight: deque = deque()
+        jobs = iter(zip(pdf_files, metas))
+        for pdf_path, meta in islice(jobs, window):
+            inflight.append((pdf_path, pool.submit(_parse_pdf, pdf_path, meta)))
+        while inflight:
+            pdf_path, future = inflight.popleft()
+            for next_path, next_meta in islice(jobs, 1):
+                inflight.append((next_path, pool.submit(_parse_pdf, next_path, next_meta)))
+            yield (pdf_path, *future.result())
 
 
 def load_rdb(limit: Optional[int] = None) -> list[Document]:
@@ -57,35 +138,92 @@ def load_rdb(limit: Optional[int] = None) -> list[Document]:
     Converts structured RDB rows into natural-language text documents
     so the graph extraction LLM can process them.
     """
-    documents: list[Document] = []
+    return list(iter_rdb(limit=limit))
+
 
-    with get_session() as session:
+def iter_rdb(limit: Optional[int] = None, page_size: int = 500) -> Iterator[Document]:
+    """Streaming variant of :func:`load_rdb`.
+
+    Products are read ``page_size`` rows at a time from the reader
+    endpoint; each page's top holdings and recent distributions are then
+    fetched with one windowed query each, instead of two queries per
+    product.
+    """
+    count = 0
+    with get_reader_session() as session:
         query = select(EtfProduct).order_by(EtfProduct.id)
         if limit:
             query = query.limit(limit)
-        products = session.execute(query).scalars().all()
+        products = session.execute(
+            query.execution_options(yield_per=page_size)
+        ).scalars()
+
+        for page in products.partitions():
+            codes = [p.ksd_fund_code for p in page]
+            holdings = _latest_per_fund(
+                session, EtfHolding, codes, _TOP_HOLDINGS,
+                EtfHolding.as_of_date.desc(), EtfHolding.weight_pct.desc(),
+            )
+            dists = _latest_per_fund(
+                session, EtfDistribution, codes, _RECENT_DISTRIBUTIONS,
+                EtfDistribution.record_date.desc(),
+            )
+            for product in page:
+                count += 1
+                yield _product_to_document(
+                    product,
+                    holdings.get(product.ksd_fund_code, []),
+                    dists.get(product.ksd_fund_code, []),
+                )
+
+    logger.info("Loaded %d RDB documents", count)
+
+
+def _latest_per_fund(
+    session: Session, model, codes: list[str], n: int, *order_by,
+) -> dict[str, list]:
+    """First ``n`` rows of ``model`` per fund in ``order_by`` order, in one query.
+
+    Uses ``ROW_NUMBER() OVER (PARTITION BY ksd_fund_code ORDER BY ...)``
+    so each fund keeps the same rows a per-fund ``ORDER BY ... LIMIT n``
+    would return.
+    """
+    if not codes:
+        return {}
+    rn = func.row_number().over(
+        partition_by=model.ksd_fund_code, order_by=order_by,
+    ).label("rn")
+    ranked = (
+        select(model, rn)
+        .where(model.ksd_fund_code.in_(codes))
+        .subquery()
+    )
+    row = aliased(model, ranked)
+    query = (
+        select(row)
+        .where(ranked.c.rn <= n)
+        .order_by(ranked.c.ksd_fund_code, ranked.c.rn)
+    )
+
+    grouped: dict[str, list] = defaultdict(list)
+    for obj in session.execute(query).scalars():
+        grouped[obj.ksd_fund_code].append(obj)
+    return grouped
 
-        for product in products:
-            doc = _product_to_document(session, product)
-            documents.append(doc)
 
-    logger.info("Loaded %d RDB documents", len(documents))
-    return documents
+def list_product_codes() -> list[str]:
+    """Return every product's ksd_fund_code (the keys of RDB documents)."""
+    with get_reader_session() as session:
+        return list(session.execute(select(EtfProduct.ksd_fund_code)).scalars())
 
 
 def _build_ticker_map() -> dict[str, str]:
-    """Build ksd_fund_code -> ticker mapping from RDB."""
-    ticker_map: dict[str, str] = {}
+    """Build ksd_fund_code -> ticker mapping from the product catalog."""
     try:
-        with get_session() as session:
-            rows = session.execute(
-                select(EtfProduct.ksd_fund_code, EtfProduct.ticker)
-            ).all()
-            for code, ticker in rows:
-                ticker_map[code] = ticker
+        return get_catalog().ticker_map()
     except Exception:
         logger.warning("Could not build ticker map from RDB", exc_info=True)
-    return ticker_map
+        return {}
 
 
 def _parse_pdf_filename(pdf_path: Path, ticker_map: dict[str, str]) -> dict:
@@ -105,8 +243,16 @@ def _parse_pdf_filename(pdf_path: Path, ticker_map: dict[str, str]) -> dict:
     return meta
 
 
-def _product_to_document(session: Session, product: EtfProduct) -> Document:
-    """Convert an EtfProduct row (with related data) into a text Document."""
+def _product_to_document(
+    product: EtfProduct,
+    holdings: list[EtfHolding],
+    dists: list[EtfDistribution],
+) -> Document:
+    """Convert an EtfProduct row (with related data) into a text Document.
+
+    ``holdings`` / ``dists`` are the product's top holdings and recent
+    distributions, already ordered (see :func:`_latest_per_fund`).
+    """
     lines = [
         f"ETF 상품명: {product.name_ko}",
         f"티커: {product.ticker}",
@@ -131,13 +277,6 @@ def _product_to_document(session: Session, product: EtfProduct) -> Document:
         lines.append(f"환헤지: {'예' if product.currency_hedge else '아니오'}")
 
     # Top holdings
-    holdings = (
-        session.query(EtfHolding)
-        .filter(EtfHolding.ksd_fund_code == product.ksd_fund_code)
-        .order_by(EtfHolding.as_of_date.desc(), EtfHolding.weight_pct.desc())
-        .limit(20)
-        .all()
-    )
     if holdings:
         lines.append("\n주요 보유종목:")
         for h in holdings:
@@ -145,13 +284,6 @@ def _product_to_document(session: Session, product: EtfProduct) -> Document:
             lines.append(f"  - {h.holding_name} ({weight})")
 
     # Recent distributions
-    dists = (
-        session.query(EtfDistribution)
-        .filter(EtfDistribution.ksd_fund_code == product.ksd_fund_code)
-        .order_by(EtfDistribution.record_date.desc())
-        .limit(5)
-        .all()
-    )
     if dists:
         lines.append("\n최근 분배금:")
         for d in dists:
@@ -0,0 +1,127 @@
+"""Persistent manifest of what has been indexed into the lexical graph.
+
+Each indexed source document is recorded under a stable key
+(``pdf:<file_name>`` or ``rdb:<ksd_fund_code>``) with the hash of its
+content, the extraction-config fingerprint it was extracted with, and the
+metadata filter that selects its sources in the graph.  An incremental
+build only sends documents whose hash or fingerprint changed to
+extraction, and tombstones entries whose source disappeared.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ManifestEntry:
+    """One indexed source document."""
+
+    content_hash: str
+    fingerprint: str
+    indexed_at: str
+    source_filter: dict[str, Any] = field(default_factory=dict)
+    removed_at: str | None = None
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file in chunks without reading it fully into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pdf_key(path: Path) -> str:
+    return f"pdf:{path.name}"
+
+
+def rdb_key(ksd_fund_code: str) -> str:
+    return f"rdb:{ksd_fund_code}"
+
+
+def source_key(doc) -> str:
+    """Manifest key of the source a loaded Document came from."""
+    if doc.metadata.get("source") == "rdb":
+        return rdb_key(doc.metadata["ksd_fund_code"])
+    return f"pdf:{doc.metadata['file_name']}"
+
+
+class IndexManifest:
+    """JSON-backed map of document key -> ManifestEntry."""
+
+    def __init__(self, path: Path, entries: dict[str, ManifestEntry] | None = None) -> None:
+        self.path = path
+        self.entries: dict[str, ManifestEntry] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "IndexManifest":
+        path = path or settings.graphrag_dir / "index_manifest.json"
+        if not path.exists():
+            return cls(path)
+        with open(path) as f:
+            raw = json.load(f)
+        entries = {key: ManifestEntry(**val) for key, val in raw.get("entries", {}).items()}
+        return cls(path, entries)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(
+                {"entries": {k: asdict(v) for k, v in sorted(self.entries.items())}},
+                f, indent=2, ensure_ascii=False,
+            )
+        tmp.replace(self.path)
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after the graph store was reset."""
+        self.entries = {}
+        self.path.unlink(missing_ok=True)
+
+    def is_current(self, key: str, content_hash: str, fingerprint: str) -> bool:
+        """True if ``key`` was indexed with this exact content and config."""
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry.removed_at is None
+            and entry.content_hash == content_hash
+            and entry.fingerprint == fingerprint
+        )
+
+    def is_indexed(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and entry.removed_at is None
+
+    def stale_keys(self, prefix: str, present: set[str]) -> list[str]:
+        """Active keys under ``prefix`` whose source no longer exists."""
+        return sorted(
+            key for key, entry in self.entries.items()
+            if key.startswith(prefix) and entry.removed_at is None and key not in present
+        )
+
+    def record(
+        self, key: str, content_hash: str, fingerprint: str, source_filter: dict[str, Any]
+    ) -> None:
+        self.entries[key] = ManifestEntry(
+            content_hash=content_hash,
+            fingerprint=fingerprint,
+            indexed_at=datetime.now(timezone.utc).isoformat(),
+            source_filter=source_filter,
+        )
+
+    def tombstone(self, key: str) -> None:
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.removed_at = datetime.now(timezone.utc).isoformat()
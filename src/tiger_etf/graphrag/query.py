@@ -1,44 +1,261 @@
-"""Query the LexicalGraph using traversal-based search."""
+"""Query the LexicalGraph using traversal-based search.
+
+Questions are first classified by the local intent classifier; attribute,
+filter and aggregate questions are answered with SQL on the RDB reader
+endpoint, and everything else (or anything SQL cannot answer exactly)
+goes to graph traversal.
+"""
 
 from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
 
 import boto3
 
 from tiger_etf.config import settings
+from tiger_etf.graphrag.aws_clients import region_from_endpoint
+from tiger_etf.graphrag.query_cache import QueryCache, current_scope
+from tiger_etf.graphrag.query_profile import (
+    QueryProfile,
+    instrument_graph_store,
+    profile_query,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def get_query_engine():
-    """Create and return a LexicalGraphQueryEngine."""
+def _engine_key() -> tuple[str, ...]:
+    """Everything a query engine is built from; a change means a new engine."""
+    return (
+        settings.graph_store_reader,
+        settings.vector_store,
+        settings.graphrag_aws_region,
+        settings.graphrag_extraction_llm,
+        settings.graphrag_response_llm,
+        settings.graphrag_embedding_model,
+    )
+
+
+def _build_engine(key: tuple[str, ...]) -> "_PooledEngine":
+    """Configure GraphRAG, open the reader stores and build the engine."""
     from graphrag_toolkit.lexical_graph import GraphRAGConfig, LexicalGraphQueryEngine
     from graphrag_toolkit.lexical_graph.storage import (
         GraphStoreFactory,
         VectorStoreFactory,
     )
 
-    GraphRAGConfig.aws_region = settings.graphrag_aws_region
-    GraphRAGConfig.extraction_llm = settings.graphrag_extraction_llm
-    GraphRAGConfig.response_llm = settings.graphrag_response_llm
-    GraphRAGConfig.embed_model = settings.graphrag_embedding_model
+    graph_store_uri, vector_store_uri, region, extraction_llm, response_llm, embed_model = key
+    GraphRAGConfig.aws_region = region
+    GraphRAGConfig.extraction_llm = extraction_llm
+    GraphRAGConfig.response_llm = response_llm
+    GraphRAGConfig.embed_model = embed_model
 
-    graph_store = GraphStoreFactory.for_graph_store(settings.graph_store_reader)
-    vector_store = VectorStoreFactory.for_vector_store(settings.vector_store)
+    graph_store = instrument_graph_store(GraphStoreFactory.for_graph_store(graph_store_uri))
+    vector_store = VectorStoreFactory.for_vector_store(vector_store_uri)
 
-    return LexicalGraphQueryEngine.for_traversal_based_search(
+    engine = LexicalGraphQueryEngine.for_traversal_based_search(
         graph_store, vector_store
     )
+    return _PooledEngine(engine=engine, graph_store=graph_store)
+
+
+@dataclass
+class _PooledEngine:
+    engine: Any
+    graph_store: Any
+    created_at: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+    healthy: bool = True
+    uses: int = 0
+
+
+class QueryEnginePool:
+    """Process-wide, lazily built query engines keyed by store URIs + models.
+
+    Building an engine reconfigures GraphRAGConfig and opens new store
+    clients, so it is done once per configuration and reused.  A pooled
+    engine is health-checked (a trivial graph query) every
+    ``graphrag.engine_health_check_interval`` seconds, and immediately
+    after a query on it failed; an engine that fails the check is rebuilt.
+    """
+
+    def __init__(self, builder: Callable[[tuple[str, ...]], _PooledEngine] = _build_engine):
+        self._builder = builder
+        self._engines: dict[tuple[str, ...], _PooledEngine] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[Any, float]:
+        """Return ``(engine, setup_seconds)`` for the current settings.
+
+        ``setup_seconds`` is the time spent building or checking the engine
+        for this call (0 when a healthy engine was simply reused).
+        """
+        key = _engine_key()
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry is not None and self._needs_check(entry) and not self._check(entry):
+                logger.warning("Query engine failed its health check; rebuilding")
+                entry = None
+            if entry is None:
+                entry = self._builder(key)
+                self._engines[key] = entry
+                logger.info("Built query engine in %.2fs", time.perf_counter() - start)
+            entry.uses += 1
+        return entry.engine, time.perf_counter() - start
+
+    def mark_failed(self, engine: Any) -> None:
+        """Force a health check before ``engine`` is handed out again."""
+        with self._lock:
+            for entry in self._engines.values():
+                if entry.engine is engine:
+                    entry.healthy = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engines.clear()
+
+    @staticmethod
+    def _needs_check(entry: _PooledEngine) -> bool:
+        interval = settings.graphrag_engine_health_check_interval
+        return not entry.healthy or time.monotonic() - entry.checked_at >= interval
+
+    @staticmethod
+    def _check(entry: _PooledEngine) -> bool:
+        try:
+            entry.graph_store.execute_query("RETURN 1 AS ok")
+        except Exception as e:
+            logger.warning("Graph store health check failed: %s", e)
+            return False
+        entry.healthy = True
+        entry.checked_at = time.monotonic()
+        return True
+
+
+_engine_pool = QueryEnginePool()
+
+
+def get_query_engine():
+    """Return the pooled LexicalGraphQueryEngine for the current settings."""
+    engine, _ = _engine_pool.acquire()
+    return engine
+
+
+@dataclass
+class QueryResult:
+    """A query answer plus how long it took."""
+
+    response: str
+    setup_seconds: float = 0.0
+    total_seconds: float = 0.0
+    cache_hit: bool = False
+    # Per-stage breakdown of the engine query (None for cache hits and SQL answers)
+    profile: Optional[QueryProfile] = None
+    # Classified intent ("" when routing is off) and the channel that answered:
+    # "sql", "graph" or "cache"
+    intent: str = ""
+    route: str = "graph"
+
+
+_query_cache: Optional[QueryCache] = None
+
+
+def _get_query_cache() -> QueryCache:
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
+
+
+def _answer_with_sql(question: str) -> tuple[str, Optional[str]]:
+    """Classify ``question``; returns (intent, SQL answer or None).
+
+    Only structured intents reach the RDB, and the answer is None when it
+    cannot be answered exactly there.
+    """
+    from tiger_etf.graphrag.intent import classify_intent
+
+    classified = classify_intent(question)
+    if not classified.intent.structured:
+        return classified.intent.value, None
 
+    from tiger_etf.graphrag.rdb_query import answer_structured
 
-def query(question: str) -> str:
-    """Run a traversal-based search query and return the response text."""
-    engine = get_query_engine()
-    logger.info("Querying: %s", question)
-    response = engine.query(question)
-    return str(response)
+    answer = answer_structured(classified)
+    if answer is None:
+        logger.info("No exact SQL answer for %s question; using graph traversal",
+                    classified.intent.value)
+    return classified.intent.value, answer
+
+
+def run_query(
+    question: str, use_cache: Optional[bool] = None, route: Optional[bool] = None,
+) -> QueryResult:
+    """Answer ``question`` and report engine setup / total / per-stage time.
+
+    With ``route`` (default: graphrag.router.enabled) structured questions
+    are answered by SQL before the cache or the engine is consulted.
+    Graph answers are served from / stored in the query cache unless
+    ``use_cache`` is False (default: graphrag.query_cache.enabled).
+    """
+    start = time.perf_counter()
+    if use_cache is None:
+        use_cache = settings.graphrag_query_cache_enabled
+    if route is None:
+        route = settings.graphrag_router_enabled
+
+    intent = ""
+    if route:
+        intent, answer = _answer_with_sql(question)
+        if answer is not None:
+            total = time.perf_counter() - start
+            logger.info("Answered %s question with SQL in %.3fs", intent, total)
+            return QueryResult(response=answer, total_seconds=total, intent=intent, route="sql")
+
+    if use_cache:
+        cache, scope = _get_query_cache(), current_scope()
+        cached = cache.get(question, scope)
+        if cached is not None:
+            logger.info(
+                "Query cache hit (similarity %.3f, cached question: %s)",
+                cached.similarity, cached.question,
+            )
+            return QueryResult(
+                response=cached.response,
+                total_seconds=time.perf_counter() - start,
+                cache_hit=True,
+                intent=intent,
+                route="cache",
+            )
+
+    engine, setup_seconds = _engine_pool.acquire()
+    logger.info("Querying: %s (engine setup %.3fs)", question, setup_seconds)
+    try:
+        with profile_query() as profile:
+            response = str(engine.query(question))
+    except Exception:
+        _engine_pool.mark_failed(engine)
+        raise
+
+    if use_cache:
+        cache.put(question, scope, response)
+    return QueryResult(
+        response=response,
+        setup_seconds=setup_seconds,
+        total_seconds=time.perf_counter() - start,
+        profile=profile,
+        intent=intent,
+    )
+
+
+def query(question: str, use_cache: Optional[bool] = None) -> str:
+    """Answer ``question`` (SQL or traversal-based search) and return the response text."""
+    return run_query(question, use_cache=use_cache).response
 
 
 def _parse_graph_store_uri(uri: str) -> tuple[str, str]:
@@ -58,78 +275,47 @@ def _parse_graph_store_uri(uri: str) -> tuple[str, str]:
     raise ValueError(f"Unsupported graph_store URI for stats: {uri}")
 
 
-def _extract_region_from_endpoint(endpoint: str) -> str:
-    """Extract AWS region from a Neptune endpoint hostname.
-
-    Example: 'db-xxx.cluster-yyy.ap-northeast-2.neptune.amazonaws.com' → 'ap-northeast-2'
-    """
-    parts = endpoint.split(".")
-    for i, part in enumerate(parts):
-        if part == "neptune" and i > 0:
-            return parts[i - 1]
-    return settings.graphrag_aws_region
-
-
-def get_graph_stats() -> dict:
-    """Return node/edge counts from Neptune using OpenCypher queries."""
-    store_type, identifier = _parse_graph_store_uri(settings.graph_store_reader)
+def _cypher_runner(uri: str) -> Callable[..., list]:
+    """Return ``run(cypher, parameters=None) -> rows`` for the Neptune store at ``uri``."""
+    store_type, identifier = _parse_graph_store_uri(uri)
+    session = boto3.Session(region_name=region_from_endpoint(identifier))
 
     if store_type == "analytics":
-        return _stats_neptune_analytics(identifier)
+        client = session.client("neptune-graph")
+
+        def run(cypher: str, parameters: Optional[dict] = None) -> list:
+            response = client.execute_query(
+                graphIdentifier=identifier,
+                queryString=cypher,
+                parameters=parameters or {},
+                language="OPEN_CYPHER",
+                planCache="DISABLED",
+            )
+            return json.loads(response["payload"].read())["results"]
     else:
-        return _stats_neptune_database(identifier)
-
-
-def _stats_neptune_analytics(graph_id: str) -> dict:
-    """Collect graph stats from Neptune Analytics."""
-    region = _extract_region_from_endpoint(graph_id)
-    session = boto3.Session(region_name=region)
-    client = session.client("neptune-graph")
-
-    def run_query(cypher: str) -> list:
-        response = client.execute_query(
-            graphIdentifier=graph_id,
-            queryString=cypher,
-            parameters={},
-            language="OPEN_CYPHER",
-            planCache="DISABLED",
+        client = session.client(
+            "neptunedata",
+            endpoint_url=f"https://{identifier}:8182",
         )
-        return json.loads(response["payload"].read())["results"]
 
-    node_results = run_query(
-        "MATCH (n) RETURN labels(n) AS labels, count(n) AS cnt"
-    )
-    nodes = {str(r["labels"]): r["cnt"] for r in node_results}
+        def run(cypher: str, parameters: Optional[dict] = None) -> list:
+            kwargs = {"parameters": json.dumps(parameters)} if parameters else {}
+            response = client.execute_open_cypher_query(openCypherQuery=cypher, **kwargs)
+            return response["results"]
 
-    edge_results = run_query(
-        "MATCH ()-[r]->() RETURN type(r) AS type, count(r) AS cnt"
-    )
-    edges = {r["type"]: r["cnt"] for r in edge_results}
+    return run
 
-    return {"nodes": nodes, "edges": edges}
 
+def get_graph_stats() -> dict:
+    """Return node/edge counts from Neptune using OpenCypher queries."""
+    _run = _cypher_runner(settings.graph_store_reader)
 
-def _stats_neptune_database(endpoint: str) -> dict:
-    """Collect graph stats from Neptune Database."""
-    region = _extract_region_from_endpoint(endpoint)
-    session = boto3.Session(region_name=region)
-    client = session.client(
-        "neptunedata",
-        endpoint_url=f"https://{endpoint}:8182",
-    )
-
-    def run_query(cypher: str) -> list:
-        response = client.execute_open_cypher_query(
-            openCypherQuery=cypher,
-        )
-        return response["results"]
-
-    node_results = run_query(
+    node_results = _run(
         "MATCH (n) RETURN labels(n) AS labels, count(n) AS cnt"
     )
     nodes = {str(r["labels"]): r["cnt"] for r in node_results}
 
-    edge_results = run_query(
+    edge_results = _run(
         "MATCH ()-[r]->() RETURN type(r) AS type, count(r) AS cnt"
     )
     edges = {r["type"]: r["cnt"] for r in edge_results}
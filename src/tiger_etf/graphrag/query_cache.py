@@ -0,0 +1,250 @@
+"""Response cache for ``graphrag query``.
+
+Answers are stored in ``data/graphrag/query_cache.sqlite3`` keyed by the
+normalized question within a *scope*: the graph-version stamp plus the
+store URIs and models that produced the answer.  Every index build or
+reset bumps the stamp (:func:`bump_graph_version`), which invalidates all
+earlier answers at once.
+
+With ``graphrag.query_cache.similarity_threshold`` > 0 a miss on the exact
+key falls back to comparing the question's embedding against the cached
+questions of the same scope, so near-duplicates ("TIGER 미국S&P500 총보수는?"
+vs "TIGER 미국S&P500의 총보수는 얼마야") are served too.  Entries expire
+after ``ttl_seconds`` and the least recently used are evicted beyond
+``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    scope       TEXT NOT NULL,
+    question    TEXT NOT NULL,
+    response    TEXT NOT NULL,
+    embedding   BLOB,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+_PUNCT_RE = re.compile(r"[\s?!.。,~]+$")
+_SPACE_RE = re.compile(r"\s+")
+
+
+# ---------------------------------------------------------------------------
+# Graph version stamp (data/graphrag/graph_version)
+# ---------------------------------------------------------------------------
+
+def _version_path() -> Path:
+    return settings.graphrag_dir / "graph_version"
+
+
+def graph_version() -> str:
+    """Current graph-version stamp ("0" before the first build)."""
+    path = _version_path()
+    return path.read_text().strip() if path.exists() else "0"
+
+
+def bump_graph_version() -> str:
+    """Mark the graph as changed; cached answers from before become stale."""
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    path = _version_path()
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(version)
+    tmp.replace(path)
+    logger.info("Graph version bumped to %s", version)
+    return version
+
+
+def current_scope() -> str:
+    """Hash of everything an answer depends on besides the question."""
+    payload = json.dumps(
+        {
+            "graph_version": graph_version(),
+            "graph_store": settings.graph_store_reader,
+            "vector_store": settings.vector_store,
+            "response_llm": settings.graphrag_response_llm,
+            "embedding_model": settings.graphrag_embedding_model,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def normalize_question(question: str) -> str:
+    """Case/width/whitespace-insensitive form of a question."""
+    text = unicodedata.normalize("NFKC", question).lower().strip()
+    text = _PUNCT_RE.sub("", text)
+    return _SPACE_RE.sub(" ", text)
+
+
+def _cosine(a: array, b: array) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class CachedAnswer:
+    response: str
+    question: str
+    similarity: float = 1.0
+
+
+class QueryCache:
+    """SQLite-backed question -> answer cache with TTL, LRU and semantic lookup."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        similarity_threshold: float | None = None,
+        embed: Optional[Callable[[str], list[float]]] = None,
+    ) -> None:
+        self.path = path or settings.graphrag_dir / "query_cache.sqlite3"
+        self.ttl_seconds = (
+            settings.graphrag_query_cache_ttl if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = (
+            settings.graphrag_query_cache_max_entries if max_entries is None else max_entries
+        )
+        self.similarity_threshold = (
+            settings.graphrag_query_cache_similarity_threshold
+            if similarity_threshold is None else similarity_threshold
+        )
+        self._embed = embed
+        self.hits = 0
+        self.misses = 0
+        # Shared by eval worker threads and pooled engines; every use holds the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    @property
+    def semantic(self) -> bool:
+        return self.similarity_threshold > 0
+
+    def embed(self, question: str) -> array:
+        if self._embed is None:
+            self._embed = _default_embed()
+        return array("f", self._embed(normalize_question(question)))
+
+    @staticmethod
+    def key_for(scope: str, question: str) -> str:
+        return hashlib.sha256(f"{scope}\n{normalize_question(question)}".encode()).hexdigest()
+
+    def purge(self, scope: str) -> int:
+        """Drop expired entries and those from other scopes (older graph versions)."""
+        with self._lock:
+            return self._purge(scope)
+
+    def _purge(self, scope: str) -> int:
+        cur = self._db.execute(
+            "DELETE FROM entries WHERE scope != ? OR created_at < ?",
+            (scope, time.time() - self.ttl_seconds),
+        )
+        self._db.commit()
+        return cur.rowcount
+
+    def get(self, question: str, scope: str) -> Optional[CachedAnswer]:
+        key = self.key_for(scope, question)
+        with self._lock:
+            self._purge(scope)
+            row = self._db.execute(
+                "SELECT key, question, response FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        similarity = 1.0
+        if row is None and self.semantic:
+            # Embed outside the lock: it is a model call
+            query_vec = self.embed(question)
+            with self._lock:
+                row, similarity = self._nearest(query_vec, scope)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), row[0])
+            )
+            self._db.commit()
+            self.hits += 1
+        return CachedAnswer(response=row[2], question=row[1], similarity=similarity)
+
+    def _nearest(self, query_vec: array, scope: str):
+        best, best_sim = None, self.similarity_threshold
+        for key, cached_q, response, blob in self._db.execute(
+            "SELECT key, question, response, embedding FROM entries "
+            "WHERE scope = ? AND embedding IS NOT NULL",
+            (scope,),
+        ):
+            vec = array("f")
+            vec.frombytes(blob)
+            sim = _cosine(query_vec, vec)
+            if sim >= best_sim:
+                best, best_sim = (key, cached_q, response), sim
+        return best, best_sim
+
+    def put(self, question: str, scope: str, response: str) -> None:
+        embedding = self.embed(question).tobytes() if self.semantic else None
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key_for(scope, question), scope, question, response, embedding, now, now),
+            )
+            self._db.commit()
+            self._evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond ``max_entries``."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        cur = self._db.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._db.commit()
+        return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _default_embed() -> Callable[[str], list[float]]:
+    from graphrag_toolkit.lexical_graph import GraphRAGConfig
+
+    GraphRAGConfig.aws_region = settings.graphrag_aws_region
+    GraphRAGConfig.embed_model = settings.graphrag_embedding_model
+    return GraphRAGConfig.embed_model.get_text_embedding
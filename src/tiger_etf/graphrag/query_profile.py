@@ -0,0 +1,287 @@
+"""Per-stage timing for GraphRAG queries.
+
+``LexicalGraphQueryEngine`` is built on llama_index, whose instrumentation
+dispatcher emits start/end events for query embedding, retrieval,
+reranking, response synthesis and every LLM call.  :func:`profile_query`
+collects those events for one query, and :func:`instrument_graph_store`
+times the graph store's ``execute_query`` (Neptune traversal).  Each stage
+is reported as wall-clock time (the union of its intervals, so nested or
+parallel calls are not double counted):
+
+- ``embedding``: embedding the question
+- ``graph``: Neptune queries issued by the retrievers
+- ``vector_search``: retrieval time not spent embedding or in graph
+  queries — mostly the OpenSearch kNN lookups
+- ``rerank``: node post-processing / reranking
+- ``generation``: response synthesis by the response LLM
+
+Token counts come from the usage the LLM provider reports.  Events are
+attributed to the profile active in the emitting thread; events from
+helper threads the toolkit starts are attributed only while a single
+query is being profiled.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, Optional
+
+_Interval = tuple[float, float]
+
+_current: contextvars.ContextVar[Optional[_Recorder]] = contextvars.ContextVar(
+    "graphrag_query_profile", default=None
+)
+_active: set[_Recorder] = set()
+_active_lock = threading.Lock()
+_handler_installed = False
+
+
+@dataclass
+class QueryProfile:
+    """Where one query's time went, with node and token counts."""
+
+    total_seconds: float = 0.0
+    embedding_seconds: float = 0.0
+    vector_search_seconds: float = 0.0
+    graph_seconds: float = 0.0
+    rerank_seconds: float = 0.0
+    generation_seconds: float = 0.0
+    other_seconds: float = 0.0
+    embedding_calls: int = 0
+    graph_queries: int = 0
+    llm_calls: int = 0
+    retrieved_nodes: int = 0
+    reranked_nodes: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+class _Recorder:
+    """Raw intervals and counters gathered while a query runs."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.intervals: dict[str, list[_Interval]] = {}
+        self.starts: dict[tuple[str, Optional[str]], float] = {}
+        self.counts: dict[str, int] = {}
+        self.retrieval_nodes: list[tuple[float, int]] = []
+
+    def start(self, stage: str, span_id: Optional[str], ts: float) -> None:
+        with self.lock:
+            self.starts[(stage, span_id)] = ts
+
+    def end(self, stage: str, span_id: Optional[str], ts: float) -> Optional[_Interval]:
+        with self.lock:
+            start = self.starts.pop((stage, span_id), None)
+            if start is None:
+                return None
+            self.intervals.setdefault(stage, []).append((start, ts))
+        return start, ts
+
+    def add(self, stage: str, start: float, end: float) -> None:
+        with self.lock:
+            self.intervals.setdefault(stage, []).append((start, end))
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+
+def _union(intervals: list[_Interval]) -> list[_Interval]:
+    merged: list[_Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _length(intervals: list[_Interval]) -> float:
+    return sum(end - start for start, end in intervals)
+
+
+def _overlap(a: list[_Interval], b: list[_Interval]) -> float:
+    """Total length of the intersection of two merged interval lists."""
+    total, i, j = 0.0, 0, 0
+    while i < len(a) and j < len(b):
+        lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        total += max(0.0, hi - lo)
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def _summarize(rec: _Recorder, total_seconds: float) -> QueryProfile:
+    stages = {name: _union(iv) for name, iv in rec.intervals.items()}
+    retrieval = stages.get("retrieval", [])
+    embedding = stages.get("embedding", [])
+    graph = stages.get("graph", [])
+    rerank = stages.get("rerank", [])
+    generation = stages.get("generation", [])
+
+    in_retrieval = _overlap(retrieval, _union(embedding + graph))
+    vector_search = max(0.0, _length(retrieval) - in_retrieval)
+    accounted = _length(_union(retrieval + embedding + graph + rerank + generation))
+
+    # The outermost retriever (longest interval) returns the final node list
+    retrieved = max(rec.retrieval_nodes, default=(0.0, 0))[1]
+    return QueryProfile(
+        total_seconds=total_seconds,
+        embedding_seconds=_length(embedding),
+        vector_search_seconds=vector_search,
+        graph_seconds=_length(graph),
+        rerank_seconds=_length(rerank),
+        generation_seconds=_length(generation),
+        other_seconds=max(0.0, total_seconds - accounted),
+        embedding_calls=rec.counts.get("embedding_calls", 0),
+        graph_queries=rec.counts.get("graph_queries", 0),
+        llm_calls=rec.counts.get("llm_calls", 0),
+        retrieved_nodes=retrieved,
+        reranked_nodes=rec.counts.get("reranked_nodes", 0),
+        prompt_tokens=rec.counts.get("prompt_tokens", 0),
+        completion_tokens=rec.counts.get("completion_tokens", 0),
+    )
+
+
+def _recorder() -> Optional[_Recorder]:
+    rec = _current.get()
+    if rec is None:
+        with _active_lock:
+            if len(_active) == 1:
+                rec = next(iter(_active))
+    return rec
+
+
+@contextmanager
+def profile_query() -> Iterator[QueryProfile]:
+    """Profile the query run inside the block.
+
+    The yielded :class:`QueryProfile` is filled in when the block exits.
+    """
+    _install_handler()
+    rec = _Recorder()
+    token = _current.set(rec)
+    with _active_lock:
+        _active.add(rec)
+    profile = QueryProfile()
+    start = time.monotonic()
+    try:
+        yield profile
+    finally:
+        with _active_lock:
+            _active.discard(rec)
+        _current.reset(token)
+        summary = _summarize(rec, time.monotonic() - start)
+        for key, value in asdict(summary).items():
+            setattr(profile, key, value)
+
+
+def instrument_graph_store(graph_store: Any) -> Any:
+    """Time ``graph_store.execute_query`` calls made during profiled queries."""
+    execute_query = graph_store.execute_query
+
+    @functools.wraps(execute_query)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        rec = _recorder()
+        if rec is None:
+            return execute_query(*args, **kwargs)
+        start = time.monotonic()
+        try:
+            return execute_query(*args, **kwargs)
+        finally:
+            rec.add("graph", start, time.monotonic())
+            rec.count("graph_queries")
+
+    # Set on the instance, bypassing pydantic field validation
+    object.__setattr__(graph_store, "execute_query", timed)
+    return graph_store
+
+
+# ---------------------------------------------------------------------------
+# llama_index instrumentation
+# ---------------------------------------------------------------------------
+
+def llm_usage(response: Any) -> tuple[int, int]:
+    """(prompt, completion) tokens reported by the provider, if any."""
+    if response is None:
+        return 0, 0
+    extra = getattr(response, "additional_kwargs", None) or {}
+    if "prompt_tokens" in extra or "completion_tokens" in extra:
+        return int(extra.get("prompt_tokens", 0)), int(extra.get("completion_tokens", 0))
+    raw = getattr(response, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else None
+    if isinstance(usage, dict):
+        return (
+            int(usage.get("inputTokens", usage.get("input_tokens", 0))),
+            int(usage.get("outputTokens", usage.get("output_tokens", 0))),
+        )
+    return 0, 0
+
+
+def _handle(event: Any) -> None:
+    rec = _recorder()
+    if rec is None:
+        return
+    name = type(event).__name__
+    span_id = getattr(event, "span_id", None)
+    # Handlers run synchronously as events are emitted
+    ts = time.monotonic()
+
+    if name == "EmbeddingStartEvent":
+        rec.start("embedding", span_id, ts)
+    elif name == "EmbeddingEndEvent":
+        rec.end("embedding", span_id, ts)
+        rec.count("embedding_calls")
+    elif name == "RetrievalStartEvent":
+        rec.start("retrieval", span_id, ts)
+    elif name == "RetrievalEndEvent":
+        interval = rec.end("retrieval", span_id, ts)
+        if interval is not None:
+            with rec.lock:
+                rec.retrieval_nodes.append((interval[1] - interval[0], len(event.nodes)))
+    elif name == "ReRankStartEvent":
+        rec.start("rerank", span_id, ts)
+    elif name == "ReRankEndEvent":
+        rec.end("rerank", span_id, ts)
+        rec.count("reranked_nodes", len(event.nodes))
+    elif name == "SynthesizeStartEvent":
+        rec.start("generation", span_id, ts)
+    elif name == "SynthesizeEndEvent":
+        rec.end("generation", span_id, ts)
+    elif name in ("LLMChatEndEvent", "LLMCompletionEndEvent"):
+        prompt_tokens, completion_tokens = llm_usage(event.response)
+        rec.count("llm_calls")
+        rec.count("prompt_tokens", prompt_tokens)
+        rec.count("completion_tokens", completion_tokens)
+
+
+def _install_handler() -> None:
+    global _handler_installed
+    if _handler_installed:
+        return
+    from llama_index.core.instrumentation import get_dispatcher
+    from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+
+    class _ProfileEventHandler(BaseEventHandler):
+        @classmethod
+        def class_name(cls) -> str:
+            return "GraphRAGQueryProfileHandler"
+
+        def handle(self, event: Any, **kwargs: Any) -> None:
+            _handle(event)
+
+    with _active_lock:
+        if not _handler_installed:
+            get_dispatcher().add_event_handler(_ProfileEventHandler())
+            _handler_installed = True
@@ -0,0 +1,351 @@
+"""Answer structured questions with SQL on the RDB reader endpoint.
+
+``etf_products`` (with holdings, distributions and performance) is the
+source of truth for product attributes, so ATTRIBUTE / FILTER / AGGREGATE
+questions (see :mod:`tiger_etf.graphrag.intent`) are answered with
+parameterized queries instead of an LLM graph traversal — milliseconds
+instead of seconds, and exact values instead of figures extracted from
+PDFs.  Every query is built with SQLAlchemy from a fixed set of columns;
+question text only ever reaches the database as bound parameters.
+
+:func:`answer_structured` returns None whenever it cannot answer exactly
+(unknown product, no matching rows, unsupported condition), and the
+caller falls back to graph traversal.
+"""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Any, Optional
+
+from sqlalchemy import and_, extract, func, or_, select
+from sqlalchemy.orm import Session
+
+from tiger_etf.catalog import get_catalog
+from tiger_etf.config import settings
+from tiger_etf.db import get_reader_session
+from tiger_etf.graphrag.intent import KEYWORDS, RANKABLE, Intent, IntentResult
+from tiger_etf.models import EtfDistribution, EtfHolding, EtfPerformance, EtfProduct
+
+logger = logging.getLogger(__name__)
+
+SOURCE_NOTE = "(출처: RDB etf_products 기준)"
+
+# Holdings / distributions listed per product
+_TOP_HOLDINGS = 10
+_RECENT_DISTRIBUTIONS = 5
+
+_LABELS = {
+    "total_expense_ratio": "총보수",
+    "aum": "순자산총액(AUM)",
+    "nav": "기준가(NAV)",
+    "market_price": "시장가격",
+    "listing_date": "상장일",
+    "currency_hedge": "환헤지",
+    "benchmark_index": "벤치마크 지수",
+    "ticker": "티커",
+    "category": "분류",
+    "creation_unit": "설정단위(CU)",
+    "shares_outstanding": "상장주식수",
+}
+
+_RETURNS = (
+    ("return_1m", "1개월"), ("return_3m", "3개월"), ("return_6m", "6개월"),
+    ("return_1y", "1년"), ("return_3y", "3년"), ("return_ytd", "연초이후"),
+)
+
+def _number(value: Any, digits: int = 2) -> str:
+    text = f"{float(value):,.{digits}f}"
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def _format(attr: str, product: EtfProduct) -> str:
+    if attr == "category":
+        value = " / ".join(c for c in (product.category_l1, product.category_l2) if c)
+    else:
+        value = getattr(product, attr)
+    return _format_value(attr, value)
+
+
+def _format_value(attr: str, value: Any) -> str:
+    if value is None or value == "":
+        return "정보 없음"
+    if attr == "total_expense_ratio":
+        return f"{_number(value, 4)}%"
+    if attr == "aum":
+        return f"{_number(value)}억원"
+    if attr in ("nav", "market_price"):
+        return f"{_number(value)}원"
+    if attr == "currency_hedge":
+        return "예 (환헤지)" if value else "아니오 (환노출)"
+    if isinstance(value, (int, float, Decimal)):
+        return _number(value, 0)
+    return str(value)
+
+
+def _label(product: EtfProduct) -> str:
+    return f"{product.name_ko} ({product.ticker})"
+
+
+def _keyword_condition(keyword: str):
+    columns = (
+        EtfProduct.name_ko, EtfProduct.category_l1,
+        EtfProduct.category_l2, EtfProduct.benchmark_index,
+    )
+    words = KEYWORDS.get(keyword, (keyword,))
+    return or_(*(col.ilike(f"%{w}%") for col in columns for w in words))
+
+
+# ---------------------------------------------------------------------------
+# Product resolution
+# ---------------------------------------------------------------------------
+
+def resolve_products(
+    session: Session, mentions: tuple[str, ...], tickers: tuple[str, ...] = (),
+) -> Optional[list[EtfProduct]]:
+    """Products named in the question, or None if any mention is unknown.
+
+    Mentions are resolved in memory by the product catalog: the longest
+    word prefix that equals a name, ignoring case and spaces ("tiger
+    미국s&p500 상장일" -> "TIGER 미국S&P500"), else a clear fuzzy match.
+    Only the matched rows are read.
+    """
+    catalog = get_catalog()
+    entries = [catalog.resolve(m) for m in mentions] + [catalog.by_ticker(t) for t in tickers]
+    if not entries or None in entries:
+        return None
+    codes = list(dict.fromkeys(e.ksd_fund_code for e in entries))
+    rows = session.execute(
+        select(EtfProduct).where(EtfProduct.ksd_fund_code.in_(codes))
+    ).scalars()
+    by_code = {p.ksd_fund_code: p for p in rows}
+    if len(by_code) != len(codes):
+        return None
+    return [by_code[code] for code in codes]
+
+
+# ---------------------------------------------------------------------------
+# Related tables
+# ---------------------------------------------------------------------------
+
+def _holdings(session: Session, code: str, limit: int) -> list[EtfHolding]:
+    latest = (
+        select(func.max(EtfHolding.as_of_date))
+        .where(EtfHolding.ksd_fund_code == code)
+        .scalar_subquery()
+    )
+    return list(session.execute(
+        select(EtfHolding)
+        .where(EtfHolding.ksd_fund_code == code, EtfHolding.as_of_date == latest)
+        .order_by(EtfHolding.weight_pct.desc())
+        .limit(limit)
+    ).scalars())
+
+
+def _distributions(
+    session: Session, code: str, year: Optional[int], month: Optional[int],
+) -> list[EtfDistribution]:
+    query = select(EtfDistribution).where(EtfDistribution.ksd_fund_code == code)
+    if year:
+        query = query.where(extract("year", EtfDistribution.record_date) == year)
+    if month:
+        query = query.where(extract("month", EtfDistribution.record_date) == month)
+    query = query.order_by(EtfDistribution.record_date.desc()).limit(_RECENT_DISTRIBUTIONS)
+    return list(session.execute(query).scalars())
+
+
+def _performance(session: Session, code: str) -> Optional[EtfPerformance]:
+    return session.execute(
+        select(EtfPerformance)
+        .where(EtfPerformance.ksd_fund_code == code)
+        .order_by(EtfPerformance.as_of_date.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def _related_lines(
+    session: Session, attr: str, product: EtfProduct, intent: IntentResult,
+) -> Optional[list[str]]:
+    """Lines for holdings / distributions / performance (None: no exact answer)."""
+    code = product.ksd_fund_code
+    if attr == "holdings":
+        rows = _holdings(session, code, intent.limit or _TOP_HOLDINGS)
+        if not rows:
+            return ["  - 보유종목: 정보 없음"]
+        lines = [f"  - 보유종목 ({rows[0].as_of_date} 기준, 비중 순):"]
+        for h in rows:
+            weight = f"{_number(h.weight_pct)}%" if h.weight_pct is not None else "N/A"
+            lines.append(f"    - {h.holding_name} ({weight})")
+        return lines
+    if attr == "distributions":
+        rows = _distributions(session, code, intent.year, intent.month)
+        if not rows:
+            # A specific period with no record is left to the graph channel
+            return None if intent.year or intent.month else ["  - 분배금: 지급 기록 없음"]
+        lines = ["  - 분배금 (기준일: 주당 금액):"]
+        for d in rows:
+            amount = f"{_number(d.amount_per_share)}원" if d.amount_per_share is not None else "N/A"
+            lines.append(f"    - {d.record_date}: {amount}")
+        return lines
+    if attr == "performance":
+        perf = _performance(session, code)
+        if perf is None:
+            return None
+        returns = ", ".join(
+            f"{label} {_number(getattr(perf, col))}%"
+            for col, label in _RETURNS if getattr(perf, col) is not None
+        )
+        return [f"  - 수익률 ({perf.as_of_date} 기준): {returns or '정보 없음'}"]
+    return [f"  - {_LABELS[attr]}: {_format(attr, product)}"]
+
+
+# ---------------------------------------------------------------------------
+# Intents
+# ---------------------------------------------------------------------------
+
+def _answer_attribute(session: Session, intent: IntentResult) -> Optional[str]:
+    products = resolve_products(session, intent.products, intent.tickers)
+    if not products:
+        return None
+    lines: list[str] = []
+    for product in products:
+        lines.append(_label(product))
+        for attr in intent.attributes:
+            attr_lines = _related_lines(session, attr, product, intent)
+            if attr_lines is None:
+                return None
+            lines.extend(attr_lines)
+    return "\n".join(lines)
+
+
+def _filtered(intent: IntentResult):
+    query = select(EtfProduct).where(EtfProduct.is_active.is_(True))
+    conditions = [_keyword_condition(k) for k in intent.keywords]
+    if intent.year and "listing_date" in intent.attributes:
+        conditions.append(extract("year", EtfProduct.listing_date) == intent.year)
+    if "distributions" in intent.attributes:
+        conditions.append(EtfProduct.distributions.any())
+    return query.where(and_(*conditions)) if conditions else query, bool(conditions)
+
+
+def _answer_filter(session: Session, intent: IntentResult) -> Optional[str]:
+    query, conditioned = _filtered(intent)
+    rank_by = next((a for a in intent.attributes if a in RANKABLE), None)
+    if intent.order and rank_by is None:
+        return None
+    if not conditioned and not intent.order:
+        return None
+    limit = min(intent.limit or settings.graphrag_router_max_rows, settings.graphrag_router_max_rows)
+
+    column = getattr(EtfProduct, rank_by) if rank_by else EtfProduct.name_ko
+    ranked = query.where(column.is_not(None))
+    sections: list[tuple[str, list[EtfProduct]]] = []
+    if intent.order in ("asc", "both"):
+        sections.append(("낮은 순", list(session.execute(ranked.order_by(column.asc()).limit(limit)).scalars())))
+    if intent.order in ("desc", "both"):
+        sections.append(("높은 순", list(session.execute(ranked.order_by(column.desc()).limit(limit)).scalars())))
+    if not intent.order:
+        sections.append(("", list(session.execute(query.order_by(EtfProduct.name_ko).limit(limit)).scalars())))
+    if not any(rows for _, rows in sections):
+        return None
+    hidden = 0
+    if not intent.order and len(sections[0][1]) == limit:
+        total = session.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+        hidden = total - limit
+
+    shown = [a for a in intent.attributes if a in _LABELS]
+    lines: list[str] = []
+    for title, rows in sections:
+        if title and rank_by:
+            lines.append(f"[{_LABELS[rank_by]} {title}]")
+        for product in rows:
+            values = ", ".join(f"{_LABELS[a]} {_format(a, product)}" for a in shown)
+            lines.append(f"- {_label(product)}" + (f": {values}" if values else ""))
+            if "distributions" in intent.attributes:
+                dists = _distributions(session, product.ksd_fund_code, None, None)[:1]
+                for d in dists:
+                    lines.append(f"    - 최근 분배금 {d.record_date}: {_number(d.amount_per_share or 0)}원")
+    if hidden:
+        lines.append(f"- ... 외 {hidden}개")
+    return "\n".join(lines)
+
+
+def _answer_aggregate(session: Session, intent: IntentResult) -> Optional[str]:
+    # Aggregates run over the catalog; a named product is not a catalog filter
+    if intent.products or intent.tickers:
+        return None
+    active = EtfProduct.is_active.is_(True)
+    if intent.group_by_category:
+        query, _ = _filtered(intent)
+        sub = query.subquery()
+        rows = session.execute(
+            select(sub.c.category_l1, sub.c.category_l2, func.count())
+            .group_by(sub.c.category_l1, sub.c.category_l2)
+            .order_by(func.count().desc(), sub.c.category_l1, sub.c.category_l2)
+        ).all()
+        if not rows:
+            return None
+        lines = ["분류별 상품 수:"]
+        for l1, l2, n in rows:
+            label = " / ".join(c for c in (l1, l2) if c) or "미분류"
+            lines.append(f"- {label}: {n}개")
+        return "\n".join(lines)
+
+    if intent.average:
+        attr = next((a for a in intent.attributes if a in RANKABLE and a != "listing_date"), None)
+        if attr is None:
+            return None
+        query, _ = _filtered(intent)
+        sub = query.subquery()
+        avg, n = session.execute(
+            select(func.avg(getattr(sub.c, attr)), func.count(getattr(sub.c, attr)))
+        ).one()
+        if not n:
+            return None
+        return f"평균 {_LABELS[attr]}: {_format_value(attr, avg)} (상품 {n}개 기준)"
+
+    if len(intent.keywords) > 1:
+        counts = []
+        for keyword in intent.keywords:
+            n = session.execute(
+                select(func.count()).select_from(EtfProduct)
+                .where(active, _keyword_condition(keyword))
+            ).scalar_one()
+            counts.append((keyword, n))
+        total = sum(n for _, n in counts)
+        if not total:
+            return None
+        return "\n".join(f"- {k}: {n}개 ({n / total:.0%})" for k, n in counts)
+
+    query, _ = _filtered(intent)
+    products = list(session.execute(query.order_by(EtfProduct.name_ko)).scalars())
+    if not products:
+        return None
+    lines = [f"총 {len(products)}개"]
+    limit = settings.graphrag_router_max_rows
+    lines.extend(f"- {_label(p)}" for p in products[:limit])
+    if len(products) > limit:
+        lines.append(f"- ... 외 {len(products) - limit}개")
+    return "\n".join(lines)
+
+
+_ANSWERERS = {
+    Intent.ATTRIBUTE: _answer_attribute,
+    Intent.FILTER: _answer_filter,
+    Intent.AGGREGATE: _answer_aggregate,
+}
+
+
+def answer_structured(intent: IntentResult) -> Optional[str]:
+    """Answer a structured-intent question from the RDB, or None to fall back."""
+    answerer = _ANSWERERS.get(intent.intent)
+    if answerer is None:
+        return None
+    try:
+        with get_reader_session() as session:
+            answer = answerer(session, intent)
+    except Exception:
+        logger.warning("RDB query failed; falling back to graph traversal", exc_info=True)
+        return None
+    return f"{answer}\n\n{SOURCE_NOTE}" if answer else None
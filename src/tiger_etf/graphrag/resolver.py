@@ -0,0 +1,483 @@
+"""Offline entity resolution over the extracted graph.
+
+Extraction runs per chunk, so one real-world entity often ends up as
+several ``__Entity__`` nodes ("미래에셋자산운용" / "Mirae Asset",
+"TIGER 미국S&P500" / "미래에셋TIGER미국S&P500증권상장지수투자신탁(주식)").
+:func:`resolve_entities` pulls entity nodes in pages and merges duplicates,
+following experiments/ENTITY_RESOLUTION_GUIDE.md (high-confidence stages
+first, never across entity classes):
+
+1. ``rdb``: ETF entities are anchored to an ``etf_products`` row through the
+   product catalog (ticker, name without the legal suffix / AMC prefix, or
+   a clear fuzzy match).
+2. ``rule``: other entities are blocked by a normalized key (case, width,
+   spacing, corporate suffixes) and the :data:`ALIASES` table.
+3. ``similarity``: remaining groups are compared only with groups sharing
+   a character bigram (n-gram blocking instead of all pairs) and merged when
+   their Dice similarity reaches the threshold and their numbers and
+   parenthesized markers ("(H)", "200") agree.
+
+Every edge of a duplicate, of any type and in either direction, is moved
+onto the kept node with ``MERGE`` (so duplicate edges collapse) before the
+duplicate is deleted, in batched ``UNWIND`` writes.  A run is safe to repeat after an interruption.
+Node / edge counts before and after are reported, and every merge is
+written to ``data/graphrag/resolve_<timestamp>.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from tiger_etf.config import settings
+
+logger = logging.getLogger(__name__)
+
+Runner = Callable[..., list]
+
+# Entity classes anchored to etf_products (see indexer.ETF_ENTITY_CLASSIFICATIONS)
+PRODUCT_CLASSES = ("etf",)
+
+# canonical name -> other names for the same entity (compared by entity_key)
+ALIASES: dict[str, tuple[str, ...]] = {
+    "미래에셋자산운용": (
+        "Mirae Asset", "Mirae Asset Global Investments", "Mirae Asset Global Investments Co., Ltd.",
+        "Miraeasset", "미래에셋운용", "미래에셋자산운용사",
+    ),
+    "한국거래소": ("KRX", "Korea Exchange", "한국증권선물거래소"),
+    "금융위원회": ("금융위", "FSC", "Financial Services Commission"),
+    "금융감독원": ("금감원", "FSS", "Financial Supervisory Service"),
+    "자본시장과 금융투자업에 관한 법률": ("자본시장법", "자통법", "Financial Investment Services and Capital Markets Act"),
+    "금융소비자 보호에 관한 법률": ("금소법",),
+    "S&P 500": ("S&P500 지수", "S&P 500 Index", "S&P500 Index"),
+    "KOSPI 200": ("코스피200", "코스피 200", "KOSPI200 지수"),
+    "NASDAQ-100": ("나스닥100", "나스닥 100", "NASDAQ-100 Index", "Nasdaq 100 Index"),
+    "미국": ("US", "USA", "United States", "미합중국"),
+}
+
+_CORPORATE_RE = re.compile(
+    r"\(주\)|주식회사|\b(?:co\.?,?\s*ltd|inc|corp|corporation|llc|limited)\b\.?"
+)
+_KEY_DROP_RE = re.compile(r"[\s.,·'\"\-_/]")
+_FUND_SUFFIX_RE = re.compile(r"(?:증권)?(?:상장지수)?투자신탁(?:\s*\([^)]*\))*$")
+_PRODUCT_TAIL_RE = re.compile(r"\s*(?:etf|상장지수펀드)$")
+_AMC_PREFIX_RE = re.compile(r"^미래에셋\s*")
+_TICKER_RE = re.compile(r"^\(?(\d{6}|\d{4}[A-Z]\d)\)?$|\((\d{6}|\d{4}[A-Z]\d)\)")
+_NUMBER_RE = re.compile(r"\d+")
+_MARKER_RE = re.compile(r"\(([^)]*)\)")
+
+# Bigrams shared by more groups than this are too common to block on
+_MAX_BLOCK = 200
+
+_PAGE_QUERY = (
+    "MATCH (e:`__Entity__`) WHERE id(e) > $after "
+    "RETURN id(e) AS id, e.value AS value, e.class AS class "
+    "ORDER BY id(e) LIMIT $limit"
+)
+_COUNT_NODES = "MATCH (n) RETURN count(n) AS cnt"
+_COUNT_EDGES = "MATCH ()-[r]->() RETURN count(r) AS cnt"
+
+# Relationship types on the duplicates of a batch, per direction
+_EDGE_TYPES_OUT = (
+    "UNWIND $params AS p "
+    "MATCH (dup:`__Entity__`)-[r]->() WHERE id(dup) = p.dup "
+    "RETURN DISTINCT type(r) AS type"
+)
+_EDGE_TYPES_IN = (
+    "UNWIND $params AS p "
+    "MATCH ()-[r]->(dup:`__Entity__`) WHERE id(dup) = p.dup "
+    "RETURN DISTINCT type(r) AS type"
+)
+_DELETE_DUPS = (
+    "UNWIND $params AS p "
+    "MATCH (dup:`__Entity__`) WHERE id(dup) = p.dup "
+    "DETACH DELETE dup"
+)
+
+
+def _move_edges(rel: str, outgoing: bool) -> str:
+    """Re-point ``rel`` edges of the duplicate onto the kept node.
+
+    Edges between ``dup`` and ``keep`` (and ``dup`` self loops) would become
+    self loops on ``keep`` and are dropped.  ``__RELATION__`` edges are keyed
+    by ``value`` and their ``count`` summed; other types keep one edge per
+    endpoint pair, copying the duplicate's properties when it is new.
+    """
+    if rel == "__RELATION__":
+        key = " {value: r.value}"
+        on_set = (
+            "ON CREATE SET r2.count = r.count "
+            "ON MATCH SET r2.count = coalesce(r2.count, 0) + coalesce(r.count, 0)"
+        )
+    else:
+        key = ""
+        on_set = "ON CREATE SET r2 += properties(r)"
+    rel = rel.replace("`", "``")
+    if outgoing:
+        match, merge = f"(dup:`__Entity__`)-[r:`{rel}`]->(t)", f"(keep)-[r2:`{rel}`{key}]->(t)"
+    else:
+        match, merge = f"(t)-[r:`{rel}`]->(dup:`__Entity__`)", f"(t)-[r2:`{rel}`{key}]->(keep)"
+    return (
+        "UNWIND $params AS p "
+        f"MATCH {match} WHERE id(dup) = p.dup AND id(t) <> p.keep AND id(t) <> p.dup "
+        "MATCH (keep:`__Entity__`) WHERE id(keep) = p.keep "
+        f"MERGE {merge} {on_set}"
+    )
+
+
+@dataclass(frozen=True)
+class Entity:
+    id: str
+    value: str
+    cls: str = ""
+
+
+@dataclass(frozen=True)
+class Merge:
+    """``dup`` is folded into ``keep``; ``stage`` is rdb / rule / similarity."""
+
+    keep: str
+    dup: str
+    stage: str
+    keep_value: str
+    dup_value: str
+
+
+@dataclass
+class ResolveReport:
+    entities: int = 0
+    clusters: int = 0
+    merges: int = 0
+    by_stage: dict[str, int] = field(default_factory=dict)
+    nodes_before: int = 0
+    nodes_after: int = 0
+    edges_before: int = 0
+    edges_after: int = 0
+    seconds: float = 0.0
+    dry_run: bool = False
+    log_path: Optional[str] = None
+
+    @property
+    def nodes_removed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+    @property
+    def edges_removed(self) -> int:
+        return self.edges_before - self.edges_after
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+def _fold(value: str) -> str:
+    return unicodedata.normalize("NFKC", value).lower().strip()
+
+
+def _raw_key(value: str) -> str:
+    return _KEY_DROP_RE.sub("", _CORPORATE_RE.sub("", _fold(value)))
+
+
+_ALIAS_KEYS: dict[str, str] = {}
+_CANONICAL: dict[str, str] = {}
+for _canonical, _aliases in ALIASES.items():
+    _CANONICAL[_raw_key(_canonical)] = _canonical
+    for _alias in _aliases:
+        _ALIAS_KEYS[_raw_key(_alias)] = _raw_key(_canonical)
+
+
+def entity_key(value: str) -> str:
+    """Blocking key: folded, without spacing, punctuation and corporate suffixes."""
+    key = _raw_key(value)
+    return _ALIAS_KEYS.get(key, key)
+
+
+def product_name(value: str) -> str:
+    """ETF name without the legal fund suffix, AMC prefix and "ETF" tail."""
+    name = _fold(value)
+    name = _FUND_SUFFIX_RE.sub("", name).strip()
+    name = _AMC_PREFIX_RE.sub("", name)
+    return _PRODUCT_TAIL_RE.sub("", name).strip()
+
+
+def _compatible(a: str, b: str) -> bool:
+    """Same numbers and parenthesized markers ("TIGER 200" != "TIGER 200(H)")."""
+    a, b = _fold(a), _fold(b)
+    return (
+        _NUMBER_RE.findall(a) == _NUMBER_RE.findall(b)
+        and [m.strip() for m in _MARKER_RE.findall(a)] == [m.strip() for m in _MARKER_RE.findall(b)]
+    )
+
+
+def _grams(key: str) -> set[str]:
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def anchor_product(value: str, catalog: Any) -> Any:
+    """Catalog entry an ETF entity names, or None."""
+    ticker = _TICKER_RE.search(value.strip().upper())
+    if ticker:
+        entry = catalog.by_ticker(ticker.group(1) or ticker.group(2))
+        if entry is not None:
+            return entry
+    name = product_name(value)
+    entry = catalog.by_name(name)
+    if entry is None:
+        entry = catalog.match(name)
+        if entry is not None and not _compatible(product_name(entry.name_ko), name):
+            entry = None
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def plan_merges(
+    entities: list[Entity],
+    catalog: Any = None,
+    similarity_threshold: Optional[float] = None,
+) -> tuple[list[Merge], int]:
+    """Merges that fold every duplicate into one kept entity per cluster.
+
+    Returns ``(merges, clusters)`` where ``clusters`` counts groups of two or
+    more entities.  ``similarity_threshold`` 0 disables the similarity stage.
+    """
+    if similarity_threshold is None:
+        similarity_threshold = settings.graphrag_resolve_similarity_threshold
+    uf = _UnionFind(len(entities))
+    blocks: dict[tuple[str, ...], list[int]] = defaultdict(list)
+    canonical: dict[tuple[str, ...], str] = {}
+
+    for i, e in enumerate(entities):
+        cls = _fold(e.cls or "")
+        entry = anchor_product(e.value, catalog) if catalog is not None and cls in PRODUCT_CLASSES else None
+        if entry is not None:
+            block = ("rdb", cls, entry.ksd_fund_code)
+            canonical[block] = entry.name_ko
+        else:
+            key = entity_key(product_name(e.value) if cls in PRODUCT_CLASSES else e.value)
+            # Entities without a usable name are never merged
+            block = ("rule", cls, key) if key else ("none", e.id)
+            if key in _CANONICAL:
+                canonical[block] = _CANONICAL[key]
+        blocks[block].append(i)
+
+    for members in blocks.values():
+        for j in members[1:]:
+            uf.union(members[0], j)
+
+    similar: set[int] = set()
+    if similarity_threshold > 0:
+        similar = _similarity_unions(entities, blocks, uf, similarity_threshold)
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    block_of: dict[int, tuple[str, ...]] = {}
+    for block, members in blocks.items():
+        for i in members:
+            clusters[uf.find(i)].append(i)
+            block_of[i] = block
+
+    merges: list[Merge] = []
+    multi = 0
+    for root, members in clusters.items():
+        if len(members) < 2:
+            continue
+        multi += 1
+        names = [canonical[block_of[i]] for i in members if block_of[i] in canonical]
+        target = names[0] if names else None
+
+        def rank(i: int) -> tuple:
+            value = entities[i].value
+            exact = target is not None and entity_key(value) == entity_key(target)
+            return (not exact, len(value), entities[i].id)
+
+        keep = min(members, key=rank)
+        if any(block_of[i][0] == "rdb" for i in members):
+            stage = "rdb"
+        elif root in similar:
+            stage = "similarity"
+        else:
+            stage = "rule"
+        for i in sorted(members):
+            if i != keep:
+                merges.append(Merge(
+                    keep=entities[keep].id, dup=entities[i].id, stage=stage,
+                    keep_value=entities[keep].value, dup_value=entities[i].value,
+                ))
+    return merges, multi
+
+
+def _similarity_unions(
+    entities: list[Entity],
+    blocks: dict[tuple[str, ...], list[int]],
+    uf: _UnionFind,
+    threshold: float,
+) -> set[int]:
+    """Union rule groups of a class whose keys are similar; return their roots."""
+    reps = [(block, members[0]) for block, members in blocks.items() if block[0] == "rule"]
+    by_class: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    for (_, cls, key), i in reps:
+        by_class[cls].append((key, i))
+
+    joined: list[int] = []
+    for groups in by_class.values():
+        grams = [_grams(key) for key, _ in groups]
+        postings: dict[str, list[int]] = defaultdict(list)
+        for g, gs in enumerate(grams):
+            for gram in gs:
+                postings[gram].append(g)
+        for g, gs in enumerate(grams):
+            shared: Counter[int] = Counter()
+            for gram in gs:
+                posting = postings[gram]
+                if len(posting) <= _MAX_BLOCK:
+                    shared.update(h for h in posting if h > g)
+            for h, n in shared.items():
+                if 2 * n / (len(gs) + len(grams[h])) < threshold:
+                    continue
+                a, b = entities[groups[g][1]].value, entities[groups[h][1]].value
+                if _compatible(a, b):
+                    uf.union(groups[g][1], groups[h][1])
+                    joined.append(groups[g][1])
+    return {uf.find(i) for i in joined}
+
+
+# ---------------------------------------------------------------------------
+# Graph access
+# ---------------------------------------------------------------------------
+
+def iter_entities(run: Runner, page_size: Optional[int] = None) -> Iterator[Entity]:
+    """All ``__Entity__`` nodes, pulled in id order ``page_size`` at a time."""
+    page_size = page_size or settings.graphrag_resolve_page_size
+    after = ""
+    while True:
+        rows = run(_PAGE_QUERY, {"after": after, "limit": page_size})
+        for row in rows:
+            yield Entity(id=row["id"], value=row.get("value") or "", cls=row.get("class") or "")
+        if len(rows) < page_size:
+            return
+        after = rows[-1]["id"]
+
+
+def _count(run: Runner, cypher: str) -> int:
+    rows = run(cypher)
+    return int(rows[0]["cnt"]) if rows else 0
+
+
+def apply_merges(run: Runner, merges: list[Merge], batch_size: Optional[int] = None) -> None:
+    """Move edges onto kept nodes and delete duplicates, ``batch_size`` pairs per write.
+
+    Every edge of a duplicate, whatever its type and direction, is moved
+    before the duplicate is deleted, so no fact or relation is lost.
+    """
+    batch_size = batch_size or settings.graphrag_resolve_batch_size
+    start = time.monotonic()
+    for b in range(0, len(merges), batch_size):
+        params = [{"keep": m.keep, "dup": m.dup} for m in merges[b:b + batch_size]]
+        for types_query, outgoing in ((_EDGE_TYPES_OUT, True), (_EDGE_TYPES_IN, False)):
+            for rel in sorted({row["type"] for row in run(types_query, {"params": params})}):
+                run(_move_edges(rel, outgoing), {"params": params})
+        run(_DELETE_DUPS, {"params": params})
+        done = min(b + batch_size, len(merges))
+        logger.info(
+            "Merged %d/%d duplicate entities (%.1f merges/s)",
+            done, len(merges), done / max(time.monotonic() - start, 1e-9),
+        )
+
+
+def _write_log(report: ResolveReport, merges: list[Merge]) -> Path:
+    path = settings.graphrag_dir / f"resolve_{datetime.now():%Y%m%d_%H%M%S}.json"
+    payload = {"report": report.to_dict(), "merges": [asdict(m) for m in merges]}
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2))
+    return path
+
+
+def resolve_entities(
+    *,
+    dry_run: bool = False,
+    page_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    similarity_threshold: Optional[float] = None,
+    run: Optional[Runner] = None,
+    catalog: Any = None,
+) -> ResolveReport:
+    """Resolve duplicate entities in the writer graph store.
+
+    With ``dry_run`` the merges are planned and logged but not applied.
+    """
+    from tiger_etf.graphrag.query_cache import bump_graph_version
+
+    if run is None:
+        from tiger_etf.graphrag.query import _cypher_runner
+
+        run = _cypher_runner(settings.graph_store)
+    if catalog is None:
+        from tiger_etf.catalog import get_catalog
+
+        try:
+            catalog = get_catalog()
+        except Exception:
+            logger.warning("Product catalog unavailable; skipping RDB anchoring", exc_info=True)
+
+    start = time.monotonic()
+    report = ResolveReport(dry_run=dry_run)
+    report.nodes_before = _count(run, _COUNT_NODES)
+    report.edges_before = _count(run, _COUNT_EDGES)
+
+    entities = list(iter_entities(run, page_size))
+    merges, report.clusters = plan_merges(entities, catalog, similarity_threshold)
+    report.entities = len(entities)
+    report.merges = len(merges)
+    report.by_stage = dict(Counter(m.stage for m in merges))
+    logger.info(
+        "Planned %d merges in %d clusters over %d entities (%s)",
+        len(merges), report.clusters, len(entities), report.by_stage,
+    )
+
+    if dry_run or not merges:
+        report.nodes_after, report.edges_after = report.nodes_before, report.edges_before
+    else:
+        apply_merges(run, merges, batch_size)
+        bump_graph_version()
+        report.nodes_after = _count(run, _COUNT_NODES)
+        report.edges_after = _count(run, _COUNT_EDGES)
+
+    report.seconds = round(time.monotonic() - start, 2)
+    report.log_path = str(_write_log(report, merges))
+    logger.info(
+        "Entity resolution %s: nodes %d -> %d, edges %d -> %d in %.1fs",
+        "planned" if dry_run else "complete",
+        report.nodes_before, report.nodes_after, report.edges_before, report.edges_after,
+        report.seconds,
+    )
+    return report
@@ -0,0 +1,473 @@
+"""Auto-tuning of extraction and build worker counts.
+
+``experiment tune`` runs short indexing probes over a sample of documents,
+one per candidate setting of:
+
+- ``extraction_num_workers`` / ``extraction_num_threads_per_worker``:
+  concurrent extraction LLM calls, limited by Bedrock throttling
+- ``build_num_workers``: concurrent graph writers, limited by Neptune
+  write capacity
+
+Each probe is measured with :class:`BuildTelemetry` for docs/min and the
+throttle rate (throttled LLM attempts over all attempts).  The best setting
+is the fastest one whose throttle rate stays within ``max_throttle_rate``,
+and it is written to a config profile that ``CONFIG_PROFILE`` (or a
+``profile:`` key in config.yaml) merges over config.yaml.
+
+Telemetry only sees LLM calls made in the probing process.  With
+``extraction_num_workers`` > 1 the toolkit extracts in worker processes,
+so such live probes have no throttle data (``throttle_data`` is False)
+and never count as within the limit: an unobserved throttle rate of 0
+would otherwise favour exactly the settings the limit should reject.
+
+Probes run with the extraction caches disabled, so every probe really
+calls the LLM, and fresh extractions are not deterministic: each probe
+can add new facts and entities for the same documents.  Live probes
+therefore write to separate scratch stores (``graph_store`` /
+``vector_store``), or to the configured ones only when ``allow_live`` is
+set, and never bump the graph version, so cached query answers stay
+valid.  For offline runs and tests, :class:`StubIndex` replaces the
+toolkit with a simulated extraction LLM and graph store that throttle and
+slow down under load.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import yaml
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.prompts import PromptTemplate
+from llama_index.core.schema import Document
+from pydantic import PrivateAttr
+
+from tiger_etf.config import profile_path, settings
+from tiger_etf.graphrag.build_telemetry import BuildTelemetry, instrument_graph_writes
+
+logger = logging.getLogger(__name__)
+
+PARAMS = (
+    "extraction_num_workers",
+    "extraction_num_threads_per_worker",
+    "build_num_workers",
+)
+
+DEFAULT_GRID: dict[str, list[int]] = {
+    "extraction_num_workers": [1, 2],
+    "extraction_num_threads_per_worker": [4, 8, 16],
+    "build_num_workers": [1, 2, 4],
+}
+
+# Adaptive search: a doubling must beat the current best by this much
+_MIN_GAIN = 0.05
+_MAX_VALUE = 64
+
+
+@dataclass
+class TuneTrial:
+    """One indexing probe and what it measured."""
+
+    params: dict[str, int]
+    documents: int = 0
+    seconds: float = 0.0
+    docs_per_min: float = 0.0
+    llm_calls: int = 0
+    llm_errors: int = 0
+    throttles: int = 0
+    throttle_rate: float = 0.0
+    # False when extraction ran in worker processes the telemetry cannot see
+    throttle_data: bool = True
+    error: str = ""
+
+    def within(self, max_throttle_rate: float) -> bool:
+        return not self.error and self.throttle_data and self.throttle_rate <= max_throttle_rate
+
+
+def current_params() -> dict[str, int]:
+    """The worker counts currently configured."""
+    return {name: getattr(settings, f"graphrag_{name}") for name in PARAMS}
+
+
+@contextmanager
+def _overridden(params: dict[str, int]) -> Iterator[None]:
+    """Apply ``params`` to settings for one probe, with extraction caches off."""
+    overrides: dict[str, Any] = {f"graphrag_{k}": v for k, v in params.items()}
+    overrides["graphrag_enable_cache"] = False
+    overrides["graphrag_extraction_cache_enabled"] = False
+    saved = {k: getattr(settings, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(settings, k, v)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(settings, k, v)
+
+
+def _default_index_factory() -> Any:
+    from tiger_etf.graphrag.indexer import _make_index
+
+    return _make_index()
+
+
+def probe(
+    documents: list[Document],
+    params: dict[str, int],
+    index_factory: Optional[Callable[[], Any]] = None,
+) -> TuneTrial:
+    """Index ``documents`` once with ``params`` and measure throughput.
+
+    ``index_factory`` builds the index after the settings are applied
+    (default: the writer LexicalGraphIndex).  A failed probe is returned
+    with ``error`` set rather than raised.
+    """
+    from tiger_etf.graphrag.indexer import build_index
+
+    index_factory = index_factory or _default_index_factory
+    trial = TuneTrial(params=dict(params))
+    telemetry = BuildTelemetry()
+    with _overridden(params):
+        start = time.monotonic()
+        try:
+            graph_index = index_factory()
+            trial.throttle_data = (
+                settings.graphrag_extraction_num_workers <= 1
+                or getattr(graph_index, "in_process", False)
+            )
+            trial.documents = build_index(
+                documents, graph_index=graph_index,
+                batch_size=len(documents), telemetry=telemetry,
+                bump_version=False,
+            )
+        except Exception as e:
+            trial.error = str(e)
+        trial.seconds = round(time.monotonic() - start, 2)
+
+    extraction = telemetry.summary()["extraction"]
+    trial.llm_calls = extraction["llm_calls"]
+    trial.llm_errors = extraction["errors"]
+    trial.throttles = extraction["throttles"]
+    attempts = trial.llm_calls + trial.llm_errors
+    trial.throttle_rate = round(trial.throttles / attempts, 4) if attempts else 0.0
+    if trial.seconds > 0:
+        trial.docs_per_min = round(trial.documents / trial.seconds * 60, 2)
+    logger.info(
+        "Probe %s: %.1f docs/min, throttle rate %s%s",
+        params, trial.docs_per_min,
+        f"{trial.throttle_rate:.1%}" if trial.throttle_data else "n/a (multi-process extraction)",
+        f" (failed: {trial.error})" if trial.error else "",
+    )
+    return trial
+
+
+def best_trial(trials: list[TuneTrial], max_throttle_rate: float) -> Optional[TuneTrial]:
+    """Fastest trial within the throttle limit (None if none qualifies)."""
+    eligible = [t for t in trials if t.within(max_throttle_rate)]
+    return max(eligible, key=lambda t: t.docs_per_min, default=None)
+
+
+def grid_search(
+    documents: list[Document],
+    grid: Optional[dict[str, list[int]]] = None,
+    index_factory: Optional[Callable[[], Any]] = None,
+) -> list[TuneTrial]:
+    """Probe every combination in ``grid`` (default: :data:`DEFAULT_GRID`)."""
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    trials = []
+    for values in itertools.product(*(grid[name] for name in PARAMS)):
+        trials.append(probe(documents, dict(zip(PARAMS, values)), index_factory))
+    return trials
+
+
+def adaptive_search(
+    documents: list[Document],
+    start: Optional[dict[str, int]] = None,
+    max_throttle_rate: float = 0.05,
+    max_trials: int = 12,
+    index_factory: Optional[Callable[[], Any]] = None,
+) -> list[TuneTrial]:
+    """Coordinate ascent from ``start`` (default: the configured values).
+
+    Each parameter in turn is doubled while that raises docs/min by at
+    least 5% and keeps the throttle rate within ``max_throttle_rate``;
+    a setting that throttles too much ends the climb for that parameter.
+    At most ``max_trials`` probes are run.
+    """
+    current = dict(start or current_params())
+    trials = [probe(documents, current, index_factory)]
+    best = trials[0]
+    for name in PARAMS:
+        while len(trials) < max_trials and current[name] * 2 <= _MAX_VALUE:
+            candidate = {**current, name: current[name] * 2}
+            trial = probe(documents, candidate, index_factory)
+            trials.append(trial)
+            improved = (
+                not best.within(max_throttle_rate)
+                or trial.docs_per_min > best.docs_per_min * (1 + _MIN_GAIN)
+            )
+            if not trial.within(max_throttle_rate) or not improved:
+                break
+            current, best = candidate, trial
+    return trials
+
+
+@contextmanager
+def _probe_stores(graph_store: Optional[str], vector_store: Optional[str]) -> Iterator[None]:
+    """Point the writer store settings at the probe targets while tuning."""
+    overrides = {
+        k: v for k, v in (("graph_store", graph_store), ("vector_store", vector_store)) if v
+    }
+    saved = {k: getattr(settings, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(settings, k, v)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(settings, k, v)
+
+
+def _check_probe_stores(
+    graph_store: Optional[str], vector_store: Optional[str], allow_live: bool,
+) -> None:
+    if allow_live:
+        return
+    if not graph_store or not vector_store:
+        raise ValueError(
+            "Live probes write fresh extractions to the stores: give a scratch "
+            "graph_store and vector_store, or set allow_live to probe the configured ones."
+        )
+    if graph_store == settings.graph_store or vector_store == settings.vector_store:
+        raise ValueError(
+            "Probe stores must differ from the configured graph_store/vector_store "
+            "unless allow_live is set."
+        )
+
+
+def tune(
+    documents: list[Document],
+    strategy: str = "adaptive",
+    max_throttle_rate: float = 0.05,
+    grid: Optional[dict[str, list[int]]] = None,
+    start: Optional[dict[str, int]] = None,
+    max_trials: int = 12,
+    index_factory: Optional[Callable[[], Any]] = None,
+    *,
+    graph_store: Optional[str] = None,
+    vector_store: Optional[str] = None,
+    allow_live: bool = False,
+) -> tuple[Optional[TuneTrial], list[TuneTrial]]:
+    """Search worker counts with ``strategy`` ("grid" or "adaptive").
+
+    ``grid`` applies to the grid search, ``start`` and ``max_trials`` to
+    the adaptive one.  Without an ``index_factory`` the probes index into
+    ``graph_store`` / ``vector_store``, which must both be given and differ
+    from the configured stores unless ``allow_live`` is set (ValueError
+    otherwise).  Returns (best trial or None, all trials).
+    """
+    if not documents:
+        raise ValueError("No documents to probe with.")
+    if strategy not in ("grid", "adaptive"):
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if index_factory is None:
+        _check_probe_stores(graph_store, vector_store, allow_live)
+    with _probe_stores(graph_store, vector_store):
+        if strategy == "grid":
+            trials = grid_search(documents, grid, index_factory)
+        else:
+            trials = adaptive_search(
+                documents, start=start, max_throttle_rate=max_throttle_rate,
+                max_trials=max_trials, index_factory=index_factory,
+            )
+    return best_trial(trials, max_throttle_rate), trials
+
+
+def write_profile(
+    name: str,
+    best: TuneTrial,
+    trials: list[TuneTrial],
+    *,
+    strategy: str,
+    max_throttle_rate: float,
+    offline: bool = False,
+    graph_store: Optional[str] = None,
+) -> Path:
+    """Write the best worker counts to config profile ``name``.
+
+    The ``graphrag`` section is merged over config.yaml when the profile
+    is selected; ``tuning`` records how the values were found.
+    """
+    path = profile_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile = {
+        "graphrag": dict(best.params),
+        "tuning": {
+            "tuned_at": datetime.now().isoformat(timespec="seconds"),
+            "strategy": strategy,
+            "offline": offline,
+            "extraction_llm": settings.graphrag_extraction_llm,
+            "graph_store": "stub" if offline else graph_store or settings.graph_store,
+            "sample_documents": best.documents,
+            "max_throttle_rate": max_throttle_rate,
+            "best": {k: v for k, v in asdict(best).items() if k != "params"},
+            "trials": [asdict(t) for t in trials],
+        },
+    }
+    with open(path, "w") as f:
+        yaml.safe_dump(profile, f, allow_unicode=True, sort_keys=False)
+    logger.info("Tuned profile written to %s", path)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Offline stubs
+# ---------------------------------------------------------------------------
+
+_STUB_PROMPT = PromptTemplate("Extract propositions and entities from:\n{text}")
+
+
+class StubThrottlingError(Exception):
+    """Raised by :class:`StubExtractionLLM` like Bedrock's ThrottlingException."""
+
+    response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class StubExtractionLLM(CustomLLM):
+    """Extraction LLM stand-in with fixed latency and a concurrency limit.
+
+    A call made while ``capacity`` calls are already in flight is
+    rejected with :class:`StubThrottlingError`.
+    """
+
+    latency: float = 0.05
+    capacity: int = 8
+    _in_flight: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "StubExtractionLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(model_name="stub-extraction")
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise StubThrottlingError("Rate exceeded")
+            self._in_flight += 1
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        tokens = len(prompt) // 4
+        return CompletionResponse(
+            text="propositions",
+            raw={"usage": {"inputTokens": tokens, "outputTokens": tokens // 4}},
+        )
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponseGen:
+        yield self.complete(prompt, formatted=formatted, **kwargs)
+
+
+class StubGraphStore:
+    """Graph store stand-in whose writes slow down beyond ``capacity`` writers."""
+
+    def __init__(self, write_latency: float = 0.02, capacity: int = 4) -> None:
+        self.write_latency = write_latency
+        self.capacity = capacity
+        self.writes = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def execute_query(self, cypher: str, parameters: Any = None, **kwargs: Any) -> list:
+        with self._lock:
+            self._in_flight += 1
+            contention = max(1.0, self._in_flight / self.capacity)
+        try:
+            time.sleep(self.write_latency * contention)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.writes += 1
+        return []
+
+
+class StubIndex:
+    """``LexicalGraphIndex`` stand-in for offline tuning.
+
+    ``extract_and_build`` splits documents into chunks, extracts them with
+    ``extraction_num_workers * extraction_num_threads_per_worker`` threads
+    (retrying throttled calls with exponential backoff) and writes chunk
+    nodes and edges with ``build_num_workers`` threads.
+    """
+
+    # Extraction workers are threads here, so telemetry sees every LLM call
+    in_process = True
+
+    def __init__(
+        self,
+        llm: Optional[StubExtractionLLM] = None,
+        graph_store: Optional[StubGraphStore] = None,
+        *,
+        chunk_size: int = 1000,
+        max_retries: int = 5,
+    ) -> None:
+        self.llm = llm or StubExtractionLLM()
+        self.graph_store = instrument_graph_writes(graph_store or StubGraphStore())
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.extraction_threads = (
+            settings.graphrag_extraction_num_workers
+            * settings.graphrag_extraction_num_threads_per_worker
+        )
+        self.build_workers = settings.graphrag_build_num_workers
+
+    def _extract(self, chunk: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.llm.predict(_STUB_PROMPT, text=chunk)
+            except StubThrottlingError:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(0.01 * 2 ** attempt)
+        raise AssertionError("unreachable")
+
+    def _write(self, doc_chunks: list[str]) -> None:
+        self.graph_store.execute_query(
+            "UNWIND $params AS params MERGE (c:`__Chunk__` {chunkId: params.chunk_id})",
+            {"params": [{"chunk_id": i} for i in range(len(doc_chunks))]},
+        )
+        self.graph_store.execute_query(
+            "UNWIND $params AS params MATCH (c), (e) MERGE (c)-[:`__MENTIONS__`]->(e)",
+            {"params": [{} for _ in doc_chunks]},
+        )
+
+    def extract_and_build(self, documents: list[Document], show_progress: bool = False) -> None:
+        chunked = [
+            [d.text[i:i + self.chunk_size] for i in range(0, len(d.text), self.chunk_size)] or [""]
+            for d in documents
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, self.extraction_threads)) as pool:
+            list(pool.map(self._extract, [c for chunks in chunked for c in chunks]))
+        with ThreadPoolExecutor(max_workers=max(1, self.build_workers)) as pool:
+            list(pool.map(self._write, chunked))
@@ -0,0 +1,122 @@
+"""Vector index maintenance on OpenSearch Serverless.
+
+The graphrag toolkit keeps embeddings in the ``chunk`` and ``statement``
+indexes.  :func:`reset_vector_indexes` deletes them concurrently through
+the pooled client from :mod:`tiger_etf.graphrag.aws_clients`; with
+``recreate`` each index is created again from the mappings and settings it
+had before the delete, so the next build writes into a ready (empty) index
+with the same k-NN field definitions.  :func:`vector_index_counts` backs
+``graphrag status``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from tiger_etf.config import settings
+from tiger_etf.graphrag.aws_clients import get_opensearch_client
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEXES = ("chunk", "statement")
+
+# Index settings OpenSearch reports but rejects on create
+_READ_ONLY_SETTINGS = frozenset({
+    "uuid", "creation_date", "provided_name", "version", "routing", "resize", "blocks",
+})
+
+
+def _not_found(e: Exception) -> bool:
+    return getattr(e, "status_code", None) == 404 or "index_not_found" in str(e).lower()
+
+
+def _index_count(client: Any, name: str) -> Optional[int]:
+    """Document count of ``name``, or None if the index does not exist."""
+    try:
+        return int(client.count(index=name).get("count", 0))
+    except Exception as e:
+        if _not_found(e):
+            return None
+        raise
+
+
+def _index_definition(client: Any, name: str) -> dict:
+    """``indices.create`` body reproducing the mappings and settings of ``name``."""
+    body = client.indices.get(index=name)[name]
+    index_settings = body.get("settings", {}).get("index", {})
+    return {
+        "mappings": body.get("mappings", {}),
+        "settings": {"index": {
+            k: v for k, v in index_settings.items() if k not in _READ_ONLY_SETTINGS
+        }},
+    }
+
+
+@dataclass
+class VectorResetReport:
+    # index -> documents it held (missing indexes are left out)
+    deleted: dict[str, int] = field(default_factory=dict)
+    recreated: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.deleted.values())
+
+
+def _reset_index(client: Any, name: str, recreate: bool) -> Optional[int]:
+    count = _index_count(client, name)
+    if count is None:
+        logger.info("Vector index '%s' does not exist, skipping.", name)
+        return None
+    definition = _index_definition(client, name) if recreate else None
+    try:
+        client.indices.delete(index=name)
+    except Exception as e:
+        if not _not_found(e):
+            raise
+    logger.info("Deleted vector index '%s' (%d documents).", name, count)
+    if definition is not None:
+        client.indices.create(index=name, body=definition)
+        logger.info("Recreated vector index '%s'.", name)
+    return count
+
+
+def reset_vector_indexes(
+    *,
+    recreate: bool = False,
+    indexes: Sequence[str] = VECTOR_INDEXES,
+    concurrency: Optional[int] = None,
+    client: Any = None,
+) -> VectorResetReport:
+    """Delete ``indexes`` concurrently (recreating them empty if ``recreate``)."""
+    client = client or get_opensearch_client()
+    workers = max(1, min(concurrency or settings.graphrag_vector_delete_concurrency, len(indexes)))
+    start = time.monotonic()
+    report = VectorResetReport()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(_reset_index, client, name, recreate) for name in indexes}
+        for name, future in futures.items():
+            count = future.result()
+            if count is not None:
+                report.deleted[name] = count
+                if recreate:
+                    report.recreated.append(name)
+    report.seconds = time.monotonic() - start
+    logger.info(
+        "Vector reset complete. Deleted %d documents in %d indexes (%.1fs).",
+        report.total, len(report.deleted), report.seconds,
+    )
+    return report
+
+
+def vector_index_counts(
+    indexes: Sequence[str] = VECTOR_INDEXES, client: Any = None,
+) -> dict[str, Optional[int]]:
+    """Document count per vector index (None for a missing index)."""
+    client = client or get_opensearch_client()
+    return {name: _index_count(client, name) for name in indexes}
@@ -142,6 +142,9 @@ class EtfDocument(Base):
     local_path: Mapped[Optional[str]] = mapped_column(Text)
     file_hash: Mapped[Optional[str]] = mapped_column(String(64))
     file_size_bytes: Mapped[Optional[int]] = mapped_column(Integer)
+    # HTTP validators of the downloaded copy, compared on the next scrape
+    etag: Mapped[Optional[str]] = mapped_column(Text)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64))
     published_date: Mapped[Optional[date]] = mapped_column(Date)
     downloaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
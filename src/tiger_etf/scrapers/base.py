@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable, Sequence, TypeVar
 
 import httpx
 from tenacity import (
@@ -12,27 +14,88 @@ from tenacity import (
 )
 
 from tiger_etf.config import settings
-from tiger_etf.db import get_session
+from tiger_etf.db import bulk_upsert, get_session
 from tiger_etf.models import ScrapeRun
+from tiger_etf.scrapers.http_cache import HttpCache
 from tiger_etf.utils.logging_config import get_logger
 
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter shared by all in-flight requests.
+
+    Tokens refill at ``rate`` per second up to ``capacity``; each request
+    consumes one.  With ``capacity=1`` requests are spaced at least
+    ``1 / rate`` seconds apart no matter how many are in flight.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float, capacity: float = 1.0) -> "TokenBucket":
+        """Build a limiter that allows one request every ``delay`` seconds."""
+        return cls(rate=1.0 / delay if delay > 0 else float("inf"), capacity=capacity)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 
 class BaseScraper:
     name: str = "base"
 
-    def __init__(self) -> None:
+    def __init__(self, concurrency: int | None = None, use_cache: bool | None = None) -> None:
         self.log = get_logger(f"scraper.{self.name}")
-        self.client = httpx.Client(
-            base_url=settings.base_url,
-            timeout=60.0,
-            headers={
+        self.concurrency = max(1, concurrency or settings.scraper_concurrency)
+        if use_cache is None:
+            use_cache = settings.http_cache_enabled
+        self._use_cache = use_cache
+        self._cache: HttpCache | None = None
+        self.client = httpx.Client(**self._client_kwargs())
+        self.aclient: httpx.AsyncClient | None = None
+        self._limiter: TokenBucket | None = None
+        self._last_request_time: float = 0.0
+
+    @property
+    def cache(self) -> HttpCache | None:
+        """The HTTP cache, opened on first use (None when caching is off)."""
+        if self._cache is None and self._use_cache:
+            self._cache = HttpCache()
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: HttpCache | None) -> None:
+        self._cache = cache
+        self._use_cache = cache is not None
+
+    @staticmethod
+    def _client_kwargs() -> dict[str, Any]:
+        return {
+            "base_url": settings.base_url,
+            "timeout": 60.0,
+            "headers": {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
                 "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
                 "Referer": f"{settings.base_url}/ko/product/search/list.do",
             },
-            follow_redirects=True,
-        )
-        self._last_request_time: float = 0.0
+            "follow_redirects": True,
+        }
 
     def _throttle(self) -> None:
         elapsed = time.monotonic() - self._last_request_time
@@ -64,6 +127,152 @@ class BaseScraper:
         resp.raise_for_status()
         return resp
 
+    # --- async mode ---
+
+    @retry(
+        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TransportError)),
+        stop=stop_after_attempt(settings.max_retries),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        reraise=True,
+    )
+    async def _aget(self, url: str, **kwargs) -> httpx.Response:
+        await self._limiter.acquire()
+        resp = await self.aclient.get(url, **kwargs)
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return resp
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the HTTP cache when the endpoint has a TTL configured."""
+        cache = self.cache
+        if cache is None:
+            return await self._aget(url, **kwargs)
+
+        full_url = str(
+            self.aclient.build_request("GET", url, params=kwargs.get("params")).url
+        )
+        if cache.ttl_for(full_url) is None:
+            return await self._aget(url, **kwargs)
+
+        entry = cache.lookup(full_url)
+        if entry and cache.is_fresh(entry):
+            cache.hits += 1
+            return cache.response(entry)
+        if entry:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                **cache.conditional_headers(entry),
+            }
+
+        resp = await self._aget(url, **kwargs)
+        if resp.status_code == 304 and entry:
+            cache.revalidated += 1
+            cache.refresh(entry, resp)
+            return cache.response(entry)
+
+        cache.misses += 1
+        cache.store(full_url, resp)
+        return resp
+
+    @retry(
+        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TransportError)),
+        stop=stop_after_attempt(settings.max_retries),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        reraise=True,
+    )
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        await self._limiter.acquire()
+        resp = await self.aclient.post(url, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def fetch_each(
+        self, keys: Iterable[K], fetch: Callable[[K], Awaitable[T]]
+    ) -> list[tuple[K, T | None, Exception | None]]:
+        """Run ``fetch(key)`` for every key with up to ``self.concurrency`` in flight.
+
+        All requests share one ``httpx.AsyncClient`` and one ``TokenBucket``
+        so ``settings.request_delay`` stays a global rate regardless of the
+        concurrency.  Returns ``(key, result, error)`` tuples in input order;
+        a failing key never cancels the others.
+        """
+        return asyncio.run(self._fetch_each(list(keys), fetch))
+
+    async def _fetch_each(
+        self, keys: list[K], fetch: Callable[[K], Awaitable[T]]
+    ) -> list[tuple[K, T | None, Exception | None]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = TokenBucket.from_delay(settings.request_delay)
+
+        async def one(key: K) -> tuple[K, T | None, Exception | None]:
+            async with semaphore:
+                try:
+                    return key, await fetch(key), None
+                except Exception as e:
+                    return key, None, e
+
+        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+            self.aclient = client
+            try:
+                return await asyncio.gather(*(one(k) for k in keys))
+            finally:
+                self.aclient = None
+                self._limiter = None
+
+    def upsert_products(
+        self,
+        model: type,
+        rows_by_product: dict[str, list[dict]],
+        *,
+        key_cols: Sequence[str],
+        update_cols: Sequence[str] | None = None,
+    ) -> list[str]:
+        """Upsert each product's rows, returning the products that failed.
+
+        Products are written in multi-row chunks of about
+        ``settings.upsert_chunk_size`` rows, one transaction per chunk.  A
+        chunk that fails is retried product by product, so one bad row
+        costs only its own product.
+        """
+        chunks: list[list[str]] = [[]]
+        size = 0
+        for key, rows in rows_by_product.items():
+            if size and size + len(rows) > settings.upsert_chunk_size:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(key)
+            size += len(rows)
+
+        def write(keys: list[str]) -> None:
+            with get_session() as session:
+                bulk_upsert(
+                    session, model,
+                    (row for k in keys for row in rows_by_product[k]),
+                    key_cols=key_cols, update_cols=update_cols,
+                )
+
+        failed: list[str] = []
+        for keys in chunks:
+            if not keys:
+                continue
+            try:
+                write(keys)
+                continue
+            except Exception as e:
+                if len(keys) > 1:
+                    self.log.warning(f"Chunk write failed ({e}); retrying {len(keys)} products one by one")
+                else:
+                    self.log.warning(f"Failed to write {keys[0]}: {e}")
+                    failed.append(keys[0])
+                    continue
+            for key in keys:
+                try:
+                    write([key])
+                except Exception as e:
+                    self.log.warning(f"Failed to write {key}: {e}")
+                    failed.append(key)
+        return failed
+
     def start_run(self) -> int:
         with get_session() as session:
             run = ScrapeRun(scraper_name=self.name)
@@ -95,3 +304,12 @@ class BaseScraper:
 
     def close(self) -> None:
         self.client.close()
+        # Never opened if no cached request was made
+        if self._cache is not None:
+            if self._cache.hits or self._cache.revalidated or self._cache.misses:
+                self.log.info(
+                    f"HTTP cache: {self._cache.hits} hits, "
+                    f"{self._cache.revalidated} revalidated (304), "
+                    f"{self._cache.misses} fetched"
+                )
+            self._cache.close()
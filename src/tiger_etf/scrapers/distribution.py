@@ -6,7 +6,6 @@ import re
 from datetime import date, datetime
 
 from bs4 import BeautifulSoup
-from sqlalchemy.dialects.postgresql import insert
 
 from tiger_etf.db import get_session
 from tiger_etf.models import EtfDistribution
@@ -22,9 +21,9 @@ class DistributionScraper(BaseScraper):
         resp = self.get("/ko/distribution/annual/list.ajax")
         return resp.text
 
-    def _fetch_detail_distributions(self, ksd_fund_code: str) -> str:
+    async def _fetch_detail_distributions(self, ksd_fund_code: str) -> str:
         """Fetch per-ETF distribution detail."""
-        resp = self.post(
+        resp = await self.apost(
             "/ko/product/search/detail/refDivAjax.ajax",
             data={"ksdFund": ksd_fund_code},
         )
@@ -149,35 +148,33 @@ class DistributionScraper(BaseScraper):
                     query = query.limit(limit)
                 products = query.all()
 
-            self.log.info(f"Fetching distributions for {len(products)} products")
+            self.log.info(
+                f"Fetching distributions for {len(products)} products "
+                f"(concurrency={self.concurrency})"
+            )
 
-            for product in products:
-                ksd = product.ksd_fund_code
+            pages = self.fetch_each(
+                [p.ksd_fund_code for p in products], self._fetch_detail_distributions
+            )
+
+            rows: dict[str, list[dict]] = {}
+            for ksd, html, error in pages:
                 try:
-                    html = self._fetch_detail_distributions(ksd)
+                    if error:
+                        raise error
                     dists = self._parse_detail_distributions(html, ksd)
 
+                    rows[ksd] = [
+                        {
+                            "ksd_fund_code": d["ksd_fund_code"],
+                            "record_date": d["record_date"],
+                            "payment_date": d.get("payment_date"),
+                            "amount_per_share": d.get("amount_per_share"),
+                            "distribution_rate": d.get("distribution_rate"),
+                        }
+                        for d in dists
+                    ]
                     if dists:
-                        with get_session() as session:
-                            for d in dists:
-                                values = {
-                                    "ksd_fund_code": d["ksd_fund_code"],
-                                    "record_date": d["record_date"],
-                                    "payment_date": d.get("payment_date"),
-                                    "amount_per_share": d.get("amount_per_share"),
-                                    "distribution_rate": d.get("distribution_rate"),
-                                }
-                                stmt = insert(EtfDistribution).values(**values)
-                                stmt = stmt.on_conflict_do_update(
-                                    constraint="etf_distributions_ksd_fund_code_record_date_key",
-                                    set_={
-                                        "payment_date": values["payment_date"],
-                                        "amount_per_share": values["amount_per_share"],
-                                        "distribution_rate": values["distribution_rate"],
-                                    },
-                                )
-                                session.execute(stmt)
-
                         self.log.debug(f"{ksd}: {len(dists)} distributions")
 
                     processed += 1
@@ -185,6 +182,14 @@ class DistributionScraper(BaseScraper):
                     self.log.warning(f"Failed dist for {ksd}: {e}")
                     failed += 1
 
+            write_failed = self.upsert_products(
+                EtfDistribution,
+                rows,
+                key_cols=("ksd_fund_code", "record_date"),
+            )
+            processed -= len(write_failed)
+            failed += len(write_failed)
+
             self.finish_run(run_id, processed=processed, failed=failed)
 
         except Exception as e:
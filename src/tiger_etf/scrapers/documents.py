@@ -3,17 +3,32 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import re
+import tempfile
 from datetime import datetime, timezone
+from pathlib import Path
 
+import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy.dialects.postgresql import insert
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 from tiger_etf.config import settings
 from tiger_etf.db import get_session
 from tiger_etf.models import EtfDocument, EtfProduct
 from tiger_etf.scrapers.base import BaseScraper
 
+# Streaming download chunk size
+_CHUNK_SIZE = 256 * 1024
+# Responses smaller than this are error pages, not PDFs
+_MIN_PDF_BYTES = 1000
+
 
 # Map Korean doc type labels to normalized type codes
 DOC_TYPE_MAP = {
@@ -32,14 +47,19 @@ DOC_TYPE_MAP = {
 class DocumentsScraper(BaseScraper):
     name = "documents"
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._known_docs: dict[tuple[str, str, str], dict] = {}
+        self.skipped = 0
+
     def _fetch_reference_list(self) -> str:
         """Fetch the reference page that lists all ETFs with doc links."""
         resp = self.get("/ko/reference/list.ajax")
         return resp.text
 
-    def _fetch_detail_page(self, ksd_fund_code: str) -> str:
+    async def _fetch_detail_page(self, ksd_fund_code: str) -> str:
         """Fetch detail page to find document links."""
-        resp = self.get(
+        resp = await self.aget(
             "/ko/product/search/detail/index.do",
             params={"ksdFund": ksd_fund_code},
         )
@@ -115,32 +135,155 @@ class DocumentsScraper(BaseScraper):
 
         return docs
 
-    def _download_pdf(self, url: str, ksd_fund_code: str, doc_type: str) -> dict | None:
-        """Download a PDF and return file metadata."""
-        try:
-            resp = self.get(url)
-            content = resp.content
-
-            if len(content) < 1000:
-                self.log.debug(f"Skipping tiny response ({len(content)}b) for {url}")
-                return None
-
-            file_hash = hashlib.sha256(content).hexdigest()
-            # Create a safe filename
-            fname = f"{ksd_fund_code}_{doc_type}_{file_hash[:8]}.pdf"
-            fpath = settings.pdfs_dir / fname
-            fpath.write_bytes(content)
-
-            return {
-                "local_path": str(fpath),
-                "file_hash": file_hash,
-                "file_size_bytes": len(content),
-                "downloaded_at": datetime.now(timezone.utc),
+    def _load_known_documents(self) -> dict[tuple[str, str, str], dict]:
+        """Load stored file metadata keyed by (ksd_fund_code, doc_type, source_url)."""
+        with get_session() as session:
+            rows = session.query(
+                EtfDocument.ksd_fund_code,
+                EtfDocument.doc_type,
+                EtfDocument.source_url,
+                EtfDocument.local_path,
+                EtfDocument.file_hash,
+                EtfDocument.file_size_bytes,
+                EtfDocument.etag,
+                EtfDocument.last_modified,
+            ).filter(EtfDocument.file_hash.isnot(None)).all()
+        return {
+            (r.ksd_fund_code, r.doc_type, r.source_url): {
+                "local_path": r.local_path,
+                "file_hash": r.file_hash,
+                "file_size_bytes": r.file_size_bytes,
+                "etag": r.etag,
+                "last_modified": r.last_modified,
             }
+            for r in rows
+        }
+
+    @staticmethod
+    def _validators(resp: httpx.Response) -> dict:
+        """ETag / Last-Modified sent with a response, for storing with the file."""
+        headers = {"etag": resp.headers.get("etag"), "last_modified": resp.headers.get("last-modified")}
+        return {k: v for k, v in headers.items() if v}
+
+    @staticmethod
+    def _is_unchanged(resp: httpx.Response, known: dict | None) -> bool:
+        """Decide from response headers alone whether the stored copy is current.
+
+        Only a stored ETag (or, without one, Last-Modified) equal to the
+        response's counts as unchanged.  Content-Length is a hint: a
+        different size rules a match out, an equal one proves nothing.
+        """
+        if not known or not known.get("local_path") or not Path(known["local_path"]).exists():
+            return False
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+        if etag and known.get("etag"):
+            unchanged = etag == known["etag"]
+        elif last_modified and known.get("last_modified"):
+            unchanged = last_modified == known["last_modified"]
+        else:
+            return False
+        length = resp.headers.get("content-length")
+        if unchanged and length is not None and known.get("file_size_bytes") is not None:
+            unchanged = int(length) == known["file_size_bytes"]
+        return unchanged
+
+    async def _download_pdf(
+        self, url: str, ksd_fund_code: str, doc_type: str, known: dict | None = None
+    ) -> dict | None:
+        """Download a PDF and return file metadata.
+
+        When ``known`` (the stored row) is still current, returns only the
+        response's ETag / Last-Modified (empty if it sent neither), and None
+        when the download failed.
+        """
+        try:
+            return await self._stream_pdf(url, ksd_fund_code, doc_type, known)
         except Exception as e:
             self.log.warning(f"PDF download failed: {url} - {e}")
             return None
 
+    @retry(
+        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TransportError)),
+        stop=stop_after_attempt(settings.max_retries),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        reraise=True,
+    )
+    async def _stream_pdf(
+        self, url: str, ksd_fund_code: str, doc_type: str, known: dict | None
+    ) -> dict | None:
+        """Stream the body to a temp file, hashing chunks as they arrive."""
+        await self._limiter.acquire()
+        async with self.aclient.stream("GET", url) as resp:
+            resp.raise_for_status()
+            validators = self._validators(resp)
+            if self._is_unchanged(resp, known):
+                self.skipped += 1
+                return {}
+
+            digest = hashlib.sha256()
+            size = 0
+            fd, tmp_name = tempfile.mkstemp(dir=settings.pdfs_dir, suffix=".part")
+            tmp = Path(tmp_name)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+
+        if size < _MIN_PDF_BYTES:
+            tmp.unlink(missing_ok=True)
+            self.log.debug(f"Skipping tiny response ({size}b) for {url}")
+            return None
+
+        file_hash = digest.hexdigest()
+        if known and known.get("file_hash") == file_hash and Path(known["local_path"]).exists():
+            tmp.unlink(missing_ok=True)
+            self.skipped += 1
+            # Same content: record the validators so the next run skips on headers
+            return validators
+
+        # Create a safe filename; os.replace makes the file appear atomically
+        fname = f"{ksd_fund_code}_{doc_type}_{file_hash[:8]}.pdf"
+        fpath = settings.pdfs_dir / fname
+        os.replace(tmp, fpath)
+
+        return {
+            "local_path": str(fpath),
+            "file_hash": file_hash,
+            "file_size_bytes": size,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "downloaded_at": datetime.now(timezone.utc),
+        }
+
+    async def _fetch_documents(self, ksd_fund_code: str, download: bool) -> list[tuple[dict, dict]]:
+        """Find a product's PDF links and download them.
+
+        Returns ``(doc, meta)`` pairs; ``meta`` is empty when downloads are
+        disabled or failed, and holds at most the HTTP validators when the
+        stored copy is unchanged.
+        """
+        html = await self._fetch_detail_page(ksd_fund_code)
+        results = []
+        for doc in self._extract_pdf_links(html, ksd_fund_code):
+            meta = {}
+            if download:
+                known = self._known_docs.get(
+                    (ksd_fund_code, doc["doc_type"], doc["source_url"])
+                )
+                dl_result = await self._download_pdf(
+                    doc["source_url"], ksd_fund_code, doc["doc_type"], known
+                )
+                if dl_result:
+                    meta = dl_result
+            results.append((doc, meta))
+        return results
+
     def run(self, limit: int | None = None, download: bool = True, **kwargs) -> None:
         run_id = self.start_run()
         processed = 0
@@ -153,24 +296,26 @@ class DocumentsScraper(BaseScraper):
                     query = query.limit(limit)
                 products = query.all()
 
-            self.log.info(f"Scanning documents for {len(products)} products")
+            if download:
+                self._known_docs = self._load_known_documents()
+
+            self.log.info(
+                f"Scanning documents for {len(products)} products "
+                f"(concurrency={self.concurrency}, known={len(self._known_docs)})"
+            )
+
+            fetched = self.fetch_each(
+                [p.ksd_fund_code for p in products],
+                lambda ksd: self._fetch_documents(ksd, download),
+            )
 
-            for product in products:
-                ksd = product.ksd_fund_code
+            for ksd, pdf_links, error in fetched:
                 try:
-                    html = self._fetch_detail_page(ksd)
-                    pdf_links = self._extract_pdf_links(html, ksd)
+                    if error:
+                        raise error
 
                     if pdf_links:
-                        for doc in pdf_links:
-                            meta = {}
-                            if download:
-                                dl_result = self._download_pdf(
-                                    doc["source_url"], ksd, doc["doc_type"]
-                                )
-                                if dl_result:
-                                    meta = dl_result
-
+                        for doc, meta in pdf_links:
                             with get_session() as session:
                                 values = {
                                     "ksd_fund_code": ksd,
@@ -197,6 +342,8 @@ class DocumentsScraper(BaseScraper):
                     self.log.warning(f"Failed docs for {ksd}: {e}")
                     failed += 1
 
+            if download:
+                self.log.info(f"Skipped {self.skipped} unchanged documents")
             self.finish_run(run_id, processed=processed, failed=failed)
 
         except Exception as e:
@@ -5,11 +5,11 @@ from __future__ import annotations
 from datetime import date
 
 import xlrd
-from sqlalchemy.dialects.postgresql import insert
 
+from tiger_etf.catalog import get_catalog
 from tiger_etf.config import settings
 from tiger_etf.db import get_session
-from tiger_etf.models import EtfHolding, EtfProduct
+from tiger_etf.models import EtfHolding
 from tiger_etf.scrapers.base import BaseScraper
 from tiger_etf.scrapers.product_list import _safe_float
 
@@ -95,12 +95,13 @@ class HoldingsScraper(BaseScraper):
         failed = 0
 
         try:
-            # Build ticker -> ksd_fund_code mapping
+            # Build ticker -> ksd_fund_code mapping (catalog re-checked on the
+            # writer, so a product list scraped in this process is seen
+            # regardless of replica lag)
             with get_session() as session:
-                query = session.query(EtfProduct).filter(EtfProduct.is_active.is_(True))
-                if limit:
-                    query = query.limit(limit)
-                products = query.all()
+                products = get_catalog(max_age=0, session=session).active()
+            if limit:
+                products = products[:limit]
 
             ticker_to_ksd = {p.ticker: p.ksd_fund_code for p in products}
             target_ksds = set(ticker_to_ksd.values()) if limit else None
@@ -120,38 +121,38 @@ class HoldingsScraper(BaseScraper):
 
             today = date.today()
 
-            # Upsert
-            with get_session() as session:
-                for ksd, holdings in all_holdings.items():
-                    if target_ksds and ksd not in target_ksds:
-                        continue
-                    try:
-                        for h in holdings:
-                            values = {
-                                "ksd_fund_code": ksd,
-                                "as_of_date": today,
-                                "holding_name": h["holding_name"],
-                                "holding_isin": h.get("holding_isin"),
-                                "holding_ticker": h.get("holding_ticker"),
-                                "weight_pct": h.get("weight_pct"),
-                                "shares": h.get("shares"),
-                                "market_value": None,
-                            }
-                            stmt = insert(EtfHolding).values(**values)
-                            stmt = stmt.on_conflict_do_update(
-                                constraint="etf_holdings_ksd_fund_code_as_of_date_holding_name_key",
-                                set_={
-                                    "holding_isin": values["holding_isin"],
-                                    "holding_ticker": values["holding_ticker"],
-                                    "weight_pct": values["weight_pct"],
-                                    "shares": values["shares"],
-                                },
-                            )
-                            session.execute(stmt)
-                        processed += 1
-                    except Exception as e:
-                        self.log.warning(f"Failed holdings for {ksd}: {e}")
-                        failed += 1
+            # Collect rows per product, then upsert in multi-row chunks
+            rows: dict[str, list[dict]] = {}
+            for ksd, holdings in all_holdings.items():
+                if target_ksds and ksd not in target_ksds:
+                    continue
+                try:
+                    rows[ksd] = [
+                        {
+                            "ksd_fund_code": ksd,
+                            "as_of_date": today,
+                            "holding_name": h["holding_name"],
+                            "holding_isin": h.get("holding_isin"),
+                            "holding_ticker": h.get("holding_ticker"),
+                            "weight_pct": h.get("weight_pct"),
+                            "shares": h.get("shares"),
+                            "market_value": None,
+                        }
+                        for h in holdings
+                    ]
+                    processed += 1
+                except Exception as e:
+                    self.log.warning(f"Failed holdings for {ksd}: {e}")
+                    failed += 1
+
+            write_failed = self.upsert_products(
+                EtfHolding,
+                rows,
+                key_cols=("ksd_fund_code", "as_of_date", "holding_name"),
+                update_cols=("holding_isin", "holding_ticker", "weight_pct", "shares"),
+            )
+            processed -= len(write_failed)
+            failed += len(write_failed)
 
             self.finish_run(run_id, processed=processed, failed=failed)
 
@@ -0,0 +1,218 @@
+"""On-disk HTTP response cache shared by scrapers.
+
+Bodies are stored content-addressed (``bodies/<sha256[:2]>/<sha256>``) so
+identical pages fetched under different URLs are kept once.  A small
+SQLite index maps each request URL to its body plus the validators
+(ETag / Last-Modified) needed for conditional revalidation.
+
+Only endpoints listed in ``settings.http_cache_ttls`` are cached; keys are
+path prefixes relative to ``settings.base_url``.  Within
+the TTL a cached page is served without touching the network; after it
+the page is revalidated with ``If-None-Match`` / ``If-Modified-Since`` and
+a ``304 Not Modified`` refreshes the entry without re-downloading.  When
+the bodies exceed ``settings.http_cache_max_mb`` the least recently used
+entries are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from tiger_etf.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    body_hash     TEXT NOT NULL,
+    size          INTEGER NOT NULL,
+    content_type  TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    body_hash: str
+    size: int
+    content_type: str | None
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    accessed_at: float
+
+
+class HttpCache:
+    """Content-addressed response cache with TTLs and LRU size eviction."""
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        ttls: dict[str, float] | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.root = root or settings.http_cache_dir
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttls = settings.http_cache_ttls if ttls is None else ttls
+        # TTL prefixes are relative to the site root under base_url
+        self.base_path = urlsplit(settings.base_url).path.rstrip("/")
+        self.max_bytes = (
+            settings.http_cache_max_mb * 1024 * 1024 if max_bytes is None else max_bytes
+        )
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._db = sqlite3.connect(self.root / "index.sqlite3")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    # --- policy ---
+
+    def ttl_for(self, url: str) -> float | None:
+        """Return the TTL for ``url``'s endpoint, or None if it is not cacheable."""
+        path = urlsplit(url).path
+        if self.base_path and path.startswith(self.base_path + "/"):
+            path = path[len(self.base_path):]
+        for prefix, ttl in self.ttls.items():
+            if path.startswith(prefix):
+                return float(ttl)
+        return None
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(f"GET {url}".encode()).hexdigest()
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        ttl = self.ttl_for(entry.url) or 0.0
+        return time.time() - entry.fetched_at < ttl
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # --- storage ---
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.root / "bodies" / body_hash[:2] / body_hash
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        row = self._db.execute(
+            "SELECT * FROM entries WHERE key = ?", (self.key_for(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        if not self._body_path(entry.body_hash).exists():
+            self._delete(entry.key)
+            return None
+        return entry
+
+    def response(self, entry: CacheEntry) -> httpx.Response:
+        """Rebuild an ``httpx.Response`` from a cache entry and mark it used."""
+        self._db.execute(
+            "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), entry.key)
+        )
+        self._db.commit()
+        headers = {"content-type": entry.content_type} if entry.content_type else {}
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=self._body_path(entry.body_hash).read_bytes(),
+            request=httpx.Request("GET", entry.url),
+        )
+
+    def refresh(self, entry: CacheEntry, resp: httpx.Response) -> None:
+        """Record a ``304 Not Modified`` revalidation."""
+        now = time.time()
+        self._db.execute(
+            "UPDATE entries SET fetched_at = ?, accessed_at = ?, "
+            "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+            "WHERE key = ?",
+            (now, now, resp.headers.get("etag"), resp.headers.get("last-modified"), entry.key),
+        )
+        self._db.commit()
+
+    def store(self, url: str, resp: httpx.Response) -> None:
+        content = resp.content
+        body_hash = hashlib.sha256(content).hexdigest()
+        path = self._body_path(body_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(content)
+            tmp.replace(path)
+
+        old = self.lookup(url)
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.key_for(url), url, body_hash, len(content),
+                resp.headers.get("content-type"),
+                resp.headers.get("etag"), resp.headers.get("last-modified"),
+                now, now,
+            ),
+        )
+        self._db.commit()
+        if old and old.body_hash != body_hash:
+            self._drop_body_if_orphaned(old.body_hash)
+        self.evict()
+
+    def _delete(self, key: str) -> None:
+        row = self._db.execute(
+            "SELECT body_hash FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._db.commit()
+        if row:
+            self._drop_body_if_orphaned(row[0])
+
+    def _drop_body_if_orphaned(self, body_hash: str) -> None:
+        (refs,) = self._db.execute(
+            "SELECT COUNT(*) FROM entries WHERE body_hash = ?", (body_hash,)
+        ).fetchone()
+        if refs == 0:
+            self._body_path(body_hash).unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        # Bodies are shared, so count each distinct body once
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)"
+        ).fetchone()
+        return total
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under ``max_bytes``."""
+        evicted = 0
+        while self.total_bytes() > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._delete(row[0])
+            evicted += 1
+        return evicted
+
+    def close(self) -> None:
+        self._db.close()
@@ -4,8 +4,6 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy.dialects.postgresql import insert
-
 from tiger_etf.db import get_session
 from tiger_etf.models import EtfPerformance, EtfProduct
 from tiger_etf.scrapers.base import BaseScraper
@@ -46,43 +44,42 @@ class PerformanceScraper(BaseScraper):
 
             today = date.today()
 
-            with get_session() as session:
-                for product in products:
-                    ksd = product.ksd_fund_code
-                    try:
-                        # Extract period returns from raw_data (already fetched by product_list)
-                        raw = product.raw_data or {}
-                        returns = {
-                            "return_1w": _safe_float(raw.get("week01")),
-                            "return_1m": _safe_float(raw.get("month01")),
-                            "return_3m": _safe_float(raw.get("month03")),
-                            "return_6m": _safe_float(raw.get("month06")),
-                            "return_1y": _safe_float(raw.get("year01")),
-                            "return_3y": _safe_float(raw.get("year03")),
-                            "return_ytd": _safe_float(raw.get("thisyear")),
-                        }
-
-                        # Only insert if we have at least one return value
-                        if any(v is not None for v in returns.values()):
-                            values = {
-                                "ksd_fund_code": ksd,
-                                "as_of_date": today,
-                                **returns,
-                            }
-
-                            stmt = insert(EtfPerformance).values(**values)
-                            stmt = stmt.on_conflict_do_update(
-                                constraint="etf_performance_ksd_fund_code_as_of_date_key",
-                                set_=returns,
-                            )
-                            session.execute(stmt)
-                            processed += 1
-                        else:
-                            processed += 1
-
-                    except Exception as e:
-                        self.log.warning(f"Failed perf for {ksd}: {e}")
-                        failed += 1
+            rows: dict[str, list[dict]] = {}
+            for product in products:
+                ksd = product.ksd_fund_code
+                try:
+                    # Extract period returns from raw_data (already fetched by product_list)
+                    raw = product.raw_data or {}
+                    returns = {
+                        "return_1w": _safe_float(raw.get("week01")),
+                        "return_1m": _safe_float(raw.get("month01")),
+                        "return_3m": _safe_float(raw.get("month03")),
+                        "return_6m": _safe_float(raw.get("month06")),
+                        "return_1y": _safe_float(raw.get("year01")),
+                        "return_3y": _safe_float(raw.get("year03")),
+                        "return_ytd": _safe_float(raw.get("thisyear")),
+                    }
+
+                    # Only insert if we have at least one return value
+                    if any(v is not None for v in returns.values()):
+                        rows[ksd] = [{
+                            "ksd_fund_code": ksd,
+                            "as_of_date": today,
+                            **returns,
+                        }]
+                    processed += 1
+
+                except Exception as e:
+                    self.log.warning(f"Failed perf for {ksd}: {e}")
+                    failed += 1
+
+            write_failed = self.upsert_products(
+                EtfPerformance,
+                rows,
+                key_cols=("ksd_fund_code", "as_of_date"),
+            )
+            processed -= len(write_failed)
+            failed += len(write_failed)
 
             self.finish_run(run_id, processed=processed, failed=failed)
 
@@ -13,8 +13,8 @@ from tiger_etf.scrapers.product_list import _parse_date, _safe_float, _safe_int
 class ProductDetailScraper(BaseScraper):
     name = "product_detail"
 
-    def _fetch_detail_page(self, ksd_fund_code: str) -> str:
-        resp = self.get(
+    async def _fetch_detail_page(self, ksd_fund_code: str) -> str:
+        resp = await self.aget(
             "/ko/product/search/detail/index.do",
             params={"ksdFund": ksd_fund_code},
         )
@@ -101,12 +101,19 @@ class ProductDetailScraper(BaseScraper):
                     query = query.limit(limit)
                 products = query.all()
 
-            self.log.info(f"Fetching details for {len(products)} products")
+            self.log.info(
+                f"Fetching details for {len(products)} products "
+                f"(concurrency={self.concurrency})"
+            )
 
-            for product in products:
-                ksd = product.ksd_fund_code
+            pages = self.fetch_each(
+                [p.ksd_fund_code for p in products], self._fetch_detail_page
+            )
+
+            for ksd, html, error in pages:
                 try:
-                    html = self._fetch_detail_page(ksd)
+                    if error:
+                        raise error
                     detail = self._parse_detail(html, ksd)
 
                     if detail:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
+from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import insert
 
 from tiger_etf.db import get_session
@@ -164,9 +165,14 @@ class ProductListScraper(BaseScraper):
                         stmt = stmt.on_conflict_do_update(
                             index_elements=["ksd_fund_code"],
                             set_={
-                                k: v
-                                for k, v in values.items()
-                                if k != "ksd_fund_code"
+                                **{
+                                    k: v
+                                    for k, v in values.items()
+                                    if k != "ksd_fund_code"
+                                },
+                                # ON CONFLICT skips the ORM onupdate; the
+                                # product catalog's version stamp reads it
+                                "updated_at": func.now(),
                             },
                         )
                         session.execute(stmt)
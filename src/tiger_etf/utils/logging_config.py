@@ -22,6 +22,10 @@ class JSONFileHandler(logging.FileHandler):
         }
         if record.exc_info and record.exc_info[1]:
             entry["exception"] = str(record.exc_info[1])
+        # Structured payload passed as logger.info(..., extra={"metrics": {...}})
+        metrics = getattr(record, "metrics", None)
+        if metrics is not None:
+            entry["metrics"] = metrics
         record.msg = json.dumps(entry, ensure_ascii=False)
         record.args = None
         super().emit(record)
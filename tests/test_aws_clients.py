@@ -0,0 +1,63 @@
+"""Tests for endpoint region parsing and the pooled OpenSearch client."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from tiger_etf.graphrag import aws_clients
+from tiger_etf.graphrag.aws_clients import (
+    close_clients,
+    get_opensearch_client,
+    opensearch_host,
+    region_from_endpoint,
+)
+
+
+class TestRegionFromEndpoint:
+    @pytest.mark.parametrize("endpoint,region", [
+        ("db-x.cluster-y.ap-northeast-2.neptune.amazonaws.com", "ap-northeast-2"),
+        ("https://abc.us-east-1.aoss.amazonaws.com", "us-east-1"),
+        ("aoss://abc.eu-west-1.aoss.amazonaws.com:443/", "eu-west-1"),
+    ])
+    def test_parses_service_host(self, endpoint, region):
+        assert region_from_endpoint(endpoint) == region
+
+    def test_falls_back_to_settings(self):
+        with patch.object(aws_clients.settings, "graphrag_aws_region", "ap-southeast-1"):
+            assert region_from_endpoint("g-abc123") == "ap-southeast-1"
+
+
+class TestOpensearchClient:
+    @pytest.fixture(autouse=True)
+    def _pool(self):
+        close_clients()
+        yield
+        close_clients()
+
+    def test_host_normalized(self):
+        assert opensearch_host("aoss://abc.aoss.amazonaws.com:9200/x") == "abc.aoss.amazonaws.com"
+        assert opensearch_host("https://abc.aoss.amazonaws.com/") == "abc.aoss.amazonaws.com"
+
+    def test_one_client_per_host(self):
+        with patch.object(aws_clients, "_make_client", side_effect=lambda host: object.__new__(_Closable)) as make:
+            a = get_opensearch_client("https://abc.ap-northeast-2.aoss.amazonaws.com")
+            b = get_opensearch_client("aoss://abc.ap-northeast-2.aoss.amazonaws.com")
+            c = get_opensearch_client("https://def.ap-northeast-2.aoss.amazonaws.com")
+        assert a is b and a is not c
+        assert make.call_count == 2
+
+    def test_client_keeps_connections_pooled(self, monkeypatch):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+        with patch.object(aws_clients.settings, "graphrag_vector_pool_maxsize", 7):
+            client = get_opensearch_client("https://abc.ap-northeast-2.aoss.amazonaws.com")
+        conn = client.transport.get_connection()
+        assert conn.host == "https://abc.ap-northeast-2.aoss.amazonaws.com:443"
+        assert conn.session.get_adapter("https://").__getstate__()["_pool_maxsize"] == 7
+
+
+class _Closable:
+    def close(self):
+        pass
@@ -0,0 +1,149 @@
+"""Tests for build_index throughput telemetry."""
+
+from __future__ import annotations
+
+import json
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.llms import CompletionResponse
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.prompts import PromptTemplate
+from llama_index.core.schema import Document
+
+from tiger_etf.graphrag.build_telemetry import BuildTelemetry, instrument_graph_writes
+from tiger_etf.utils.logging_config import JSONFileHandler
+
+PROMPT = PromptTemplate("Extract propositions from {text}")
+
+
+class _Throttled(Exception):
+    response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class _ExtractionLLM(MockLLM):
+    throttle_next: bool = False
+
+    @llm_completion_callback()
+    def complete(self, prompt, formatted=False, **kwargs):
+        if self.throttle_next:
+            self.throttle_next = False
+            raise _Throttled("Rate exceeded")
+        return CompletionResponse(
+            text="props", raw={"usage": {"inputTokens": 50, "outputTokens": 10}}
+        )
+
+
+class _FakeIndex:
+    """extract_and_build stand-in driving real llama_index components."""
+
+    def __init__(self):
+        self.llm = _ExtractionLLM()
+        self.embed = MockEmbedding(embed_dim=4)
+        self.graph_store = instrument_graph_writes(MagicMock())
+
+    def extract_and_build(self, batch, show_progress=False):
+        for doc in batch:
+            for chunk in (doc.text[:5], doc.text[5:]):
+                try:
+                    self.llm.predict(PROMPT, text=chunk)
+                except _Throttled:
+                    self.llm.predict(PROMPT, text=chunk)  # retried
+        self.embed.get_text_embedding_batch([d.text for d in batch])
+        self.graph_store.execute_query(
+            "UNWIND $params AS params MERGE (c:`__Chunk__` {chunkId: params.chunk_id})",
+            {"params": [{"chunk_id": i} for i in range(2 * len(batch))]},
+        )
+        self.graph_store.execute_query(
+            "UNWIND $params AS params MATCH (a), (b) MERGE (a)-[:`__MENTIONS__`]->(b)",
+            {"params": [{} for _ in range(3)]},
+        )
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path):
+        yield tmp_path
+
+
+def _docs(n):
+    return [Document(text=f"a{i:02d}xxb{i:02d}yy", metadata={"file_name": f"{i}.pdf"}) for i in range(n)]
+
+
+class TestBuildTelemetry:
+    def test_per_batch_and_summary(self, data_dir):
+        from tiger_etf.graphrag.indexer import build_index
+
+        index = _FakeIndex()
+        index.llm.throttle_next = True
+        telemetry = BuildTelemetry()
+        build_index(_docs(3), graph_index=index, batch_size=2, telemetry=telemetry)
+
+        assert len(telemetry.batches) == 2
+        first = telemetry.batches[0]
+        assert first["documents"] == 2
+        assert first["extraction"]["chunks"] == 4
+        assert first["extraction"]["llm_calls"] == 4  # the throttled attempt never completed
+        assert first["extraction"]["errors"] == 1
+        assert first["extraction"]["throttles"] == 1
+        assert first["extraction"]["prompt_tokens"] == 200
+        assert first["graph"] == pytest.approx({
+            **first["graph"], "writes": 2, "nodes_written": 4, "edges_written": 3,
+            "avg_rows_per_write": 3.5,
+        })
+        assert first["vector"]["embeddings"] == 2
+
+        summary = telemetry.summary()
+        assert summary["batches"] == 2
+        assert summary["documents"] == 3
+        assert summary["extraction"]["chunks"] == 6
+        assert summary["extraction"]["completion_tokens"] == 60
+        assert summary["graph"]["nodes_written"] == 6
+        assert summary["vector"]["embeddings"] == 3
+        assert summary["vector"]["embeddings_per_sec"] > 0
+
+    def test_not_recorded_outside_build(self, data_dir):
+        index = _FakeIndex()
+        telemetry = BuildTelemetry()
+        index.extract_and_build(_docs(1))
+        assert telemetry.summary()["extraction"]["llm_calls"] == 0
+
+    def test_metrics_written_to_jsonl(self, data_dir, tmp_path):
+        from tiger_etf.graphrag.indexer import build_index
+
+        handler = JSONFileHandler(str(tmp_path / "pipeline.jsonl"), encoding="utf-8")
+        log = logging.getLogger("tiger_etf.graphrag.build_telemetry")
+        log.addHandler(handler)
+        old_level = log.level
+        log.setLevel(logging.INFO)
+        try:
+            build_index(_docs(1), graph_index=_FakeIndex())
+        finally:
+            log.removeHandler(handler)
+            log.setLevel(old_level)
+            handler.close()
+
+        entries = [json.loads(line) for line in (tmp_path / "pipeline.jsonl").read_text().splitlines()]
+        [entry] = [e for e in entries if "metrics" in e]
+        assert entry["metrics"]["batch"] == 1
+        assert entry["metrics"]["extraction"]["chunks"] == 2
+
+
+class TestIsThrottle:
+    @pytest.mark.parametrize("response", [None, object(), "text"])
+    def test_non_dict_response(self, response):
+        from tiger_etf.graphrag.build_telemetry import _is_throttle
+
+        err = RuntimeError("boom")
+        err.response = response
+        assert _is_throttle(err) is False
+
+    def test_botocore_style_code(self):
+        from tiger_etf.graphrag.build_telemetry import _is_throttle
+
+        err = RuntimeError("An error occurred")
+        err.response = {"Error": {"Code": "ThrottlingException"}}
+        assert _is_throttle(err) is True
@@ -0,0 +1,138 @@
+"""Tests for the in-memory product catalog."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from tiger_etf.catalog import (
+    CatalogEntry,
+    ProductCatalog,
+    clear_catalog,
+    get_catalog,
+    normalize_name,
+)
+from tiger_etf.models import Base, EtfProduct
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(element, compiler, **kw):
+    return "JSON"
+
+
+ENTRIES = [
+    CatalogEntry("KR7360750004", "360750", "TIGER 미국S&P500"),
+    CatalogEntry("KR7133690008", "133690", "TIGER 미국나스닥100"),
+    CatalogEntry("KR7381180009", "381180", "TIGER 미국필라델피아반도체나스닥"),
+    CatalogEntry("KR7458730006", "458730", "TIGER 미국배당다우존스"),
+    CatalogEntry("KR7102110004", "102110", "TIGER 200", is_active=False),
+]
+
+
+@pytest.fixture
+def catalog():
+    return ProductCatalog(ENTRIES)
+
+
+class TestLookup:
+    def test_exact_keys(self, catalog):
+        assert catalog.by_ticker("360750").ksd_fund_code == "KR7360750004"
+        assert catalog.by_code("KR7133690008").ticker == "133690"
+        assert catalog.by_name("TIGER 미국S&P500").ticker == "360750"
+        assert catalog.by_ticker("999999") is None
+
+    def test_name_key_ignores_case_width_and_spaces(self, catalog):
+        assert normalize_name("TIGER 미국 S&P 500") == "tiger미국s&p500"
+        assert catalog.by_name("tiger 미국 s&p 500").ticker == "360750"
+        assert catalog.by_name("ＴＩＧＥＲ 미국Ｓ＆Ｐ500").ticker == "360750"
+
+    def test_ticker_map_and_active(self, catalog):
+        assert catalog.ticker_map()["KR7102110004"] == "102110"
+        assert [e.ticker for e in catalog.active()] == ["360750", "133690", "381180", "458730"]
+
+    def test_entries_use_slots(self):
+        with pytest.raises(AttributeError):
+            ENTRIES[0].extra = 1
+
+
+class TestFuzzy:
+    def test_search_ranks_by_similarity(self, catalog):
+        hits = catalog.search("미국 배당 다우존스 ETF")
+        assert hits[0][0].ticker == "458730"
+        assert hits[0][1] > hits[1][1]
+
+    def test_match_close_name(self, catalog):
+        assert catalog.match("TIGER 미국필라델피아반도체").ticker == "381180"
+        assert catalog.match("TIGER 비트코인") is None
+
+    def test_resolve_longest_prefix(self, catalog):
+        assert catalog.resolve("tiger 미국s&p500 상장일").ticker == "360750"
+        assert catalog.resolve("tiger 미국배당다우존스 분배금").ticker == "458730"
+        assert catalog.resolve("tiger 미국") is None
+
+
+@pytest.fixture
+def rdb():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS tiger_etf")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(EtfProduct(ksd_fund_code="KR7360750004", ticker="360750", name_ko="TIGER 미국S&P500"))
+        session.commit()
+
+    queries = []
+
+    @contextmanager
+    def reader_session():
+        with Session(engine) as session:
+            queries.append(1)
+            yield session
+
+    clear_catalog()
+    with patch("tiger_etf.catalog.get_reader_session", reader_session):
+        yield engine, queries
+    clear_catalog()
+
+
+class TestGetCatalog:
+    def test_loaded_once_within_interval(self, rdb):
+        _, queries = rdb
+        first = get_catalog(max_age=60)
+        assert get_catalog(max_age=60) is first
+        assert len(queries) == 1
+
+    def test_reloaded_when_version_changes(self, rdb):
+        engine, _ = rdb
+        first = get_catalog()
+        assert get_catalog(max_age=0) is first
+
+        with Session(engine) as session:
+            product = session.query(EtfProduct).one()
+            product.name_ko = "TIGER 미국S&P500(H)"
+            product.updated_at = datetime(2099, 1, 1, tzinfo=timezone.utc)
+            session.add(EtfProduct(ksd_fund_code="KR7133690008", ticker="133690", name_ko="TIGER 미국나스닥100"))
+            session.commit()
+
+        assert get_catalog() is first
+        second = get_catalog(max_age=0)
+        assert second is not first
+        assert len(second) == 2
+        assert second.by_ticker("360750").name_ko == "TIGER 미국S&P500(H)"
+
+    def test_explicit_session_bypasses_reader(self, rdb):
+        engine, queries = rdb
+        with Session(engine) as session:
+            catalog = get_catalog(max_age=0, session=session)
+        assert catalog.by_ticker("360750") is not None
+        assert queries == []
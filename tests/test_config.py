@@ -77,6 +77,24 @@ class TestYamlSettingsSource:
         assert data["request_delay"] == 2.5
         assert data["max_retries"] == 5
 
+    def test_profile_merged_over_yaml(self, tmp_path):
+        from tiger_etf.config import YamlSettingsSource, Settings
+
+        config_path = _write_yaml(tmp_path, {
+            "graphrag": {"extraction_num_workers": 1, "build_num_workers": 2, "enable_cache": True},
+        })
+        profile = tmp_path / "experiments" / "profiles" / "tuned.yaml"
+        profile.parent.mkdir(parents=True)
+        profile.write_text(yaml.dump({"graphrag": {"extraction_num_workers": 4}, "tuning": {}}))
+
+        with patch("tiger_etf.config._find_config_yaml", return_value=config_path):
+            with patch.dict(os.environ, {"CONFIG_PROFILE": "tuned"}):
+                data = YamlSettingsSource(Settings)()
+
+        assert data["graphrag_extraction_num_workers"] == 4
+        assert data["graphrag_build_num_workers"] == 2
+        assert data["graphrag_enable_cache"] is True
+
     def test_missing_yaml_returns_empty(self, tmp_path):
         from tiger_etf.config import YamlSettingsSource, Settings
 
@@ -0,0 +1,66 @@
+"""Tests for database helpers."""
+
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from tiger_etf.db import bulk_upsert
+from tiger_etf.models import EtfDistribution
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {
+            "ksd_fund_code": f"KR{i:010d}",
+            "record_date": date(2025, 1, 1),
+            "payment_date": None,
+            "amount_per_share": float(i),
+            "distribution_rate": None,
+        }
+        for i in range(n)
+    ]
+
+
+class TestBulkUpsert:
+    def test_chunks_rows(self):
+        session = MagicMock()
+        count = bulk_upsert(
+            session, EtfDistribution, _rows(5),
+            key_cols=("ksd_fund_code", "record_date"), chunk_size=2,
+        )
+        assert count == 5
+        assert session.execute.call_count == 3
+
+    def test_single_multi_values_statement(self):
+        session = MagicMock()
+        bulk_upsert(
+            session, EtfDistribution, _rows(3),
+            key_cols=("ksd_fund_code", "record_date"), chunk_size=10,
+        )
+        stmt = session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.count("INSERT") == 1
+        assert "ON CONFLICT (ksd_fund_code, record_date) DO UPDATE" in sql
+        assert "amount_per_share = excluded.amount_per_share" in sql
+        assert "ksd_fund_code = excluded" not in sql
+
+    def test_duplicate_keys_collapsed(self):
+        session = MagicMock()
+        rows = _rows(2) + [dict(_rows(1)[0], amount_per_share=99.0)]
+        count = bulk_upsert(
+            session, EtfDistribution, rows,
+            key_cols=("ksd_fund_code", "record_date"),
+        )
+        assert count == 2
+        params = session.execute.call_args[0][0].compile(
+            dialect=postgresql.dialect()
+        ).params
+        assert 99.0 in params.values()
+
+    def test_empty_rows_no_statement(self):
+        session = MagicMock()
+        assert bulk_upsert(session, EtfDistribution, [], key_cols=("ksd_fund_code",)) == 0
+        session.execute.assert_not_called()
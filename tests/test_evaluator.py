@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import io
+import json
 import textwrap
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -11,7 +15,10 @@ import pytest
 from tiger_etf.graphrag.evaluator import (
     EvalQuestion,
     EvalReport,
+    JudgeExecutor,
+    JudgeItem,
     QuestionResult,
+    ResponseMatcher,
     evaluate_keyword_coverage,
     evaluate_keyword_hit,
     evaluate_negative,
@@ -19,6 +26,7 @@ from tiger_etf.graphrag.evaluator import (
     load_eval_questions,
     report_to_dict,
     run_evaluation,
+    score_log,
 )
 
 
@@ -180,6 +188,45 @@ class TestNegativeDetection:
         )
 
 
+class TestResponseMatcher:
+    def test_overlapping_keywords(self):
+        m = ResponseMatcher(["S&P 500", "S&P", "P 5", "총보수", "없는말"])
+        r = m.match("이 ETF는 s&p 500 지수를 추적합니다")
+        assert r.keyword_hit
+        assert r.keyword_coverage == pytest.approx(3 / 5)
+        assert r.negative_pass is None
+
+    def test_matches_naive_checks(self):
+        import random
+
+        rng = random.Random(0)
+        alphabet = "ab가나 A"
+        for _ in range(300):
+            keywords = [
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                for _ in range(rng.randint(0, 5))
+            ]
+            response = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            resp_lower = response.lower()
+            naive = [kw.lower() in resp_lower for kw in keywords]
+            r = ResponseMatcher(keywords).match(response)
+            assert r.keyword_hit == any(naive)
+            assert r.keyword_coverage == (sum(naive) / len(keywords) if keywords else 0.0)
+
+    def test_negative_verdict(self):
+        q = EvalQuestion(
+            question="비트코인 ETF?", category="negative", difficulty="medium",
+            check="should_provide_accurate_disclaimer",
+        )
+        assert q.matcher is q.matcher  # compiled once per question
+        assert q.matcher.match("원금 손실 위험이 있습니다").negative_pass
+        assert not q.matcher.match("수익을 보장합니다").negative_pass
+
+    def test_unknown_check_falls_back_to_refusal(self):
+        assert evaluate_negative("정보가 없습니다", "some_new_check")
+        assert not evaluate_negative("수익률은 10%입니다", "some_new_check")
+
+
 # ---------------------------------------------------------------------------
 # run_evaluation (without LLM judge)
 # ---------------------------------------------------------------------------
@@ -283,6 +330,293 @@ class TestRunEvaluation:
         assert report.details[0].category == "unknown"
 
 
+# ---------------------------------------------------------------------------
+# JudgeExecutor (LLM-as-Judge with a fake bedrock-runtime client)
+# ---------------------------------------------------------------------------
+
+
+class _Throttled(Exception):
+    response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class _FakeBedrock:
+    """invoke_model stand-in scoring each prompt by its position."""
+
+    def __init__(self, reply=None, delay=0.0, throttle=0):
+        self.reply = reply
+        self.delay = delay
+        self.throttle = throttle
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body):
+        prompt = json.loads(body)["messages"][0]["content"]
+        with self._lock:
+            self.prompts.append(prompt)
+            if self.throttle:
+                self.throttle -= 1
+                raise _Throttled()
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            text = self.reply(prompt) if self.reply else (
+                '{"correctness": 4, "faithfulness": 5, "completeness": 3}'
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        payload = json.dumps({"content": [{"text": text}]}).encode()
+        return {"body": io.BytesIO(payload)}
+
+
+def _items(n: int) -> list[JudgeItem]:
+    return [JudgeItem(f"질문 {i}", f"응답 {i}", ["키워드"], "") for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path), \
+            patch("tiger_etf.graphrag.evaluator._executors", {}):
+        yield tmp_path
+
+
+class TestJudgeExecutor:
+    def test_scores_in_order_with_bounded_concurrency(self):
+        client = _FakeBedrock(
+            reply=lambda p: '{"correctness": %s, "faithfulness": 1, "completeness": 1}'
+            % p.split("질문 ")[1][0],
+            delay=0.05,
+        )
+        judge = JudgeExecutor("m", concurrency=3, rate=0, batch_size=1, client=client)
+        scores = judge.score(_items(6))
+        assert [s["correctness"] for s in scores] == [0, 1, 2, 3, 4, 5]
+        assert client.max_in_flight == 3
+
+    def test_rate_limit_spaces_calls(self):
+        judge = JudgeExecutor("m", concurrency=4, rate=20, client=_FakeBedrock())
+        start = time.monotonic()
+        judge.score(_items(5))
+        assert time.monotonic() - start >= 0.19  # 5 calls at 20/s
+
+    def test_throttling_retried(self):
+        client = _FakeBedrock(throttle=2)
+        judge = JudgeExecutor("m", rate=0, max_retries=3, client=client)
+        with patch("tenacity.nap.time.sleep") as sleep:
+            scores = judge.score(_items(1))
+        assert scores[0]["correctness"] == 4
+        assert len(client.prompts) == 3
+        backoffs = [c.args[0] for c in sleep.call_args_list if c.args[0] > 0]
+        assert len(backoffs) == 2
+
+    def test_throttling_exhausted_scores_zero(self):
+        judge = JudgeExecutor("m", rate=0, max_retries=2, client=_FakeBedrock(throttle=5))
+        with patch("tenacity.nap.time.sleep"):
+            assert judge.score(_items(1))[0] == {
+                "correctness": 0.0, "faithfulness": 0.0, "completeness": 0.0,
+            }
+
+    def test_batch_prompt_parsed(self):
+        reply = json.dumps([
+            {"id": 1, "correctness": 5, "faithfulness": 5, "completeness": 5},
+            {"id": 2, "correctness": 2, "faithfulness": 3, "completeness": 1},
+        ])
+        client = _FakeBedrock(reply=lambda p: f"결과:\n{reply}")
+        judge = JudgeExecutor("m", rate=0, batch_size=2, client=client)
+        scores = judge.score(_items(2))
+        assert len(client.prompts) == 1
+        assert "평가 대상 2" in client.prompts[0]
+        assert [s["correctness"] for s in scores] == [5, 2]
+
+    def test_batch_missing_ids_rescored_individually(self):
+        def reply(prompt):
+            if "JSON 배열" in prompt:
+                return '[{"id": 1, "correctness": 5, "faithfulness": 5, "completeness": 5}]'
+            return '{"correctness": 1, "faithfulness": 1, "completeness": 1}'
+
+        client = _FakeBedrock(reply=reply)
+        judge = JudgeExecutor("m", rate=0, batch_size=2, client=client)
+        scores = judge.score(_items(2))
+        assert [s["correctness"] for s in scores] == [5, 1]
+        assert len(client.prompts) == 2
+
+    def test_run_evaluation_uses_one_executor(self):
+        client = _FakeBedrock()
+        judge = JudgeExecutor("m", rate=0, client=client)
+        questions = TestRunEvaluation()._make_questions()
+        results = TestRunEvaluation()._make_results()
+        with patch("tiger_etf.graphrag.evaluator.get_judge_executor", return_value=judge):
+            report = run_evaluation(results, questions, use_llm_judge=True)
+        assert len(client.prompts) == 3
+        assert report.avg_correctness == 4.0
+        assert report.details[2].completeness == 3.0
+
+
+class TestJudgeCache:
+    def test_identical_inputs_not_rescored(self):
+        client = _FakeBedrock()
+        JudgeExecutor("m", rate=0, client=client).score(_items(3))
+        assert len(client.prompts) == 3
+
+        judge = JudgeExecutor("m", rate=0, client=client)
+        scores = judge.score(_items(4))
+        assert len(client.prompts) == 4  # only the new item
+        assert scores[0]["correctness"] == 4
+        assert (judge.cache.hits, judge.cache.misses) == (3, 1)
+
+    @pytest.mark.parametrize("change", [
+        {"response": "다른 응답"},
+        {"expected_answer": "다른 답"},
+        {"model_id": "other-model"},
+    ])
+    def test_key_includes_inputs_and_model(self, change):
+        client = _FakeBedrock()
+        JudgeExecutor("m", rate=0, client=client).score(_items(1))
+
+        model_id = change.pop("model_id", "m")
+        item = _items(1)[0]
+        for k, v in change.items():
+            setattr(item, k, v)
+        JudgeExecutor(model_id, rate=0, client=client).score([item])
+        assert len(client.prompts) == 2
+
+    def test_prompt_change_invalidates(self):
+        client = _FakeBedrock()
+        JudgeExecutor("m", rate=0, client=client).score(_items(1))
+        with patch("tiger_etf.graphrag.evaluator._JUDGE_TEMPLATES", "v2"):
+            JudgeExecutor("m", rate=0, client=client).score(_items(1))
+        assert len(client.prompts) == 2
+
+    def test_failed_scores_not_cached(self):
+        client = _FakeBedrock(reply=lambda p: "평가 불가")
+        JudgeExecutor("m", rate=0, client=client).score(_items(1))
+        JudgeExecutor("m", rate=0, client=client).score(_items(1))
+        assert len(client.prompts) == 2
+
+    def test_hit_rate_in_report(self):
+        client = _FakeBedrock()
+        questions = TestRunEvaluation()._make_questions()
+        results = TestRunEvaluation()._make_results()
+        with patch("tiger_etf.graphrag.evaluator.get_judge_executor",
+                   side_effect=lambda _: JudgeExecutor("m", rate=0, client=client)):
+            first = run_evaluation(results, questions, use_llm_judge=True)
+            second = run_evaluation(results, questions, use_llm_judge=True)
+        assert report_to_dict(first)["llm_judge"]["cache_misses"] == 3
+        assert report_to_dict(second)["llm_judge"]["cache_hits"] == 3
+        assert second.avg_correctness == first.avg_correctness
+        assert len(client.prompts) == 3
+
+
+class TestLatencyMetrics:
+    def _results(self, latencies, errors=0):
+        results = [
+            {"query": f"q{i}", "response": "r", "latency_seconds": lat, "status": "success"}
+            for i, lat in enumerate(latencies)
+        ]
+        results += [
+            {"query": "e", "response": "boom", "latency_seconds": 0.1, "status": "error"}
+        ] * errors
+        return results
+
+    def test_percentiles_error_rate_and_qps(self):
+        report = run_evaluation(
+            self._results([float(i) for i in range(1, 101)], errors=25), [],
+            use_llm_judge=False, wall_clock_seconds=25.0,
+        )
+        assert report.latency_p50 == pytest.approx(50, rel=0.02)
+        assert report.latency_p99 == pytest.approx(99, rel=0.02)
+        assert report.latency_max == 100.0
+        assert report.error_rate == pytest.approx(0.2)
+        assert report.qps == pytest.approx(5.0)
+
+        cs = report.by_category["unknown"]
+        assert cs.latency_p95 == pytest.approx(report.latency_p95)
+        assert cs.error_rate == pytest.approx(0.2)
+
+    def test_serialized_and_formatted(self):
+        report = run_evaluation(self._results([1.0, 2.0, 9.0]), [], use_llm_judge=False)
+        d = report_to_dict(report)
+        assert set(d["latency"]) == {"p50", "p90", "p95", "p99", "max"}
+        assert d["latency"]["max"] == 9.0
+        assert d["qps"] == 0.0  # no wall clock or timestamps
+        assert "p95" in d["by_category"]["unknown"]["latency"]
+        text = format_eval_report(report)
+        assert "p99" in text and "Error Rate" in text
+
+    def test_qps_from_log_timestamps(self, tmp_path):
+        log = tmp_path / "log.jsonl"
+        log.write_text("\n".join(json.dumps(r) for r in [
+            {"question": "a", "response": "r", "latency": 1.0, "ts": 100.0},
+            {"question": "b", "response": "r", "latency": 1.0, "ts": "1970-01-01T00:01:47+00:00"},
+            {"question": "c", "response": "r", "latency": 1.0, "ts": 108.0},
+        ]))
+        assert score_log(log, []).qps == pytest.approx(3 / 9)
+
+
+# ---------------------------------------------------------------------------
+# score_log (offline JSONL scoring)
+# ---------------------------------------------------------------------------
+
+
+class TestScoreLog:
+    def _write_log(self, path: Path, records: list) -> Path:
+        lines = [r if isinstance(r, str) else json.dumps(r, ensure_ascii=False) for r in records]
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    def test_matches_run_evaluation(self, tmp_path):
+        questions = TestRunEvaluation()._make_questions()
+        results = TestRunEvaluation()._make_results()
+        results[1]["status"] = "error"
+        log = self._write_log(tmp_path / "log.jsonl", results)
+
+        expected = report_to_dict(run_evaluation(results, questions, use_llm_judge=False))
+        actual = report_to_dict(score_log(log, questions, chunk_size=2))
+        expected.pop("details")
+        assert actual.pop("details") == []
+        assert actual == expected
+
+    def test_normalized_match_and_field_aliases(self, tmp_path):
+        questions = TestRunEvaluation()._make_questions()
+        log = self._write_log(tmp_path / "log.jsonl", [
+            {"question": "  s&p 500 벤치마크는 ", "response": "S&P500 추종", "latency": 2.0},
+            {"question": "처음 보는 질문", "response": "답", "latency": 4.0},
+            "not json",
+            {"response": "질문 없음"},
+            "",
+        ])
+        report = score_log(log, questions)
+        assert report.total_questions == 2
+        assert report.by_category["single_hop"].keyword_hit_rate == 1.0
+        assert report.by_category["unknown"].count == 1
+        assert report.avg_latency == 3.0
+
+    def test_unknown_questions_do_not_dilute_keyword_metrics(self, tmp_path):
+        questions = TestRunEvaluation()._make_questions()
+        log = self._write_log(tmp_path / "log.jsonl", [
+            {"question": "S&P 500 벤치마크는?", "response": "S&P500 추종", "latency": 1.0},
+            {"question": "처음 보는 질문", "response": "답", "latency": 2.0},
+            {"question": "또 다른 질문", "response": "답", "latency": 3.0},
+        ])
+        report = score_log(log, questions)
+        assert report.total_questions == 3
+        assert report.keyword_hit_rate == 1.0
+        assert report.keyword_coverage == report.by_category["single_hop"].keyword_coverage
+        assert report.by_category["unknown"].keyword_hit_rate == 0.0
+        assert report.avg_latency == 2.0
+
+    def test_gzip(self, tmp_path):
+        import gzip
+
+        path = tmp_path / "log.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"query": "환헤지 여부?", "response": "환율", "latency_seconds": 1}) + "\n")
+        report = score_log(path, TestRunEvaluation()._make_questions())
+        assert report.keyword_hit_rate == 1.0
+
+
 # ---------------------------------------------------------------------------
 # report_to_dict
 # ---------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+"""Tests for the experiment eval-query runner."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+from tiger_etf.graphrag.experiment import run_eval_queries
+from tiger_etf.graphrag.query import QueryResult
+
+
+class _FakeQuery:
+    """run_query stand-in: sleeps per question and tracks concurrency."""
+
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.routes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, question, use_cache=None, route=None):
+        assert use_cache is False
+        self.routes.append(route)
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(question, 0.05))
+            if question == "boom":
+                raise RuntimeError("throttled")
+            return QueryResult(response=f"answer to {question}", setup_seconds=0.01)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _run(questions, fake, **kwargs):
+    with patch("tiger_etf.graphrag.query.run_query", side_effect=fake):
+        return run_eval_queries({"eval_queries": questions}, **kwargs)
+
+
+class TestRunEvalQueries:
+    def test_preserves_order_and_schema(self):
+        fake = _FakeQuery({"q0": 0.2, "q1": 0.01, "q2": 0.1})
+        results = _run(["q0", "q1", "q2"], fake, concurrency=3)
+        assert [r["query"] for r in results] == ["q0", "q1", "q2"]
+        assert results[0] == {
+            "query": "q0",
+            "response": "answer to q0",
+            "latency_seconds": results[0]["latency_seconds"],
+            "setup_seconds": 0.01,
+            "route": "graph",
+            "intent": "",
+            "status": "success",
+        }
+        assert results[0]["latency_seconds"] >= 0.2
+        # Eval questions skip the SQL router unless the config opts in
+        assert fake.routes == [False] * 3
+
+    def test_routing_opt_in(self):
+        fake = _FakeQuery({})
+        with patch("tiger_etf.graphrag.query.run_query", side_effect=fake):
+            run_eval_queries({"eval_queries": ["q"], "route": True})
+        assert fake.routes == [True]
+
+    def test_bounded_concurrency_is_faster(self):
+        questions = [f"q{i}" for i in range(8)]
+        fake = _FakeQuery({q: 0.1 for q in questions})
+        start = time.time()
+        results = _run(questions, fake, concurrency=4)
+        wall = time.time() - start
+
+        assert fake.max_in_flight == 4
+        assert wall < 0.5  # serial would take 0.8s
+        # Per-query latency excludes time spent waiting for a slot
+        assert all(r["latency_seconds"] < 0.2 for r in results)
+
+    def test_errors_and_timeouts_recorded(self):
+        fake = _FakeQuery({"slow": 1.0})
+        results = _run(["boom", "slow", "ok"], fake, concurrency=3, timeout=0.2)
+
+        assert [r["status"] for r in results] == ["error", "error", "success"]
+        assert results[0]["response"] == "throttled"
+        assert results[1]["response"] == "Timed out after 0s"
+        assert results[1]["latency_seconds"] < 0.5
+
+    def test_timed_out_query_keeps_its_slot(self):
+        fake = _FakeQuery({"slow": 0.3, "next": 0.01})
+        _run(["slow", "next"], fake, concurrency=1, timeout=0.05)
+        assert fake.max_in_flight == 1
+
+    def test_hung_queries_do_not_block_later_questions(self):
+        hung = threading.Event()
+        fake = _FakeQuery({})
+
+        def engine(question, use_cache=None, route=None):
+            if question.startswith("hang"):
+                hung.wait(5)
+            return fake(question, use_cache=use_cache, route=route)
+
+        start = time.monotonic()
+        try:
+            results = _run(["hang0", "hang1", "q0", "q1"], engine, concurrency=2, timeout=0.1)
+        finally:
+            hung.set()
+        assert time.monotonic() - start < 2
+        assert [r["status"] for r in results] == ["error"] * 4
+        assert "waiting for a query slot" in results[2]["response"]
+
+
+class TestStageBreakdown:
+    def test_profile_attached_to_eval_result(self):
+        from tiger_etf.graphrag.query_profile import QueryProfile
+
+        profile = QueryProfile(total_seconds=1.23456, graph_seconds=0.5, retrieved_nodes=7)
+        result = QueryResult(response="a", profile=profile)
+        with patch("tiger_etf.graphrag.query.run_query", return_value=result):
+            [record] = run_eval_queries({"eval_queries": ["q"]})
+        assert record["stages"]["total_seconds"] == 1.235
+        assert record["stages"]["retrieved_nodes"] == 7
+
+
+class TestRescoreResult:
+    def test_rescores_saved_results(self, tmp_path):
+        from tiger_etf.graphrag.experiment import rescore_result
+
+        questions = tmp_path / "q.yaml"
+        questions.write_text('single_hop:\n  - query: "q0"\n    expected_keywords: ["answer"]\n')
+        result = {
+            "name": "old",
+            "eval_results": [
+                {"query": "q0", "response": "answer to q0", "latency_seconds": 1.0,
+                 "status": "success"},
+            ],
+            "evaluation": {"overall_score": 0.0},
+        }
+        rescore_result(result, use_llm_judge=False, eval_questions_path=questions)
+        assert result["evaluation"]["keyword_hit_rate"] == 1.0
+        assert result["evaluation"]["total_questions"] == 1
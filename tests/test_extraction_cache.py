@@ -0,0 +1,118 @@
+"""Tests for the persistent extraction LLM cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.prompts import PromptTemplate
+from llama_index.core.schema import Document
+
+from tiger_etf.graphrag import extraction_cache
+from tiger_etf.graphrag.extraction_cache import CachedExtractionLLM, ExtractionCache
+
+PROMPT = PromptTemplate("Extract from {text}\nclasses: {preferred_entity_classifications}")
+
+
+class CountingLLM(MockLLM):
+    calls: int = 0
+
+    def predict(self, prompt, **prompt_args):
+        self.calls += 1
+        return f"extracted {prompt_args['text']}"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path), \
+            patch.object(extraction_cache, "_active", None):
+        yield tmp_path
+
+
+def _install(model_id="model-a"):
+    config = SimpleNamespace(extraction_llm=CountingLLM())
+    wrapped = extraction_cache.install(config, model_id)
+    return config, wrapped
+
+
+class TestExtractionCache:
+    def test_lru_eviction(self, tmp_path):
+        cache = ExtractionCache(tmp_path / "c.sqlite3", max_bytes=10)
+        cache.put("a", "m", "12345")
+        cache.put("b", "m", "12345")
+        cache.get("a")
+        cache.put("c", "m", "12345")
+        assert cache.get("a") == "12345"
+        assert cache.get("b") is None
+        assert cache.get("c") == "12345"
+
+    def test_stats_per_run(self, tmp_path):
+        cache = ExtractionCache(tmp_path / "c.sqlite3")
+        cache.put("a", "m", "x")
+        cache.get("a", run_id="r1")
+        cache.get("b", run_id="r1")
+        cache.get("a", run_id="r2")
+        assert cache.stats("r1") == (1, 1)
+        assert cache.stats("r2") == (1, 0)
+
+
+class TestCachedExtractionLLM:
+    def test_second_run_is_served_from_cache(self, data_dir):
+        config, first = _install()
+        first.predict(PROMPT, text="chunk 1", preferred_entity_classifications="ETF")
+        assert first.llm.calls == 1
+        assert first.stats() == (0, 1)
+
+        config, second = _install()
+        out = second.predict(PROMPT, text="chunk 1", preferred_entity_classifications="ETF")
+        assert out == "extracted chunk 1"
+        assert second.llm.calls == 0
+        assert second.stats() == (1, 0)
+        assert config.extraction_llm is second
+
+    def test_key_ignores_preferred_topics(self, data_dir):
+        _, llm = _install()
+        llm.predict(PROMPT, text="c", preferred_entity_classifications="ETF", preferred_topics="a")
+        llm.predict(PROMPT, text="c", preferred_entity_classifications="ETF", preferred_topics="b")
+        assert llm.llm.calls == 1
+
+    @pytest.mark.parametrize("change", [
+        {"text": "other chunk"},
+        {"preferred_entity_classifications": "Stock"},
+        {"model_id": "model-b"},
+    ])
+    def test_key_includes_chunk_prompt_and_model(self, data_dir, change):
+        _, llm = _install()
+        llm.predict(PROMPT, text="c", preferred_entity_classifications="ETF")
+
+        args = {"text": "c", "preferred_entity_classifications": "ETF"}
+        model_id = change.pop("model_id", "model-a")
+        args.update(change)
+        _, llm = _install(model_id)
+        llm.predict(PROMPT, **args)
+        assert llm.llm.calls == 1
+
+    def test_disabled(self, data_dir):
+        with patch("tiger_etf.config.settings.graphrag_extraction_cache_enabled", False):
+            config, wrapped = _install()
+        assert wrapped is None
+        assert isinstance(config.extraction_llm, CountingLLM)
+        assert extraction_cache.active() is None
+
+    def test_build_index_reports_hit_rate(self, data_dir, caplog):
+        from tiger_etf.graphrag.indexer import build_index
+
+        _, llm = _install()
+
+        def extract(batch, **kwargs):
+            for doc in batch:
+                llm.predict(PROMPT, text=doc.text, preferred_entity_classifications="ETF")
+
+        graph_index = MagicMock()
+        graph_index.extract_and_build.side_effect = extract
+        docs = [Document(text=t, metadata={"file_name": f"{t}.pdf"}) for t in ("a", "b", "a")]
+        with caplog.at_level("INFO"):
+            build_index(docs, graph_index=graph_index)
+        assert "Extraction cache: 1 hits, 2 misses (33% hit rate)" in caplog.text
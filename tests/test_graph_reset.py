@@ -0,0 +1,167 @@
+"""Tests for the batched, resumable graph reset."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from tiger_etf.graphrag.graph_reset import BatchSizer, GraphResetter, ResetCheckpoint
+
+
+class _FakeGraph:
+    """Label -> node count; answers label counts and LIMITed deletes."""
+
+    def __init__(self, nodes, fail_times=0, error=TimeoutError("TimeLimitExceededException")):
+        self.nodes = dict(nodes)
+        self.fail_times = fail_times
+        self.error = error
+        self.deletes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, cypher, parameters=None):
+        with self.lock:
+            if cypher.startswith("MATCH (n) RETURN labels"):
+                return [{"labels": [k] if k else [], "cnt": v} for k, v in self.nodes.items() if v]
+            m = re.match(r"MATCH \(n(?::`([^`]*)`)?\) WITH n LIMIT \$limit DETACH DELETE n", cypher)
+            assert m, cypher
+            label, limit = m.group(1), parameters["limit"]
+            self.deletes.append((label or "", limit))
+            if self.fail_times:
+                self.fail_times -= 1
+                raise self.error
+            if label is None:
+                n = min(limit, sum(self.nodes.values()))
+                left = n
+                for k in self.nodes:
+                    take = min(left, self.nodes[k])
+                    self.nodes[k] -= take
+                    left -= take
+            else:
+                n = min(limit, self.nodes.get(label, 0))
+                self.nodes[label] -= n
+            return [{"cnt": n}]
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return tmp_path / "reset_checkpoint.json"
+
+
+class TestBatchSizer:
+    def test_steers_towards_target(self):
+        sizer = BatchSizer(1000, target_seconds=4.0, minimum=100, maximum=3000)
+        sizer.observe(1.0)
+        assert sizer.size == 2000
+        sizer.observe(3.0)
+        assert sizer.size == 2000
+        sizer.observe(1.0)
+        assert sizer.size == 3000
+        sizer.observe(9.0)
+        assert sizer.size == 1500
+        for _ in range(10):
+            sizer.failed()
+        assert sizer.size == 100
+
+
+class TestGraphResetter:
+    def test_deletes_every_partition(self, checkpoint):
+        graph = _FakeGraph({"__Entity__": 750, "__Fact__": 120, "": 5})
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=2, batch_size=100,
+            max_batch_size=400, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        report = resetter.reset()
+        assert sum(graph.nodes.values()) == 0
+        assert (report.total, report.deleted, report.resumed_from) == (875, 875, 0)
+        assert report.labels == {"__Entity__": 750, "__Fact__": 120, "": 5}
+        # Fast batches double up to the cap
+        assert [limit for label, limit in graph.deletes if label == "__Entity__"] == [100, 200, 400, 400]
+        assert not checkpoint.exists()
+
+    def test_failed_batch_retried_smaller(self, checkpoint):
+        graph = _FakeGraph({"__Entity__": 300}, fail_times=1)
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=1, batch_size=400,
+            max_batch_size=400, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        with patch("tiger_etf.graphrag.graph_reset.time.sleep") as sleep:
+            report = resetter.reset()
+        sleep.assert_called_once()
+        assert report.retries == 1
+        assert graph.deletes[:2] == [("__Entity__", 400), ("__Entity__", 200)]
+        assert report.deleted == 300
+
+    def test_concurrent_modification_not_counted_towards_limit(self, checkpoint):
+        error = RuntimeError("ConcurrentModificationException: Operation failed due to conflicting concurrent operations")
+        graph = _FakeGraph({"__Entity__": 300}, fail_times=8, error=error)
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=1, batch_size=400,
+            max_batch_size=400, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        with patch("tiger_etf.graphrag.graph_reset.time.sleep"):
+            report = resetter.reset()
+        assert report.retries == 8
+        assert report.deleted == 300
+
+    def test_persistent_concurrent_modification_gives_up(self, checkpoint):
+        error = RuntimeError("ConcurrentModificationException: Operation failed due to conflicting concurrent operations")
+        graph = _FakeGraph({"__Entity__": 300}, fail_times=1000, error=error)
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=1, batch_size=400,
+            max_batch_size=400, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        with patch("tiger_etf.graphrag.graph_reset.time.sleep"), pytest.raises(RuntimeError):
+            resetter.reset()
+        assert len(graph.deletes) == 51
+
+    def test_other_errors_give_up_after_limit(self, checkpoint):
+        graph = _FakeGraph({"__Entity__": 300}, fail_times=8)
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=1, batch_size=400,
+            max_batch_size=400, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        with patch("tiger_etf.graphrag.graph_reset.time.sleep"), pytest.raises(TimeoutError):
+            resetter.reset()
+
+    def test_resumes_from_checkpoint(self, checkpoint):
+        ResetCheckpoint(
+            graph_store="neptune-db://g", started_at="2026-01-01T00:00:00+00:00",
+            deleted={"__Entity__": 300}, batch_sizes={"__Entity__": 800},
+        ).save(checkpoint)
+        graph = _FakeGraph({"__Entity__": 500})
+        resetter = GraphResetter(
+            graph, "neptune-db://g", workers=1, batch_size=100,
+            max_batch_size=1000, target_seconds=60, checkpoint_path=checkpoint,
+        )
+        report = resetter.reset()
+        assert graph.deletes[0] == ("__Entity__", 800)
+        assert (report.total, report.deleted, report.resumed_from) == (800, 800, 300)
+
+    def test_checkpoint_of_other_store_ignored(self, checkpoint):
+        ResetCheckpoint(
+            graph_store="neptune-db://other", started_at="x", deleted={"A": 10},
+        ).save(checkpoint)
+        assert ResetCheckpoint.load(checkpoint, "neptune-db://g") is None
+        checkpoint.write_text("not json")
+        assert ResetCheckpoint.load(checkpoint, "neptune-db://other") is None
+
+    def test_checkpoint_written_per_batch(self, checkpoint):
+        graph = _FakeGraph({"A": 250})
+        saved = []
+        original = ResetCheckpoint.save
+
+        def save(self, path):
+            original(self, path)
+            saved.append(json.loads(path.read_text())["deleted"])
+
+        resetter = GraphResetter(
+            graph, "g", workers=1, batch_size=100, max_batch_size=100,
+            target_seconds=60, checkpoint_path=checkpoint,
+        )
+        with patch.object(ResetCheckpoint, "save", save):
+            resetter.reset()
+        assert saved == [{"A": 100}, {"A": 200}, {"A": 250}, {"A": 250, "": 0}]
@@ -0,0 +1,62 @@
+"""Tests for the local intent classifier."""
+
+from __future__ import annotations
+
+import pytest
+
+from tiger_etf.graphrag.intent import Intent, classify_intent
+
+
+class TestClassifyIntent:
+    @pytest.mark.parametrize("question, intent", [
+        ("TIGER 미국S&P500의 총보수는?", Intent.ATTRIBUTE),
+        ("TIGER 미국S&P500 ETF의 상장일은 언제인가요?", Intent.ATTRIBUTE),
+        ("360750 기준가 알려줘", Intent.ATTRIBUTE),
+        ("채권 ETF 중 총보수가 가장 낮은 상품은?", Intent.FILTER),
+        ("순자산총액(AUM) 기준 상위 5개 TIGER ETF는?", Intent.FILTER),
+        ("TIGER 미국S&P500의 총보수 비율은?", Intent.ATTRIBUTE),
+        ("TIGER 200의 상장주식수 합계는?", Intent.ATTRIBUTE),
+        ("섹터별로 TIGER ETF 상품이 몇 개씩 있나요?", Intent.AGGREGATE),
+        ("TIGER NVDA-UST 커버드콜 ETF의 수탁회사는 어디인가요?", Intent.RELATION),
+        ("KOSPI 200 지수를 추적하는 ETF의 보유종목이 속한 섹터 분포는?", Intent.MULTI_HOP),
+        ("TIGER 미국S&P500 ETF의 주요 투자위험은?", Intent.OPEN),
+        ("TIGER 미국S&P500과 TIGER 미국나스닥100의 차이는?", Intent.OPEN),
+    ])
+    def test_intents(self, question, intent):
+        assert classify_intent(question).intent is intent
+
+    def test_structured(self):
+        assert Intent.ATTRIBUTE.structured and Intent.AGGREGATE.structured
+        assert not Intent.RELATION.structured and not Intent.OPEN.structured
+
+    def test_product_mentions(self):
+        r = classify_intent("TIGER NVDA-UST 커버드콜 ETF의 총보수와 순자산은?")
+        assert r.products == ("tiger nvda-ust 커버드콜",)
+        assert r.attributes == ("total_expense_ratio", "aum")
+
+        r = classify_intent("TIGER 미국S&P500 상장일은?")
+        assert r.products == ("tiger 미국s&p500 상장일",)  # trimmed by the resolver
+        assert classify_intent("TIGER ETF 상품들의 총보수").products == ()
+
+    def test_filter_slots(self):
+        r = classify_intent("순자산총액(AUM) 기준 상위 5개 TIGER ETF는?")
+        assert (r.order, r.limit, r.attributes) == ("desc", 5, ("aum",))
+
+        r = classify_intent("채권 ETF 중 총보수가 가장 낮은 상품은?")
+        assert (r.keywords, r.order, r.limit) == (("채권",), "asc", 1)
+
+        r = classify_intent("총보수가 가장 비싼 상품과 가장 저렴한 상품은?")
+        assert r.order == "both"
+
+    def test_keywords_exclude_product_names(self):
+        r = classify_intent("TIGER 미국배당다우존스 ETF의 분배금은?")
+        assert r.keywords == ()
+        assert r.attributes == ("distributions",)
+
+    def test_dates(self):
+        r = classify_intent("TIGER 미국S&P500 ETF의 2025년 12월 분배금은 얼마였나요?")
+        assert (r.year, r.month) == (2025, 12)
+        r = classify_intent("2024년에 상장된 TIGER ETF 신규 상품은 어떤 것들이 있나요?")
+        assert r.intent is Intent.FILTER
+        assert r.attributes == ("listing_date",)
+        assert classify_intent("TIGER 미국S&P500의 3개월 수익률은?").limit is None
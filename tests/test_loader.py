@@ -0,0 +1,155 @@
+"""Tests for PDF/RDB document loading."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import patch
+
+import fitz
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from tiger_etf.graphrag.loader import iter_pdfs, load_pdfs, load_rdb
+from tiger_etf.models import Base, EtfDistribution, EtfHolding, EtfProduct
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(element, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def pdf_dir(tmp_path):
+    pdfs = tmp_path / "pdfs"
+    pdfs.mkdir()
+    for i in range(4):
+        doc = fitz.open()
+        for page in range(2):
+            doc.new_page().insert_text((72, 72), f"doc {i} page {page}")
+        doc.save(pdfs / f"KR700000000{i}_prospectus_abcd{i:04d}.pdf")
+        doc.close()
+    (pdfs / "KR7999999999_factsheet_broken0.pdf").write_bytes(b"not a pdf")
+
+    with patch("tiger_etf.config.settings.data_dir", tmp_path), \
+            patch("tiger_etf.graphrag.loader._build_ticker_map",
+                  return_value={"KR7000000001": "360750"}):
+        yield pdfs
+
+
+class TestLoadPdfs:
+    def test_sequential(self, pdf_dir):
+        docs = load_pdfs(num_workers=1)
+        assert len(docs) == 8
+        assert docs[0].metadata["ksd_fund_code"] == "KR7000000000"
+        assert docs[0].metadata["doc_type"] == "prospectus"
+        assert docs[2].metadata["ticker"] == "360750"
+
+    def test_process_pool_matches_sequential(self, pdf_dir):
+        sequential = load_pdfs(num_workers=1)
+        parallel = load_pdfs(num_workers=3)
+        assert [d.text for d in parallel] == [d.text for d in sequential]
+        assert [d.metadata for d in parallel] == [d.metadata for d in sequential]
+
+    def test_broken_pdf_isolated(self, pdf_dir, caplog):
+        docs = load_pdfs(num_workers=2)
+        assert all("broken" not in d.metadata["file_name"] for d in docs)
+        assert "KR7999999999_factsheet_broken0.pdf" in caplog.text
+
+    def test_explicit_file_list(self, pdf_dir):
+        files = sorted(pdf_dir.glob("*.pdf"))[1:2]
+        docs = load_pdfs(pdf_files=files)
+        assert {d.metadata["file_name"] for d in docs} == {files[0].name}
+
+    def test_iter_pdfs_streams_in_order(self, pdf_dir):
+        stream = iter_pdfs(num_workers=2)
+        first = next(stream)
+        assert first.metadata["file_name"] == "KR7000000000_prospectus_abcd0000.pdf"
+        rest = list(stream)
+        assert [d.text for d in [first, *rest]] == [d.text for d in load_pdfs(num_workers=1)]
+
+
+@pytest.fixture
+def rdb():
+    """In-memory SQLite database with the tiger_etf schema."""
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS tiger_etf")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i, code in enumerate(["KR7000000001", "KR7000000002", "KR7000000003"]):
+            session.add(EtfProduct(
+                ksd_fund_code=code, ticker=f"36075{i}", name_ko=f"TIGER 테스트{i}",
+                total_expense_ratio=0.07, aum=123456789, currency_hedge=bool(i % 2),
+            ))
+        session.flush()
+        for day in (1, 2):
+            for k in range(25):
+                session.add(EtfHolding(
+                    ksd_fund_code="KR7000000001", as_of_date=date(2025, 1, day),
+                    holding_name=f"종목{day}-{k}", weight_pct=k,
+                ))
+        for month in range(1, 8):
+            session.add(EtfDistribution(
+                ksd_fund_code="KR7000000002", record_date=date(2025, month, 1),
+                amount_per_share=100 * month,
+            ))
+        session.commit()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda *args: queries.append(args[2]))
+
+    @contextmanager
+    def reader_session():
+        with Session(engine) as session:
+            yield session
+
+    with patch("tiger_etf.graphrag.loader.get_reader_session", reader_session):
+        yield queries
+
+
+class TestLoadRdb:
+    def test_documents(self, rdb):
+        docs = load_rdb()
+        assert [d.metadata["ksd_fund_code"] for d in docs] == [
+            "KR7000000001", "KR7000000002", "KR7000000003",
+        ]
+
+        lines = docs[0].text.split("\n")
+        assert lines[:5] == [
+            "ETF 상품명: TIGER 테스트0",
+            "티커: 360750",
+            "KSD 펀드코드: KR7000000001",
+            "총보수: 0.0700%",
+            "순자산총액(AUM): 123,456,789 원",
+        ]
+        holdings = [line for line in lines if line.startswith("  - ")]
+        # Latest date only, highest weight first, capped at 20
+        assert len(holdings) == 20
+        assert holdings[0] == "  - 종목2-24 (24.0000%)"
+        assert holdings[-1] == "  - 종목2-5 (5.0000%)"
+
+        assert docs[1].text.endswith(
+            "최근 분배금:\n"
+            "  - 2025-07-01: 700원\n  - 2025-06-01: 600원\n  - 2025-05-01: 500원\n"
+            "  - 2025-04-01: 400원\n  - 2025-03-01: 300원"
+        )
+        assert "주요 보유종목" not in docs[2].text
+        assert "최근 분배금" not in docs[2].text
+
+    def test_constant_number_of_queries(self, rdb):
+        load_rdb()
+        selects = [q for q in rdb if q.lstrip().upper().startswith("SELECT")]
+        # products + one windowed query each for holdings and distributions
+        assert len(selects) == 3
+        assert sum("row_number() OVER" in q for q in selects) == 2
+
+    def test_limit(self, rdb):
+        assert [d.metadata["ksd_fund_code"] for d in load_rdb(limit=1)] == ["KR7000000001"]
@@ -0,0 +1,202 @@
+"""Tests for the index manifest and incremental builds."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.schema import Document
+
+from tiger_etf.graphrag.manifest import IndexManifest, file_sha256, pdf_key
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path):
+        yield tmp_path
+
+
+def _write_pdf(data_dir, name: str, content: bytes):
+    path = data_dir / "pdfs" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def _fake_iter_pdfs(limit=None, pdf_files=None):
+    for p in pdf_files:
+        yield Document(text=p.read_text(), metadata={"file_name": p.name})
+
+
+def _build(**kwargs):
+    from tiger_etf.graphrag.indexer import build_from_pdfs
+
+    graph_index = MagicMock()
+    with patch("tiger_etf.graphrag.indexer._make_index", return_value=graph_index), \
+            patch("tiger_etf.graphrag.loader.iter_pdfs", side_effect=_fake_iter_pdfs):
+        build_from_pdfs(**kwargs)
+    return graph_index
+
+
+class TestIndexManifest:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "m.json"
+        m = IndexManifest(path)
+        m.record("pdf:a.pdf", "h1", "fp", {"file_name": "a.pdf"})
+        m.save()
+
+        loaded = IndexManifest.load(path)
+        assert loaded.is_current("pdf:a.pdf", "h1", "fp")
+        assert not loaded.is_current("pdf:a.pdf", "h2", "fp")
+        assert not loaded.is_current("pdf:a.pdf", "h1", "other-fp")
+
+    def test_stale_keys_and_tombstone(self, tmp_path):
+        m = IndexManifest(tmp_path / "m.json")
+        m.record("pdf:a.pdf", "h", "fp", {})
+        m.record("pdf:b.pdf", "h", "fp", {})
+        m.record("rdb:KR1", "h", "fp", {})
+        assert m.stale_keys("pdf:", {"pdf:a.pdf"}) == ["pdf:b.pdf"]
+
+        m.tombstone("pdf:b.pdf")
+        assert m.stale_keys("pdf:", {"pdf:a.pdf"}) == []
+        assert not m.is_indexed("pdf:b.pdf")
+
+    def test_file_sha256_matches_hashlib(self, tmp_path):
+        import hashlib
+
+        p = tmp_path / "f.bin"
+        p.write_bytes(b"x" * 3000)
+        assert file_sha256(p, chunk_size=1024) == hashlib.sha256(b"x" * 3000).hexdigest()
+
+
+class TestIncrementalBuild:
+    def test_full_build_records_manifest(self, data_dir):
+        _write_pdf(data_dir, "KR1_prospectus_aaaa.pdf", b"one")
+        graph_index = _build()
+
+        docs = graph_index.extract_and_build.call_args[0][0]
+        assert [d.metadata["file_name"] for d in docs] == ["KR1_prospectus_aaaa.pdf"]
+        assert IndexManifest.load().is_indexed("pdf:KR1_prospectus_aaaa.pdf")
+
+    def test_incremental_skips_unchanged(self, data_dir):
+        _write_pdf(data_dir, "KR1_prospectus_aaaa.pdf", b"one")
+        _build()
+        _write_pdf(data_dir, "KR2_prospectus_bbbb.pdf", b"two")
+
+        graph_index = _build(incremental=True)
+
+        docs = graph_index.extract_and_build.call_args[0][0]
+        assert [d.metadata["file_name"] for d in docs] == ["KR2_prospectus_bbbb.pdf"]
+        graph_index.delete_sources.assert_not_called()
+
+    def test_incremental_reextracts_changed_and_tombstones_removed(self, data_dir):
+        a = _write_pdf(data_dir, "KR1_prospectus_aaaa.pdf", b"one")
+        b = _write_pdf(data_dir, "KR2_prospectus_bbbb.pdf", b"two")
+        _build()
+        a.write_bytes(b"one-v2")
+        b.unlink()
+
+        graph_index = _build(incremental=True)
+
+        docs = graph_index.extract_and_build.call_args[0][0]
+        assert [d.text for d in docs] == ["one-v2"]
+        filters = [c.kwargs["filter"] for c in graph_index.delete_sources.call_args_list]
+        # Removed sources go first; a changed one right before its batch
+        assert filters == [
+            {"file_name": "KR2_prospectus_bbbb.pdf"},
+            {"file_name": "KR1_prospectus_aaaa.pdf"},
+        ]
+        manifest = IndexManifest.load()
+        assert manifest.is_current(pdf_key(a), file_sha256(a), manifest.entries[pdf_key(a)].fingerprint)
+        assert manifest.entries["pdf:KR2_prospectus_bbbb.pdf"].removed_at is not None
+
+    def test_fingerprint_change_reextracts(self, data_dir):
+        _write_pdf(data_dir, "KR1_prospectus_aaaa.pdf", b"one")
+        _build()
+
+        with patch("tiger_etf.graphrag.indexer.extraction_fingerprint", return_value="new"):
+            graph_index = _build(incremental=True)
+
+        assert graph_index.extract_and_build.called
+
+    def test_up_to_date_skips_index(self, data_dir):
+        _write_pdf(data_dir, "KR1_prospectus_aaaa.pdf", b"one")
+        _build()
+
+        with patch("tiger_etf.graphrag.indexer._make_index") as make_index, \
+                patch("tiger_etf.graphrag.loader.iter_pdfs", side_effect=_fake_iter_pdfs):
+            from tiger_etf.graphrag.indexer import build_from_pdfs
+
+            build_from_pdfs(incremental=True)
+        make_index.assert_not_called()
+
+    def test_interrupted_build_resumes_after_last_batch(self, data_dir):
+        for i in range(3):
+            _write_pdf(data_dir, f"KR{i}_prospectus_{i:04d}.pdf", f"doc{i}".encode())
+
+        graph_index = MagicMock()
+        graph_index.extract_and_build.side_effect = [None, RuntimeError("throttled")]
+        with patch("tiger_etf.config.settings.graphrag_build_batch_size", 1), \
+                patch("tiger_etf.graphrag.indexer._make_index", return_value=graph_index), \
+                patch("tiger_etf.graphrag.loader.iter_pdfs", side_effect=_fake_iter_pdfs):
+            from tiger_etf.graphrag.indexer import build_from_pdfs
+
+            with pytest.raises(RuntimeError):
+                build_from_pdfs(incremental=True)
+
+        assert list(IndexManifest.load().entries) == ["pdf:KR0_prospectus_0000.pdf"]
+        with patch("tiger_etf.config.settings.graphrag_build_batch_size", 1):
+            graph_index = _build(incremental=True)
+        built = [c.args[0][0].metadata["file_name"] for c in graph_index.extract_and_build.call_args_list]
+        assert built == ["KR1_prospectus_0001.pdf", "KR2_prospectus_0002.pdf"]
+
+
+class TestBuildIndex:
+    def _docs(self, pages_per_file):
+        for name, pages in pages_per_file:
+            for page in range(pages):
+                yield Document(text=f"{name} {page}", metadata={"file_name": name})
+
+    def test_batches_keep_file_pages_together(self, data_dir):
+        from tiger_etf.graphrag.indexer import build_index
+
+        graph_index = MagicMock()
+        count = build_index(
+            self._docs([("a.pdf", 3), ("b.pdf", 1), ("c.pdf", 2)]),
+            graph_index=graph_index, batch_size=2,
+        )
+
+        batches = [[d.text for d in c.args[0]] for c in graph_index.extract_and_build.call_args_list]
+        assert batches == [["a.pdf 0", "a.pdf 1", "a.pdf 2"], ["b.pdf 0", "c.pdf 0", "c.pdf 1"]]
+        assert count == 6
+
+    def test_consumes_lazily(self, data_dir):
+        from tiger_etf.graphrag.indexer import build_index
+
+        produced = []
+
+        def docs():
+            for i in range(10):
+                produced.append(i)
+                yield Document(text=str(i), metadata={"file_name": f"{i}.pdf"})
+
+        seen_before_first_batch = []
+        graph_index = MagicMock()
+        graph_index.extract_and_build.side_effect = (
+            lambda batch, **kw: seen_before_first_batch.append(len(produced))
+        )
+        build_index(docs(), graph_index=graph_index, batch_size=2)
+
+        # The producer runs at most a batch or two ahead of extraction
+        assert seen_before_first_batch[0] <= 7
+        assert produced == list(range(10))
+
+    def test_loader_error_propagates(self, data_dir):
+        from tiger_etf.graphrag.indexer import build_index
+
+        def docs():
+            yield Document(text="ok", metadata={"file_name": "a.pdf"})
+            raise OSError("disk gone")
+
+        with pytest.raises(OSError, match="disk gone"):
+            build_index(docs(), graph_index=MagicMock(), batch_size=1)
@@ -0,0 +1,69 @@
+"""Tests for the streaming quantile sketch."""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from tiger_etf.utils.quantile import QuantileSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered) - 1e-9)) - 1]
+
+
+class TestQuantileSketch:
+    def test_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.count == 0
+
+    @pytest.mark.parametrize("q", [0.0, 0.5, 0.9, 0.95, 0.99, 1.0])
+    def test_relative_accuracy(self, q):
+        rng = random.Random(1)
+        values = [rng.lognormvariate(1.0, 1.2) for _ in range(20_000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.011)
+
+    @pytest.mark.parametrize("values", [[1.0, 2.0, 3.0], [float(i) for i in range(1, 51)]])
+    @pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+    def test_small_samples_match_nearest_rank(self, values, q):
+        sketch = QuantileSketch()
+        for v in values:
+            sketch.add(v)
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+
+    def test_tail_reports_slow_outlier(self):
+        sketch = QuantileSketch()
+        for v in [1.0] * 20 + [30.0]:
+            sketch.add(v)
+        assert sketch.quantile(0.99) == pytest.approx(30.0, rel=0.01)
+        assert sketch.quantile(0.5) == pytest.approx(1.0, rel=0.01)
+
+    def test_bounded_memory(self):
+        sketch = QuantileSketch()
+        for i in range(100_000):
+            sketch.add(0.01 + (i % 1000) * 0.1)
+        assert len(sketch._bins) < 600
+        assert sketch.quantile(1.0) == sketch.max
+
+    def test_zeros_and_merge(self):
+        a, b = QuantileSketch(), QuantileSketch()
+        for v in (0.0, 0.0, 1.0):
+            a.add(v)
+        for v in (2.0, 4.0):
+            b.add(v)
+        a.merge(b)
+        assert a.count == 5
+        assert a.quantile(0.25) == 0.0
+        assert a.quantile(0.5) == pytest.approx(1.0, rel=0.01)
+        assert a.max == 4.0
+
+        with pytest.raises(ValueError):
+            a.merge(QuantileSketch(relative_accuracy=0.05))
@@ -0,0 +1,107 @@
+"""Tests for the pooled query engine."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tiger_etf.graphrag import query as query_mod
+from tiger_etf.graphrag.query import QueryEnginePool, _PooledEngine
+
+
+def _builder():
+    built = []
+
+    def build(key):
+        entry = _PooledEngine(engine=MagicMock(name=f"engine{len(built)}"), graph_store=MagicMock())
+        built.append((key, entry))
+        return entry
+
+    return build, built
+
+
+@pytest.fixture
+def pool():
+    build, built = _builder()
+    pool = QueryEnginePool(builder=build)
+    with patch.object(query_mod, "_engine_pool", pool), \
+            patch("tiger_etf.config.settings.graphrag_query_cache_enabled", False):
+        yield pool, built
+
+
+class TestQueryEnginePool:
+    def test_engine_reused_across_queries(self, pool):
+        pool, built = pool
+        for _ in range(3):
+            query_mod.query("q")
+        assert len(built) == 1
+        assert built[0][1].uses == 3
+
+    def test_new_engine_per_configuration(self, pool):
+        pool, built = pool
+        first, _ = pool.acquire()
+        with patch("tiger_etf.config.settings.graphrag_response_llm", "other-model"):
+            second, _ = pool.acquire()
+        again, _ = pool.acquire()
+        assert first is not second
+        assert again is first
+        assert "other-model" in built[1][0]
+
+    def test_setup_time_reported(self, pool):
+        pool, built = pool
+        with patch("tiger_etf.graphrag.query.time.perf_counter", side_effect=[0.0, 0.0, 2.5, 2.5, 3.0]):
+            result = query_mod.run_query("q")
+        assert result.setup_seconds == 2.5
+        assert result.total_seconds == 3.0
+        assert query_mod.run_query("q").setup_seconds < 0.1
+
+    def test_failed_query_triggers_health_check_and_rebuild(self, pool):
+        pool, built = pool
+        engine, _ = pool.acquire()
+        engine.query.side_effect = ConnectionError("connection reset")
+        with pytest.raises(ConnectionError):
+            query_mod.query("q")
+
+        # Store still answers: keep the engine
+        assert pool.acquire()[0] is engine
+        built[0][1].graph_store.execute_query.assert_called_once()
+
+        with pytest.raises(ConnectionError):
+            query_mod.query("q")
+        built[0][1].graph_store.execute_query.side_effect = OSError("gone")
+        assert pool.acquire()[0] is not engine
+        assert len(built) == 2
+
+    def test_periodic_health_check(self, pool):
+        pool, built = pool
+        pool.acquire()
+        with patch("tiger_etf.config.settings.graphrag_engine_health_check_interval", 0):
+            pool.acquire()
+        built[0][1].graph_store.execute_query.assert_called_once_with("RETURN 1 AS ok")
+
+
+class TestIntentRouting:
+    def test_structured_question_answered_by_sql(self, pool):
+        pool, built = pool
+        with patch("tiger_etf.graphrag.rdb_query.answer_structured", return_value="0.07%") as sql:
+            result = query_mod.run_query("TIGER 미국S&P500의 총보수는?")
+        assert (result.response, result.intent, result.route) == ("0.07%", "ATTRIBUTE", "sql")
+        assert sql.call_args[0][0].products == ("tiger 미국s&p500",)
+        assert built == []  # no engine built or queried
+
+    def test_falls_back_to_graph(self, pool):
+        pool, built = pool
+        with patch("tiger_etf.graphrag.rdb_query.answer_structured", return_value=None):
+            result = query_mod.run_query("TIGER 비트코인의 총보수는?")
+        assert (result.intent, result.route) == ("ATTRIBUTE", "graph")
+        built[0][1].engine.query.assert_called_once()
+
+    def test_unstructured_skips_sql(self, pool):
+        pool, built = pool
+        with patch("tiger_etf.graphrag.rdb_query.answer_structured") as sql:
+            result = query_mod.run_query("TIGER 미국S&P500의 투자위험은?")
+            query_mod.run_query("TIGER 미국S&P500의 총보수는?", route=False)
+        sql.assert_not_called()
+        assert result.intent == "OPEN"
+        assert len(built) == 1
@@ -0,0 +1,123 @@
+"""Tests for the graphrag query response cache."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tiger_etf.graphrag import query as query_mod
+from tiger_etf.graphrag.query_cache import (
+    QueryCache,
+    bump_graph_version,
+    current_scope,
+    graph_version,
+    normalize_question,
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path), \
+            patch.object(query_mod, "_query_cache", None):
+        yield tmp_path
+
+
+def _fake_embed(text: str) -> list[float]:
+    # Bag of characters: near-duplicate wording gives a high cosine
+    vec = [0.0] * 64
+    for ch in text:
+        vec[ord(ch) % 64] += 1.0
+    return vec
+
+
+class TestQueryCache:
+    def test_normalize_question(self):
+        assert normalize_question("  TIGER  미국S&P500   총보수는?? ") == "tiger 미국s&p500 총보수는"
+        assert normalize_question("ＴＩＧＥＲ") == "tiger"
+
+    def test_hit_on_normalized_question(self, data_dir):
+        cache = QueryCache()
+        cache.put("TIGER 총보수는?", "s1", "0.07%")
+        assert cache.get("tiger   총보수는", "s1").response == "0.07%"
+        assert cache.get("tiger 총보수는", "s2") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_graph_rebuild_invalidates(self, data_dir):
+        cache = QueryCache()
+        assert graph_version() == "0"
+        scope = current_scope()
+        cache.put("q", scope, "old answer")
+
+        bump_graph_version()
+        assert current_scope() != scope
+        assert cache.get("q", current_scope()) is None
+        assert cache.get("q", scope) is None  # purged, not just shadowed
+
+    def test_ttl_expiry(self, data_dir):
+        cache = QueryCache(ttl_seconds=60)
+        with patch("tiger_etf.graphrag.query_cache.time.time", return_value=1000.0):
+            cache.put("q", "s", "a")
+        with patch("tiger_etf.graphrag.query_cache.time.time", return_value=1030.0):
+            assert cache.get("q", "s") is not None
+        with patch("tiger_etf.graphrag.query_cache.time.time", return_value=1061.0):
+            assert cache.get("q", "s") is None
+
+    def test_lru_eviction(self, data_dir):
+        cache = QueryCache(max_entries=2)
+        ticks = iter(range(100))
+        now = time.time()
+        with patch("tiger_etf.graphrag.query_cache.time.time", side_effect=lambda: now + next(ticks)):
+            cache.put("a", "s", "A")
+            cache.put("b", "s", "B")
+            cache.get("a", "s")
+            cache.put("c", "s", "C")
+        assert cache.get("b", "s") is None
+        assert cache.get("a", "s").response == "A"
+
+    def test_semantic_lookup(self, data_dir):
+        cache = QueryCache(similarity_threshold=0.9, embed=_fake_embed)
+        cache.put("TIGER 미국S&P500 총보수는 얼마인가요", "s", "0.07%")
+
+        hit = cache.get("TIGER 미국S&P500 총보수는 얼마야", "s")
+        assert hit.response == "0.07%"
+        assert 0.9 <= hit.similarity < 1.0
+        assert cache.get("KODEX 200 상장일은 언제인가", "s") is None
+
+    def test_shared_across_threads(self, data_dir):
+        cache = QueryCache(similarity_threshold=0.9, embed=_fake_embed)
+
+        def use(i):
+            cache.put(f"question {i}", "s", f"answer {i}")
+            return cache.get(f"question {i}", "s").response
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(use, range(64))) == [f"answer {i}" for i in range(64)]
+        assert cache.hits == 64
+
+
+class TestQuery:
+    def test_second_query_served_from_cache(self, data_dir):
+        engine = MagicMock()
+        engine.query.return_value = "answer"
+        with patch.object(query_mod._engine_pool, "acquire", return_value=(engine, 0.0)):
+            assert query_mod.query("TIGER 총보수?") == "answer"
+            assert query_mod.run_query("tiger 총보수").cache_hit
+            assert engine.query.call_count == 1
+
+            query_mod.query("tiger 총보수", use_cache=False)
+            assert engine.query.call_count == 2
+
+    def test_build_invalidates_cached_answers(self, data_dir):
+        from llama_index.core.schema import Document
+
+        from tiger_etf.graphrag.indexer import build_index
+
+        engine = MagicMock()
+        engine.query.side_effect = ["v1", "v2"]
+        with patch.object(query_mod._engine_pool, "acquire", return_value=(engine, 0.0)):
+            assert query_mod.query("q") == "v1"
+            build_index([Document(text="t", metadata={"file_name": "a.pdf"})], graph_index=MagicMock())
+            assert query_mod.query("q") == "v2"
@@ -0,0 +1,89 @@
+"""Tests for per-stage GraphRAG query timing."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.llms import CompletionResponse
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from tiger_etf.graphrag import query as query_mod
+from tiger_etf.graphrag.query_profile import instrument_graph_store, profile_query
+
+
+class _GraphStore:
+    def execute_query(self, cypher, params=None):
+        time.sleep(0.05)
+        return [{"ok": 1}]
+
+
+class _Retriever(BaseRetriever):
+    """Embeds the question, 'searches vectors', then traverses the graph."""
+
+    def __init__(self, graph_store):
+        super().__init__()
+        self.graph_store = graph_store
+        self.embed_model = MockEmbedding(embed_dim=8)
+
+    def _retrieve(self, query_bundle):
+        self.embed_model.get_query_embedding(query_bundle.query_str)
+        time.sleep(0.05)  # vector search
+        self.graph_store.execute_query("MATCH (n) RETURN n")
+        self.graph_store.execute_query("MATCH (n) RETURN n")
+        return [NodeWithScore(node=TextNode(text=f"node {i}"), score=1.0) for i in range(3)]
+
+
+class _UsageLLM(MockLLM):
+    @llm_completion_callback()
+    def complete(self, prompt, formatted=False, **kwargs):
+        time.sleep(0.05)
+        return CompletionResponse(
+            text="answer", raw={"usage": {"inputTokens": 120, "outputTokens": 7}}
+        )
+
+
+def _engine():
+    retriever = _Retriever(instrument_graph_store(_GraphStore()))
+    return RetrieverQueryEngine.from_args(retriever, llm=_UsageLLM())
+
+
+class TestProfileQuery:
+    def test_stage_breakdown(self):
+        engine = _engine()
+        with profile_query() as profile:
+            engine.query("TIGER 미국S&P500 총보수?")
+
+        assert profile.graph_queries == 2
+        assert profile.graph_seconds >= 0.1
+        assert 0.04 <= profile.vector_search_seconds < 0.1
+        assert profile.embedding_calls == 1
+        assert profile.generation_seconds >= 0.05
+        assert profile.retrieved_nodes == 3
+        assert profile.llm_calls >= 1
+        assert profile.prompt_tokens >= 120
+        assert profile.completion_tokens >= 7
+        assert profile.total_seconds >= (
+            profile.graph_seconds + profile.vector_search_seconds + profile.generation_seconds
+        )
+
+    def test_graph_store_untimed_outside_profile(self):
+        store = instrument_graph_store(_GraphStore())
+        assert store.execute_query("RETURN 1") == [{"ok": 1}]
+        with profile_query() as profile:
+            pass
+        assert profile.graph_queries == 0
+
+    def test_run_query_attaches_profile(self, tmp_path):
+        engine = _engine()
+        with patch("tiger_etf.config.settings.data_dir", tmp_path), \
+                patch.object(query_mod, "_query_cache", None), \
+                patch.object(query_mod._engine_pool, "acquire", return_value=(engine, 0.0)):
+            result = query_mod.run_query("q")
+            assert result.profile.retrieved_nodes == 3
+            assert query_mod.run_query("q").profile is None  # cache hit
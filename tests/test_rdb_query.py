@@ -0,0 +1,167 @@
+"""Tests for the SQL channel of the query router."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from tiger_etf.catalog import clear_catalog
+from tiger_etf.config import settings
+from tiger_etf.graphrag.intent import classify_intent
+from tiger_etf.graphrag.rdb_query import SOURCE_NOTE, answer_structured
+from tiger_etf.models import Base, EtfDistribution, EtfHolding, EtfProduct
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(element, compiler, **kw):
+    return "JSON"
+
+
+PRODUCTS = [
+    # ksd, ticker, name, benchmark, l1, ter, aum, hedge, listed
+    ("KR7360750004", "360750", "TIGER 미국S&P500", "S&P 500", "해외주식", 0.07, 80000, False, date(2020, 8, 7)),
+    ("KR7133690008", "133690", "TIGER 미국나스닥100", "NASDAQ-100", "해외주식", 0.07, 40000, False, date(2010, 10, 18)),
+    ("KR7305080002", "305080", "TIGER 미국채10년선물", "US Treasury 10Y", "해외채권", 0.29, 3000, True, date(2018, 8, 30)),
+    ("KR7458730006", "458730", "TIGER 미국배당다우존스", "Dow Jones US Dividend 100", "해외주식", 0.01, 15000, False, date(2023, 6, 20)),
+    ("KR7472150001", "472150", "TIGER 배당커버드콜액티브", "KOSPI 200", "국내주식", 0.5, 1000, None, date(2024, 1, 9)),
+]
+
+
+@pytest.fixture
+def rdb():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS tiger_etf")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for code, ticker, name, bench, l1, ter, aum, hedge, listed in PRODUCTS:
+            session.add(EtfProduct(
+                ksd_fund_code=code, ticker=ticker, name_ko=name, benchmark_index=bench,
+                category_l1=l1, total_expense_ratio=ter, aum=aum, currency_hedge=hedge,
+                listing_date=listed,
+            ))
+        session.flush()
+        for day in (1, 2):
+            for k, holding in enumerate(["Apple", "NVIDIA", "Microsoft"]):
+                session.add(EtfHolding(
+                    ksd_fund_code="KR7360750004", as_of_date=date(2025, 1, day),
+                    holding_name=holding, weight_pct=7 - k - day,
+                ))
+        for month in (1, 2, 3):
+            session.add(EtfDistribution(
+                ksd_fund_code="KR7458730006", record_date=date(2025, month, 28),
+                amount_per_share=60 + month,
+            ))
+        session.commit()
+
+    @contextmanager
+    def reader_session():
+        with Session(engine) as session:
+            yield session
+
+    clear_catalog()
+    with patch("tiger_etf.graphrag.rdb_query.get_reader_session", reader_session), \
+            patch("tiger_etf.catalog.get_reader_session", reader_session):
+        yield engine
+    clear_catalog()
+
+
+def _answer(question):
+    answer = answer_structured(classify_intent(question))
+    assert answer is None or answer.endswith(SOURCE_NOTE)
+    return answer and answer[: -len(SOURCE_NOTE)].strip()
+
+
+class TestAttribute:
+    def test_single_attribute(self, rdb):
+        assert _answer("TIGER 미국S&P500 ETF의 총보수는?") == "TIGER 미국S&P500 (360750)\n  - 총보수: 0.07%"
+
+    def test_longest_name_prefix_and_ticker(self, rdb):
+        assert "상장일: 2020-08-07" in _answer("TIGER 미국S&P500 상장일은?")
+        assert "환헤지: 예 (환헤지)" in _answer("305080 환헤지 하나요?")
+
+    def test_several_products_and_attributes(self, rdb):
+        answer = _answer("TIGER 미국S&P500과 TIGER 미국나스닥100의 총보수와 순자산은?")
+        assert answer.splitlines() == [
+            "TIGER 미국S&P500 (360750)", "  - 총보수: 0.07%", "  - 순자산총액(AUM): 80,000억원",
+            "TIGER 미국나스닥100 (133690)", "  - 총보수: 0.07%", "  - 순자산총액(AUM): 40,000억원",
+        ]
+
+    def test_latest_holdings(self, rdb):
+        answer = _answer("TIGER 미국S&P500 ETF가 보유한 종목 중 가장 비중이 큰 것은?")
+        assert answer.splitlines()[1:] == [
+            "  - 보유종목 (2025-01-02 기준, 비중 순):", "    - Apple (5%)",
+        ]
+
+    def test_distributions_by_period(self, rdb):
+        assert "2025-02-28: 62원" in _answer("TIGER 미국배당다우존스 ETF의 2025년 2월 분배금은?")
+        # No record for the period: left to the graph channel
+        assert _answer("TIGER 미국배당다우존스 ETF의 2025년 12월 분배금은?") is None
+
+    def test_name_spacing_ignored(self, rdb):
+        assert "총보수: 0.07%" in _answer("TIGER 미국 S&P 500의 총보수는?")
+
+    def test_unknown_product_falls_back(self, rdb):
+        assert _answer("TIGER 비트코인 ETF의 총보수는?") is None
+
+    def test_aggregate_words_do_not_list_catalog(self, rdb):
+        assert _answer("TIGER 미국S&P500의 총보수 비율은?") == "TIGER 미국S&P500 (360750)\n  - 총보수: 0.07%"
+        assert _answer("TIGER 미국S&P500 상품은 몇 개인가요?") is None
+
+
+class TestFilterAndAggregate:
+    def test_ranked_filter(self, rdb):
+        answer = _answer("해외 ETF 중 총보수가 가장 낮은 상품은?")
+        assert answer.splitlines() == [
+            "[총보수 낮은 순]", "- TIGER 미국배당다우존스 (458730): 총보수 0.01%",
+        ]
+
+    def test_top_n(self, rdb):
+        answer = _answer("순자산총액(AUM) 기준 상위 2개 TIGER ETF는?")
+        assert [line.split(" (")[0] for line in answer.splitlines()[1:]] == [
+            "- TIGER 미국S&P500", "- TIGER 미국나스닥100",
+        ]
+
+    def test_listing_year(self, rdb):
+        answer = _answer("2024년에 상장된 TIGER ETF 신규 상품은 어떤 것들이 있나요?")
+        assert answer == "- TIGER 배당커버드콜액티브 (472150): 상장일 2024-01-09"
+
+    def test_products_with_distributions(self, rdb):
+        answer = _answer("분배금을 지급하는 TIGER ETF는 어떤 것들이 있나요?")
+        assert answer.splitlines() == [
+            "- TIGER 미국배당다우존스 (458730)", "    - 최근 분배금 2025-03-28: 63원",
+        ]
+
+    def test_truncated_filter_counts_the_rest(self, rdb):
+        with patch.object(settings, "graphrag_router_max_rows", 2):
+            answer = _answer("해외 ETF 상품들의 목록")
+        assert answer.splitlines() == [
+            "- TIGER 미국S&P500 (360750)", "- TIGER 미국나스닥100 (133690)", "- ... 외 2개",
+        ]
+
+    def test_unconditioned_filter_falls_back(self, rdb):
+        assert _answer("TIGER ETF 상품들의 목록") is None
+
+    def test_group_count(self, rdb):
+        answer = _answer("분류별로 TIGER ETF 상품이 몇 개씩 있나요?")
+        assert answer.splitlines() == ["분류별 상품 수:", "- 해외주식: 3개", "- 국내주식: 1개", "- 해외채권: 1개"]
+
+    def test_average(self, rdb):
+        assert _answer("해외주식 ETF의 평균 총보수는?") == "평균 총보수: 0.05% (상품 3개 기준)"
+
+    def test_keyword_ratio(self, rdb):
+        assert _answer("해외 ETF와 국내 ETF 비율은?").splitlines() == ["- 해외: 4개 (80%)", "- 국내: 1개 (20%)"]
+
+    def test_db_error_falls_back(self, rdb):
+        with patch("tiger_etf.graphrag.rdb_query.get_reader_session", side_effect=OSError("down")):
+            assert _answer("TIGER 미국S&P500 ETF의 총보수는?") is None
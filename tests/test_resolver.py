@@ -0,0 +1,220 @@
+"""Tests for offline entity resolution."""
+
+from __future__ import annotations
+
+import json
+import re
+from unittest.mock import patch
+
+import pytest
+
+from tiger_etf.catalog import CatalogEntry, ProductCatalog
+from tiger_etf.graphrag.resolver import (
+    Entity,
+    Merge,
+    apply_merges,
+    entity_key,
+    iter_entities,
+    plan_merges,
+    product_name,
+    resolve_entities,
+)
+
+CATALOG = ProductCatalog([
+    CatalogEntry("KR7360750004", "360750", "TIGER 미국S&P500"),
+    CatalogEntry("KR7448290002", "448290", "TIGER 미국S&P500(H)"),
+    CatalogEntry("KR7102110004", "102110", "TIGER 200"),
+])
+
+
+def _pairs(merges):
+    return sorted((m.keep, m.dup, m.stage) for m in merges)
+
+
+class TestNormalization:
+    def test_entity_key(self):
+        assert entity_key("미래에셋자산운용 주식회사") == entity_key("미래에셋자산운용")
+        assert entity_key("Mirae Asset Global Investments Co., Ltd.") == entity_key("미래에셋자산운용")
+        assert entity_key("NASDAQ 100") == entity_key("NASDAQ-100")
+        assert entity_key("미래에셋증권") != entity_key("미래에셋자산운용")
+
+    def test_product_name(self):
+        assert product_name("미래에셋TIGER미국S&P500증권상장지수투자신탁(주식)") == "tiger미국s&p500"
+        assert product_name("TIGER 미국S&P500 ETF") == "tiger 미국s&p500"
+        assert product_name("TIGER 미국S&P500(H)") == "tiger 미국s&p500(h)"
+
+
+class TestPlan:
+    def test_rdb_anchoring_keeps_canonical_name(self):
+        entities = [
+            Entity("e1", "미래에셋TIGER미국S&P500증권상장지수투자신탁(주식)", "ETF"),
+            Entity("e2", "TIGER 미국S&P500 ETF", "ETF"),
+            Entity("e3", "TIGER 미국S&P500", "ETF"),
+            Entity("e4", "360750", "ETF"),
+            Entity("e5", "TIGER 미국S&P500(H)", "ETF"),
+        ]
+        merges, clusters = plan_merges(entities, CATALOG, similarity_threshold=0)
+        assert clusters == 1
+        assert _pairs(merges) == [("e3", "e1", "rdb"), ("e3", "e2", "rdb"), ("e3", "e4", "rdb")]
+
+    def test_alias_rule_within_class(self):
+        entities = [
+            Entity("a", "Mirae Asset", "Asset Management Company"),
+            Entity("b", "미래에셋자산운용", "Asset Management Company"),
+            Entity("c", "미래에셋자산운용(주)", "Asset Management Company"),
+            Entity("d", "미래에셋자산운용", "Distributor"),
+            Entity("e", "", "Distributor"),
+            Entity("f", "", "Distributor"),
+        ]
+        merges, clusters = plan_merges(entities, CATALOG, similarity_threshold=0)
+        assert clusters == 1
+        assert _pairs(merges) == [("b", "a", "rule"), ("b", "c", "rule")]
+
+    def test_similarity_stage(self):
+        entities = [
+            Entity("x", "엔비디아 코퍼레이션", "Stock"),
+            Entity("y", "엔비디아 코퍼레이션즈", "Stock"),
+            Entity("z", "KOSPI 200", "Index"),
+            Entity("w", "KOSPI 100", "Index"),
+        ]
+        merges, _ = plan_merges(entities, None, similarity_threshold=0.9)
+        assert _pairs(merges) == [("x", "y", "similarity")]
+        assert plan_merges(entities, None, similarity_threshold=0)[0] == []
+
+
+class _FakeGraph:
+    """Answers the resolver's read queries and records its writes."""
+
+    def __init__(self, entities):
+        self.rows = sorted(({"id": e.id, "value": e.value, "class": e.cls} for e in entities), key=lambda r: r["id"])
+        self.nodes, self.edges = len(self.rows) + 10, 40
+        self.calls = []
+
+    def __call__(self, cypher, parameters=None):
+        self.calls.append((cypher, parameters))
+        if "ORDER BY id(e)" in cypher:
+            after = parameters["after"]
+            return [r for r in self.rows if r["id"] > after][: parameters["limit"]]
+        if cypher.startswith("MATCH (n) RETURN count"):
+            return [{"cnt": self.nodes}]
+        if cypher.startswith("MATCH ()-[r]->()"):
+            return [{"cnt": self.edges}]
+        if "DETACH DELETE" in cypher:
+            self.nodes -= len(parameters["params"])
+            self.edges -= len(parameters["params"])
+        return []
+
+    def writes(self):
+        return [
+            params for cypher, params in self.calls
+            if cypher.startswith("UNWIND") and "RETURN DISTINCT" not in cypher
+        ]
+
+
+ENTITIES = [
+    Entity("n1", "Mirae Asset", "Asset Management Company"),
+    Entity("n2", "미래에셋자산운용", "Asset Management Company"),
+    Entity("n3", "TIGER 미국S&P500 ETF", "ETF"),
+    Entity("n4", "TIGER 미국S&P500", "ETF"),
+    Entity("n5", "미래에셋TIGER미국S&P500증권상장지수투자신탁(주식)", "ETF"),
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path):
+        yield tmp_path
+
+
+class TestResolve:
+    def test_paged_pull(self):
+        graph = _FakeGraph(ENTITIES)
+        assert [e.id for e in iter_entities(graph, page_size=2)] == ["n1", "n2", "n3", "n4", "n5"]
+        assert [p["after"] for _, p in graph.calls] == ["", "n2", "n4"]
+
+    def test_batched_merges_and_shrink_report(self, data_dir):
+        graph = _FakeGraph(ENTITIES)
+        with patch("tiger_etf.graphrag.query_cache.bump_graph_version") as bump:
+            report = resolve_entities(run=graph, catalog=CATALOG, batch_size=2, page_size=2)
+        bump.assert_called_once()
+        assert (report.entities, report.clusters, report.merges) == (5, 2, 3)
+        assert report.by_stage == {"rule": 1, "rdb": 2}
+        # 3 merges in batches of 2 (no edges to move: only the deletes write)
+        assert [len(p["params"]) for p in graph.writes()] == [2, 1]
+        assert (report.nodes_before, report.nodes_after) == (15, 12)
+        assert report.nodes_removed == 3 and report.edges_removed == 3
+
+        log = json.loads((data_dir / "graphrag" / report.log_path.split("/")[-1]).read_text())
+        assert {(m["keep"], m["dup"]) for m in log["merges"]} == {("n2", "n1"), ("n4", "n3"), ("n4", "n5")}
+
+    def test_dry_run_writes_nothing(self, data_dir):
+        graph = _FakeGraph(ENTITIES)
+        report = resolve_entities(run=graph, catalog=CATALOG, dry_run=True)
+        assert graph.writes() == []
+        assert report.merges == 3
+        assert report.nodes_after == report.nodes_before
+
+
+class _EdgeGraph:
+    """Node ids and (src, type, dst, props) edges; interprets the merge statements."""
+
+    def __init__(self, nodes, edges):
+        self.nodes = set(nodes)
+        self.edges = [(s, t, d, dict(p)) for s, t, d, p in edges]
+
+    def __call__(self, cypher, parameters=None):
+        pairs = parameters["params"]
+        if "RETURN DISTINCT" in cypher:
+            out = cypher.startswith("UNWIND $params AS p MATCH (dup")
+            dups = {p["dup"] for p in pairs}
+            return [{"type": t} for t in {t for s, t, d, _ in self.edges if (s if out else d) in dups}]
+        if "DETACH DELETE" in cypher:
+            dups = {p["dup"] for p in pairs}
+            self.nodes -= dups
+            self.edges = [e for e in self.edges if e[0] not in dups and e[2] not in dups]
+            return []
+        m = re.search(r"MATCH (\(dup:`__Entity__`\)-\[r:`([^`]+)`\]->\(t\)|\(t\)-\[r:`([^`]+)`\]->\(dup)", cypher)
+        outgoing, rel = m.group(2) is not None, m.group(2) or m.group(3)
+        for p in pairs:
+            for s, t, d, props in list(self.edges):
+                end = d if outgoing else s
+                if t != rel or (s if outgoing else d) != p["dup"] or end in (p["keep"], p["dup"]):
+                    continue
+                src, dst = (p["keep"], end) if outgoing else (end, p["keep"])
+                match = [e for e in self.edges if e[:3] == (src, rel, dst)
+                         and (rel != "__RELATION__" or e[3].get("value") == props.get("value"))]
+                if not match:
+                    self.edges.append((src, rel, dst, dict(props)))
+                elif rel == "__RELATION__":
+                    match[0][3]["count"] = match[0][3].get("count", 0) + props.get("count", 0)
+        return []
+
+
+class TestApplyMerges:
+    def test_every_edge_moves_to_kept_node(self):
+        graph = _EdgeGraph(
+            ["keep", "dup", "other", "f1", "f2", "f3"],
+            [
+                ("dup", "__SUBJECT__", "f1", {}),        # entity -> fact
+                ("f2", "__OBJECT__", "dup", {}),         # fact -> entity
+                ("f3", "__SUBJECT__", "dup", {}),
+                ("dup", "__RELATION__", "other", {"value": "manages", "count": 2}),
+                ("keep", "__RELATION__", "other", {"value": "manages", "count": 1}),
+                ("other", "__RELATION__", "dup", {"value": "owns", "count": 1}),
+                ("dup", "MENTIONED_IN", "f3", {"weight": 0.5}),
+                ("dup", "__RELATION__", "keep", {"value": "same", "count": 1}),
+            ],
+        )
+        apply_merges(graph, [Merge("keep", "dup", "rule", "k", "d")])
+        assert graph.nodes == {"keep", "other", "f1", "f2", "f3"}
+        assert sorted((s, t, d) for s, t, d, _ in graph.edges) == sorted([
+            ("keep", "__SUBJECT__", "f1"),
+            ("f2", "__OBJECT__", "keep"),
+            ("f3", "__SUBJECT__", "keep"),
+            ("keep", "__RELATION__", "other"),
+            ("other", "__RELATION__", "keep"),
+            ("keep", "MENTIONED_IN", "f3"),
+        ])
+        props = {(s, t, d): p for s, t, d, p in graph.edges}
+        assert props[("keep", "__RELATION__", "other")]["count"] == 3
+        assert props[("keep", "MENTIONED_IN", "f3")] == {"weight": 0.5}
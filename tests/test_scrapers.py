@@ -0,0 +1,372 @@
+"""Tests for scrapers: async engine, rate limiting, HTTP cache, PDF downloads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from tiger_etf.scrapers.base import BaseScraper, TokenBucket
+from tiger_etf.scrapers.documents import DocumentsScraper
+from tiger_etf.scrapers.http_cache import HttpCache
+
+DETAIL = "/ko/product/search/detail/index.do"
+
+
+def _mock_scraper(
+    handler, concurrency: int = 1, cache: HttpCache | None = None, cls: type = BaseScraper
+) -> BaseScraper:
+    """Build a scraper whose async client is served by ``handler``."""
+    kwargs = BaseScraper._client_kwargs()
+    kwargs["transport"] = httpx.MockTransport(handler)
+    scraper = cls(concurrency=concurrency, use_cache=False)
+    scraper.cache = cache
+    scraper._client_kwargs = lambda: kwargs
+    return scraper
+
+
+# ---------------------------------------------------------------------------
+# TokenBucket
+# ---------------------------------------------------------------------------
+
+
+class TestTokenBucket:
+    def test_spaces_requests_at_rate(self):
+        async def take(n: int) -> float:
+            bucket = TokenBucket(rate=50.0)
+            start = time.monotonic()
+            for _ in range(n):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # First token is banked, the remaining 4 wait 1/50s each
+        assert asyncio.run(take(5)) >= 4 / 50 * 0.9
+
+    def test_zero_delay_is_unlimited(self):
+        bucket = TokenBucket.from_delay(0)
+        assert bucket.rate == float("inf")
+
+        async def take() -> None:
+            for _ in range(100):
+                await bucket.acquire()
+
+        asyncio.run(take())
+
+
+# ---------------------------------------------------------------------------
+# fetch_each
+# ---------------------------------------------------------------------------
+
+
+class TestFetchEach:
+    def test_preserves_order_and_isolates_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            key = request.url.params["k"]
+            if key == "bad":
+                return httpx.Response(500)
+            return httpx.Response(200, text=f"page-{key}")
+
+        scraper = _mock_scraper(handler, concurrency=4)
+
+        async def fetch(key: str) -> str:
+            resp = await scraper.aget("/x", params={"k": key})
+            return resp.text
+
+        with patch("tiger_etf.scrapers.base.settings.request_delay", 0), \
+                patch.object(BaseScraper._aget.retry, "sleep", new=AsyncMock()):
+            results = scraper.fetch_each(["a", "bad", "c"], fetch)
+        scraper.close()
+
+        assert [k for k, _, _ in results] == ["a", "bad", "c"]
+        assert results[0][1] == "page-a"
+        assert isinstance(results[1][2], httpx.HTTPStatusError)
+        assert results[2][1] == "page-c"
+
+    def test_concurrency_bounds_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        scraper = _mock_scraper(lambda r: httpx.Response(200), concurrency=3)
+
+        async def fetch(key: int) -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return key
+
+        with patch("tiger_etf.scrapers.base.settings.request_delay", 0):
+            results = scraper.fetch_each(range(10), fetch)
+        scraper.close()
+
+        assert [r for _, r, _ in results] == list(range(10))
+        assert peak == 3
+
+    def test_concurrency_defaults_to_settings(self):
+        with patch("tiger_etf.scrapers.base.settings.scraper_concurrency", 5):
+            scraper = BaseScraper(use_cache=False)
+        scraper.close()
+        assert scraper.concurrency == 5
+
+
+# ---------------------------------------------------------------------------
+# upsert_products
+# ---------------------------------------------------------------------------
+
+
+class TestUpsertProducts:
+    def _run(self, rows_by_product, chunk_size=3):
+        writes = []
+
+        @contextmanager
+        def session():
+            yield None
+
+        def upsert(session, model, rows, **kwargs):
+            rows = list(rows)
+            if any(r.get("bad") for r in rows):
+                raise ValueError("invalid input value")
+            writes.append([r["k"] for r in rows])
+            return len(rows)
+
+        scraper = BaseScraper(use_cache=False)
+        with patch("tiger_etf.scrapers.base.get_session", session), \
+                patch("tiger_etf.scrapers.base.bulk_upsert", side_effect=upsert), \
+                patch("tiger_etf.scrapers.base.settings.upsert_chunk_size", chunk_size):
+            failed = scraper.upsert_products(object, rows_by_product, key_cols=("k",))
+        scraper.close()
+        return failed, writes
+
+    def test_chunks_by_row_count(self):
+        rows = {p: [{"k": f"{p}{i}"} for i in range(2)] for p in "abc"}
+        failed, writes = self._run(rows, chunk_size=4)
+        assert failed == []
+        assert writes == [["a0", "a1", "b0", "b1"], ["c0", "c1"]]
+
+    def test_bad_row_fails_only_its_product(self):
+        rows = {"a": [{"k": "a0"}], "b": [{"k": "b0", "bad": True}], "c": [{"k": "c0"}]}
+        failed, writes = self._run(rows)
+        assert failed == ["b"]
+        assert writes == [["a0"], ["c0"]]
+
+
+# ---------------------------------------------------------------------------
+# HTTP cache
+# ---------------------------------------------------------------------------
+
+
+def _fetch_detail(scraper: BaseScraper, keys: list[str]) -> list[str]:
+    async def fetch(key: str) -> str:
+        resp = await scraper.aget(DETAIL, params={"ksdFund": key})
+        return resp.text
+
+    with patch("tiger_etf.scrapers.base.settings.request_delay", 0):
+        return [r for _, r, _ in scraper.fetch_each(keys, fetch)]
+
+
+class TestHttpCache:
+    def test_fresh_entry_served_without_request(self, tmp_path):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, text="<html>detail</html>")
+
+        cache = HttpCache(tmp_path, ttls={DETAIL: 3600}, max_bytes=10_000)
+        scraper = _mock_scraper(handler, cache=cache)
+
+        assert _fetch_detail(scraper, ["A"]) == ["<html>detail</html>"]
+        assert _fetch_detail(scraper, ["A"]) == ["<html>detail</html>"]
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        scraper.close()
+
+    def test_stale_entry_revalidated_with_etag(self, tmp_path):
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="body", headers={"ETag": '"v1"'})
+
+        cache = HttpCache(tmp_path, ttls={DETAIL: 0}, max_bytes=10_000)
+        scraper = _mock_scraper(handler, cache=cache)
+
+        assert _fetch_detail(scraper, ["A"]) == ["body"]
+        assert _fetch_detail(scraper, ["A"]) == ["body"]
+        assert seen_headers == [None, '"v1"']
+        assert cache.revalidated == 1
+        scraper.close()
+
+    def test_uncached_endpoint_bypasses(self, tmp_path):
+        cache = HttpCache(tmp_path, ttls={DETAIL: 3600}, max_bytes=10_000)
+        assert cache.ttl_for("https://x/ko/other.ajax") is None
+        assert cache.ttl_for(f"https://x/tigeretf{DETAIL}?ksdFund=A") == 3600
+        # Prefix match only: the endpoint path nested elsewhere is not cached
+        assert cache.ttl_for(f"https://x/tigeretf/en{DETAIL}") is None
+        cache.close()
+
+    def test_cache_opened_on_first_cached_request(self, tmp_path):
+        kwargs = BaseScraper._client_kwargs()
+        kwargs["transport"] = httpx.MockTransport(lambda r: httpx.Response(200, text="body"))
+        with patch("tiger_etf.scrapers.http_cache.settings.data_dir", tmp_path):
+            scraper = BaseScraper(use_cache=True)
+            scraper._client_kwargs = lambda: kwargs
+            assert scraper._cache is None
+            assert not (tmp_path / "http_cache").exists()
+
+            _fetch_detail(scraper, ["A"])
+            assert scraper._cache is not None
+            scraper.close()
+
+    def test_identical_bodies_stored_once(self, tmp_path):
+        cache = HttpCache(tmp_path, ttls={DETAIL: 3600}, max_bytes=10_000)
+        for url in ("https://x/a", "https://x/b"):
+            cache.store(url, httpx.Response(200, content=b"same"))
+        bodies = [p for p in (tmp_path / "bodies").rglob("*") if p.is_file()]
+        assert len(bodies) == 1
+        assert cache.total_bytes() == 4
+        cache.close()
+
+    def test_lru_eviction(self, tmp_path):
+        cache = HttpCache(tmp_path, ttls={DETAIL: 3600}, max_bytes=25)
+        cache.store("https://x/a", httpx.Response(200, content=b"a" * 10))
+        cache.store("https://x/b", httpx.Response(200, content=b"b" * 10))
+        # Touch "a" so "b" becomes least recently used
+        with patch("tiger_etf.scrapers.http_cache.time.time", return_value=time.time() + 60):
+            cache.response(cache.lookup("https://x/a"))
+            cache.store("https://x/c", httpx.Response(200, content=b"c" * 10))
+
+        assert cache.lookup("https://x/a") is not None
+        assert cache.lookup("https://x/b") is None
+        assert cache.lookup("https://x/c") is not None
+        cache.close()
+
+
+# ---------------------------------------------------------------------------
+# DocumentsScraper PDF download
+# ---------------------------------------------------------------------------
+
+PDF_BYTES = b"%PDF-1.7 " + b"x" * 4000
+PDF_URL = "https://example.com/doc.pdf"
+
+
+def _pdf_files(data_dir) -> list:
+    pdfs = data_dir / "pdfs"
+    return sorted(pdfs.iterdir()) if pdfs.exists() else []
+
+
+def _download(scraper: DocumentsScraper, known: dict | None) -> dict | None:
+    async def fetch(url: str) -> dict | None:
+        return await scraper._download_pdf(url, "KR7000000001", "prospectus", known)
+
+    with patch("tiger_etf.scrapers.base.settings.request_delay", 0):
+        return scraper.fetch_each([PDF_URL], fetch)[0][1]
+
+
+class TestDownloadPdf:
+    def test_streams_to_disk_with_hash(self, tmp_path):
+        scraper = _mock_scraper(
+            lambda r: httpx.Response(200, content=PDF_BYTES), cls=DocumentsScraper
+        )
+        with patch("tiger_etf.scrapers.documents.settings.data_dir", tmp_path):
+            meta = _download(scraper, None)
+        scraper.close()
+
+        digest = hashlib.sha256(PDF_BYTES).hexdigest()
+        assert meta["file_hash"] == digest
+        assert meta["file_size_bytes"] == len(PDF_BYTES)
+        pdfs = _pdf_files(tmp_path)
+        assert [p.name for p in pdfs] == [f"KR7000000001_prospectus_{digest[:8]}.pdf"]
+        assert pdfs[0].read_bytes() == PDF_BYTES
+
+    def _known(self, tmp_path, **fields):
+        existing = tmp_path / "existing.pdf"
+        existing.write_bytes(PDF_BYTES)
+        return {
+            "local_path": str(existing),
+            "file_hash": "stale",
+            "file_size_bytes": len(PDF_BYTES),
+            "etag": None,
+            "last_modified": None,
+            **fields,
+        }
+
+    def _fetch(self, tmp_path, known, headers):
+        scraper = _mock_scraper(
+            lambda r: httpx.Response(200, content=PDF_BYTES, headers=headers), cls=DocumentsScraper
+        )
+        with patch("tiger_etf.scrapers.documents.settings.data_dir", tmp_path):
+            meta = _download(scraper, known)
+        scraper.close()
+        return scraper, meta
+
+    def test_skips_when_etag_matches(self, tmp_path):
+        known = self._known(tmp_path, etag='"v1"')
+        scraper, meta = self._fetch(tmp_path, known, {"ETag": '"v1"'})
+        assert meta == {}
+        assert scraper.skipped == 1
+        assert _pdf_files(tmp_path) == []
+
+    def test_skips_when_last_modified_matches(self, tmp_path):
+        stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+        known = self._known(tmp_path, last_modified=stamp)
+        scraper, meta = self._fetch(tmp_path, known, {"Last-Modified": stamp})
+        assert meta == {}
+        assert scraper.skipped == 1
+
+    def test_same_size_alone_is_downloaded(self, tmp_path):
+        # A revised PDF of the same size must not be skipped forever
+        known = self._known(tmp_path)
+        scraper, meta = self._fetch(tmp_path, known, {"ETag": '"v2"'})
+        assert meta["file_hash"] == hashlib.sha256(PDF_BYTES).hexdigest()
+        assert meta["etag"] == '"v2"'
+        assert scraper.skipped == 0
+        assert len(_pdf_files(tmp_path)) == 1
+
+    def test_changed_etag_is_downloaded(self, tmp_path):
+        known = self._known(tmp_path, etag='"v1"')
+        scraper, meta = self._fetch(tmp_path, known, {"ETag": '"v2"'})
+        assert meta["etag"] == '"v2"'
+        assert scraper.skipped == 0
+
+    def test_skips_when_hash_matches_after_download(self, tmp_path):
+        existing = tmp_path / "existing.pdf"
+        existing.write_bytes(PDF_BYTES)
+        known = {
+            "local_path": str(existing),
+            "file_hash": hashlib.sha256(PDF_BYTES).hexdigest(),
+            "file_size_bytes": None,
+        }
+
+        async def body():
+            yield PDF_BYTES
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            # Chunked response: no Content-Length to compare against
+            return httpx.Response(200, content=body())
+
+        scraper = _mock_scraper(handler, cls=DocumentsScraper)
+        with patch("tiger_etf.scrapers.documents.settings.data_dir", tmp_path):
+            meta = _download(scraper, known)
+        scraper.close()
+
+        assert meta == {}
+        assert _pdf_files(tmp_path) == []
+
+    def test_tiny_response_discarded(self, tmp_path):
+        scraper = _mock_scraper(
+            lambda r: httpx.Response(200, content=b"error"), cls=DocumentsScraper
+        )
+        with patch("tiger_etf.scrapers.documents.settings.data_dir", tmp_path):
+            meta = _download(scraper, None)
+        scraper.close()
+
+        assert meta is None
+        assert _pdf_files(tmp_path) == []
@@ -0,0 +1,183 @@
+"""Tests for the extraction/build worker auto-tuner (offline stubs)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+import yaml
+from llama_index.core.schema import Document
+
+from tiger_etf.config import settings
+from tiger_etf.graphrag.tuner import (
+    StubExtractionLLM,
+    StubGraphStore,
+    StubIndex,
+    TuneTrial,
+    best_trial,
+    probe,
+    tune,
+    write_profile,
+)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path):
+    with patch("tiger_etf.config.settings.data_dir", tmp_path):
+        yield tmp_path
+
+
+def _docs(n, chunks=4):
+    return [
+        Document(text="".join(f"doc{i}-chunk{j}:".ljust(100, "x") for j in range(chunks)),
+                 metadata={"file_name": f"{i}.pdf"})
+        for i in range(n)
+    ]
+
+
+def _factory(capacity=8, latency=0.02):
+    return lambda: StubIndex(
+        StubExtractionLLM(latency=latency, capacity=capacity),
+        StubGraphStore(write_latency=0.005),
+        chunk_size=100,
+    )
+
+
+def _params(workers=1, threads=2, build=1):
+    return {
+        "extraction_num_workers": workers,
+        "extraction_num_threads_per_worker": threads,
+        "build_num_workers": build,
+    }
+
+
+class TestProbe:
+    def test_measures_throughput_and_restores_settings(self):
+        before = settings.graphrag_extraction_num_threads_per_worker
+        trial = probe(_docs(3), _params(threads=4), _factory())
+
+        assert trial.error == ""
+        assert trial.documents == 3
+        assert trial.llm_calls == 12
+        assert trial.throttle_rate == 0.0
+        assert trial.docs_per_min > 0
+        assert settings.graphrag_extraction_num_threads_per_worker == before
+
+    def test_counts_throttles_above_capacity(self):
+        trial = probe(_docs(4), _params(threads=8), _factory(capacity=2))
+
+        assert trial.throttles > 0
+        assert trial.throttle_rate == pytest.approx(
+            trial.throttles / (trial.llm_calls + trial.llm_errors), abs=1e-4
+        )
+
+    def test_more_threads_is_faster_within_capacity(self):
+        slow = probe(_docs(2), _params(threads=1), _factory(latency=0.03))
+        fast = probe(_docs(2), _params(threads=8), _factory(latency=0.03))
+        assert fast.docs_per_min > slow.docs_per_min * 2
+
+
+    def test_multi_process_extraction_has_no_throttle_data(self):
+        def live_index():
+            index = _factory()()
+            index.in_process = False
+            return index
+
+        assert probe(_docs(1), _params(workers=1), live_index).throttle_data
+        trial = probe(_docs(1), _params(workers=2), live_index)
+        assert not trial.throttle_data
+        assert not trial.within(1.0)
+        assert probe(_docs(1), _params(workers=2), _factory()).throttle_data
+
+
+class TestSearch:
+    def test_best_trial_respects_throttle_limit(self):
+        trials = [
+            TuneTrial(params=_params(), docs_per_min=10, throttle_rate=0.0),
+            TuneTrial(params=_params(threads=16), docs_per_min=30, throttle_rate=0.2),
+            TuneTrial(params=_params(threads=8), docs_per_min=20, throttle_rate=0.01),
+            TuneTrial(params=_params(threads=32), docs_per_min=50, error="boom"),
+            TuneTrial(params=_params(workers=2), docs_per_min=60, throttle_data=False),
+        ]
+        assert best_trial(trials, 0.05).params == _params(threads=8)
+        assert best_trial(trials, 0.0).params == _params()
+
+    def test_adaptive_stops_at_capacity(self):
+        best, trials = tune(
+            _docs(4), strategy="adaptive", max_throttle_rate=0.0, start=_params(threads=1),
+            index_factory=_factory(capacity=4), max_trials=8,
+        )
+        assert best is not None
+        assert best.throttle_rate == 0.0
+        threads = best.params["extraction_num_workers"] * best.params["extraction_num_threads_per_worker"]
+        assert threads <= 4
+        assert len(trials) <= 8
+
+    def test_grid_probes_every_combination(self):
+        grid = {
+            "extraction_num_workers": [1],
+            "extraction_num_threads_per_worker": [1, 4],
+            "build_num_workers": [1, 2],
+        }
+        best, trials = tune(_docs(2), strategy="grid", grid=grid, index_factory=_factory())
+        assert len(trials) == 4
+        assert best.params["extraction_num_threads_per_worker"] == 4
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            tune(_docs(1), strategy="random", index_factory=_factory())
+
+
+class TestLiveProbeTargets:
+    def test_requires_scratch_stores_or_allow_live(self):
+        with pytest.raises(ValueError):
+            tune(_docs(1), strategy="grid")
+        with pytest.raises(ValueError):
+            tune(_docs(1), strategy="grid", graph_store=settings.graph_store,
+                 vector_store="https://scratch.aoss.amazonaws.com")
+
+    def test_probes_write_to_scratch_stores_without_bumping_version(self):
+        seen = []
+
+        def factory():
+            seen.append((settings.graph_store, settings.vector_store))
+            return _factory()()
+
+        grid = {
+            "extraction_num_workers": [1],
+            "extraction_num_threads_per_worker": [2],
+            "build_num_workers": [1],
+        }
+        before = settings.graph_store
+        with patch("tiger_etf.graphrag.tuner._default_index_factory", side_effect=factory), \
+                patch("tiger_etf.graphrag.indexer.bump_graph_version") as bump:
+            best, _ = tune(
+                _docs(1), strategy="grid", grid=grid,
+                graph_store="neptune-db://scratch", vector_store="https://scratch",
+            )
+        assert best is not None
+        assert seen == [("neptune-db://scratch", "https://scratch")]
+        assert settings.graph_store == before
+        bump.assert_not_called()
+
+
+class TestWriteProfile:
+    def test_profile_written_and_loadable(self, tmp_path):
+        from tiger_etf.config import YamlSettingsSource, Settings
+
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.dump({"graphrag": {"build_num_workers": 1}}))
+        best = TuneTrial(params=_params(workers=2, threads=8, build=4), documents=5, docs_per_min=12.5)
+
+        with patch("tiger_etf.config._find_config_yaml", return_value=config_path):
+            path = write_profile("tuned", best, [best], strategy="grid",
+                                 max_throttle_rate=0.05, offline=True)
+            with patch.dict("os.environ", {"CONFIG_PROFILE": "tuned"}):
+                data = YamlSettingsSource(Settings)()
+
+        assert path == tmp_path / "experiments" / "profiles" / "tuned.yaml"
+        saved = yaml.safe_load(path.read_text())
+        assert saved["tuning"]["best"]["docs_per_min"] == 12.5
+        assert len(saved["tuning"]["trials"]) == 1
+        assert data["graphrag_build_num_workers"] == 4
+        assert data["graphrag_extraction_num_threads_per_worker"] == 8
@@ -0,0 +1,93 @@
+"""Tests for concurrent vector index reset and index counts."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from opensearchpy import NotFoundError
+
+from tiger_etf.graphrag.vector_store import reset_vector_indexes, vector_index_counts
+
+_MAPPING = {"properties": {"embedding": {"type": "knn_vector", "dimension": 1024}}}
+
+
+class _FakeIndices:
+    def __init__(self, store, barrier=None):
+        self.store = store
+        self.barrier = barrier
+        self.created = {}
+
+    def _get(self, name):
+        if name not in self.store:
+            raise NotFoundError(404, "index_not_found_exception", {})
+        return self.store[name]
+
+    def get(self, index):
+        self._get(index)
+        return {index: {
+            "mappings": _MAPPING,
+            "settings": {"index": {
+                "knn": "true", "uuid": "u1", "creation_date": "1", "provided_name": index,
+                "version": {"created": "1"}, "number_of_shards": "2",
+            }},
+        }}
+
+    def delete(self, index):
+        self._get(index)
+        if self.barrier is not None:
+            # Every delete must be in flight at once to pass the barrier
+            self.barrier.wait(timeout=5)
+        del self.store[index]
+
+    def create(self, index, body):
+        self.created[index] = body
+        self.store[index] = 0
+
+
+class _FakeClient:
+    def __init__(self, store, barrier=None):
+        self.indices = _FakeIndices(store, barrier)
+
+    def count(self, index):
+        return {"count": self.indices._get(index)}
+
+
+class TestResetVectorIndexes:
+    def test_deletes_concurrently(self):
+        client = _FakeClient({"chunk": 120, "statement": 80}, threading.Barrier(2))
+        report = reset_vector_indexes(client=client, concurrency=2)
+        assert report.deleted == {"chunk": 120, "statement": 80}
+        assert report.total == 200
+        assert client.indices.store == {}
+        assert report.recreated == []
+
+    def test_missing_index_skipped(self):
+        client = _FakeClient({"chunk": 5})
+        report = reset_vector_indexes(client=client)
+        assert report.deleted == {"chunk": 5}
+
+    def test_recreate_keeps_mapping(self):
+        client = _FakeClient({"chunk": 3, "statement": 4})
+        report = reset_vector_indexes(client=client, recreate=True)
+        assert sorted(report.recreated) == ["chunk", "statement"]
+        assert client.indices.store == {"chunk": 0, "statement": 0}
+        body = client.indices.created["chunk"]
+        assert body["mappings"] == _MAPPING
+        assert body["settings"] == {"index": {"knn": "true", "number_of_shards": "2"}}
+
+    def test_other_errors_raise(self):
+        client = _FakeClient({"chunk": 1})
+
+        def boom(index):
+            raise RuntimeError("AuthorizationException")
+
+        client.indices.delete = boom
+        with pytest.raises(RuntimeError):
+            reset_vector_indexes(client=client, indexes=("chunk",))
+
+
+class TestVectorIndexCounts:
+    def test_counts_and_missing(self):
+        client = _FakeClient({"chunk": 42})
+        assert vector_index_counts(client=client) == {"chunk": 42, "statement": None}